@@ -0,0 +1,186 @@
+########################
+# Background Auto-Save  #
+########################
+
+import atexit
+import logging
+import threading
+import time
+from typing import Callable, List, Optional
+
+from app.calculation import Calculation
+
+
+class BackgroundSaver:
+    """
+    Coalescing background writer for auto-save.
+
+    Calculations submitted from the caller thread are queued and written by a
+    worker thread, so persisting the history never blocks a calculation. Bursts
+    of calculations are coalesced into a single write, triggered by whichever
+    comes first:
+
+    - ``every_n`` calculations are pending,
+    - ``interval_ms`` milliseconds have passed since the first pending calculation,
+    - no calculation has been submitted for ``idle_ms`` milliseconds.
+
+    A trigger set to 0 is disabled. Pending calculations are always written on
+    ``flush`` and ``close``, and ``close`` is registered to run at interpreter exit.
+
+    A failed write is not retried. Its calculations are counted in ``failed``
+    until the next ``flush`` or ``close`` reports the failure by returning
+    False, even if later writes succeed. ``last_error`` keeps the most recent
+    exception.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[List[Calculation]], None],
+        every_n: int = 100,
+        interval_ms: int = 1000,
+        idle_ms: int = 200
+    ):
+        """
+        Initialize the writer and start its worker thread.
+
+        Args:
+            write (Callable[[List[Calculation]], None]): Persists a batch of
+                calculations, oldest first. Called only from the worker thread.
+            every_n (int, optional): Pending calculations that trigger a write.
+            interval_ms (int, optional): Maximum delay after the first pending calculation.
+            idle_ms (int, optional): Idle period after the last calculation that triggers a write.
+        """
+        self._write = write
+        self.every_n = every_n
+        self.interval = interval_ms / 1000
+        self.idle = idle_ms / 1000
+
+        self._condition = threading.Condition()
+        self._pending: List[Calculation] = []
+        self._first_pending_at = 0.0
+        self._last_submit_at = 0.0
+        self._submitted = 0       # Calculations submitted so far
+        self._written = 0         # Calculations persisted so far (or whose write failed)
+        self._flush_requested = False
+        self._closed = False
+        self.failed = 0           # Calculations whose write failed, not yet reported
+        self.last_error: Optional[Exception] = None
+
+        self._thread = threading.Thread(target=self._run, name="calculator-autosave", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, calculation: Calculation) -> None:
+        """
+        Queue a calculation for the next write.
+
+        Args:
+            calculation (Calculation): The calculation that was performed.
+        """
+        with self._condition:
+            now = time.monotonic()
+            if not self._pending:
+                self._first_pending_at = now
+            self._last_submit_at = now
+            self._pending.append(calculation)
+            self._submitted += 1
+            self._condition.notify()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write pending calculations now and wait until they are persisted.
+
+        Args:
+            timeout (Optional[float], optional): Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if everything submitted before the call was written
+            successfully, and no failure since the last flush or close is unreported.
+        """
+        with self._condition:
+            target = self._submitted
+            self._flush_requested = True
+            self._condition.notify_all()
+            if not self._condition.wait_for(lambda: self._written >= target, timeout):
+                return False
+            return self._report_failures()
+
+    def _report_failures(self) -> bool:
+        """Return False if writes failed since the last report, and reset the count; hold the lock."""
+        failed, self.failed = self.failed, 0
+        return failed == 0
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Flush pending calculations and stop the worker thread.
+
+        Args:
+            timeout (Optional[float], optional): Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if everything submitted was written successfully, and no
+            failure since the last flush or close is unreported.
+        """
+        with self._condition:
+            if self._closed:
+                return self._report_failures()
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+        with self._condition:
+            return not self._thread.is_alive() and self._report_failures()
+
+    def _next_deadline(self) -> Optional[float]:
+        """Return the monotonic time at which pending calculations must be written."""
+        deadlines = []
+        if self.interval:
+            deadlines.append(self._first_pending_at + self.interval)
+        if self.idle:
+            deadlines.append(self._last_submit_at + self.idle)
+        return min(deadlines) if deadlines else None
+
+    def _wait_for_batch(self) -> Optional[List[Calculation]]:
+        """
+        Block until a write is due and take the pending batch.
+
+        Returns:
+            Optional[List[Calculation]]: The batch to write, or None once closed and drained.
+        """
+        with self._condition:
+            while True:
+                if self._pending:
+                    if self._closed or self._flush_requested:
+                        break
+                    if self.every_n and len(self._pending) >= self.every_n:
+                        break
+                    deadline = self._next_deadline()
+                    now = time.monotonic()
+                    if deadline is not None and now >= deadline:
+                        break
+                    self._condition.wait(None if deadline is None else deadline - now)
+                else:
+                    self._flush_requested = False
+                    if self._closed:
+                        return None
+                    self._condition.wait()
+            batch, self._pending = self._pending, []
+            return batch
+
+    def _run(self) -> None:
+        """Worker loop: write coalesced batches until closed."""
+        while True:
+            batch = self._wait_for_batch()
+            if batch is None:
+                return
+            failed = 0
+            try:
+                self._write(batch)
+            except Exception as e:
+                self.last_error = e
+                failed = len(batch)
+                logging.error("Background auto-save failed: %s", e)
+            with self._condition:
+                self._written += len(batch)
+                self.failed += failed
+                self._condition.notify_all()
@@ -0,0 +1,212 @@
+########################
+# Batch Evaluation      #
+########################
+
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from app.calculator_config import CalculatorConfig
+from app.exceptions import OperationError, ValidationError
+from app.input_validators import InputValidator
+from app.operations import Operation
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
+    from app.parallel import ProcessPoolBackend
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of evaluating one operation over many operand pairs.
+
+    Results are kept in input order. An element that failed validation or
+    execution has ``None`` as its result and an error message in ``errors``,
+    keyed by its position; the other elements are unaffected.
+    """
+
+    results: List[Optional[Decimal]] = field(default_factory=list)  # Result per element, None on error
+    errors: Dict[int, str] = field(default_factory=dict)  # Error message per failed element index
+
+    @property
+    def succeeded(self) -> int:
+        """Return the number of elements evaluated successfully."""
+        return len(self.results) - len(self.errors)
+
+
+def evaluate_decimal(
+    operation: Operation,
+    a_values: Sequence[Any],
+    b_values: Sequence[Any],
+    config: CalculatorConfig
+) -> Tuple[BatchResult, List[Tuple[int, Decimal, Decimal]]]:
+    """
+    Evaluate an operation element by element with exact Decimal arithmetic.
+
+    Every operand goes through InputValidator.validate_number, exactly as in
+    Calculator.perform_operation.
+
+    Args:
+        operation (Operation): The operation to execute.
+        a_values (Sequence[Any]): First operands.
+        b_values (Sequence[Any]): Second operands.
+        config (CalculatorConfig): Configuration used for input validation.
+
+    Returns:
+        Tuple[BatchResult, List[Tuple[int, Decimal, Decimal]]]: The batch result and
+        the validated operands of every successful element, with its index.
+    """
+    batch = BatchResult(results=[None] * len(a_values))
+    operands = []
+    for index, (a, b) in enumerate(zip(a_values, b_values)):
+        try:
+            validated_a = InputValidator.validate_number(a, config)
+            validated_b = InputValidator.validate_number(b, config)
+            batch.results[index] = operation.execute(validated_a, validated_b)
+            operands.append((index, validated_a, validated_b))
+        except (ValidationError, OperationError) as e:
+            batch.errors[index] = str(e)
+        except (InvalidOperation, ArithmeticError, ValueError) as e:
+            batch.errors[index] = f"Operation failed: {e}"
+    return batch, operands
+
+
+def to_float_array(values: Sequence[Any], config: CalculatorConfig) -> Tuple['np.ndarray', Dict[int, str]]:
+    """
+    Convert operands to a float64 array, applying InputValidator rules per element.
+
+    Values that cannot be parsed, are not finite, or exceed ``max_input_value``
+    are reported as errors and replaced by 0 in the array.
+
+    Args:
+        values (Sequence[Any]): Operands as numbers, numeric strings or an array.
+        config (CalculatorConfig): Configuration providing max_input_value.
+
+    Returns:
+        Tuple[np.ndarray, Dict[int, str]]: The array and the errors by element index.
+    """
+    import numpy as np
+
+    errors: Dict[int, str] = {}
+    try:
+        array = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        # Fall back to per-element parsing to locate the invalid values
+        array = np.zeros(len(values), dtype=np.float64)
+        for index, value in enumerate(values):
+            try:
+                array[index] = float(value.strip() if isinstance(value, str) else value)
+            except (TypeError, ValueError):
+                errors[index] = f"Invalid number format: {value}"
+
+    for index in np.flatnonzero(~np.isfinite(array)).tolist():
+        errors.setdefault(index, f"Invalid number format: {values[index]}")
+    limit = float(config.max_input_value)
+    for index in np.flatnonzero(np.abs(array) > limit).tolist():
+        errors.setdefault(index, f"Value exceeds maximum allowed: {config.max_input_value}")
+    if errors:
+        array[list(errors)] = 0.0
+    return array, errors
+
+
+def evaluate_vectorized(
+    operation: Operation,
+    a_values: Sequence[Any],
+    b_values: Sequence[Any],
+    config: CalculatorConfig
+) -> Tuple[BatchResult, List[Tuple[int, Decimal, Decimal]]]:
+    """
+    Evaluate an operation over whole arrays with its NumPy float64 kernel.
+
+    This is a fast mode: operands and results are binary floats, converted to
+    Decimal through their shortest representation.
+
+    Args:
+        operation (Operation): The operation to execute; must support vectorization.
+        a_values (Sequence[Any]): First operands.
+        b_values (Sequence[Any]): Second operands.
+        config (CalculatorConfig): Configuration used for input validation.
+
+    Returns:
+        Tuple[BatchResult, List[Tuple[int, Decimal, Decimal]]]: The batch result and
+        the operands of every successful element, with its index.
+
+    Raises:
+        OperationError: If NumPy is not installed.
+    """
+    try:
+        import numpy as np
+    except ImportError as e:  # pragma: no cover
+        raise OperationError("NumPy is required for vectorized batch evaluation") from e
+
+    a, errors = to_float_array(a_values, config)
+    b, b_errors = to_float_array(b_values, config)
+    for index, message in b_errors.items():
+        errors.setdefault(index, message)
+
+    for mask, message in operation.invalid_operands_vectorized(a, b):
+        for index in np.flatnonzero(mask).tolist():
+            errors.setdefault(index, message)
+
+    with np.errstate(all='ignore'):
+        results = operation.execute_vectorized(a, b)
+    for index in np.flatnonzero(~np.isfinite(results)).tolist():
+        errors.setdefault(index, "Operation failed: result is not finite")
+
+    batch = BatchResult(results=[None] * len(a), errors=dict(sorted(errors.items())))
+    operands = []
+    for index, (x, y, value) in enumerate(zip(a.tolist(), b.tolist(), results.tolist())):
+        if index not in errors:
+            batch.results[index] = Decimal(repr(value))
+            operands.append((index, Decimal(repr(x)).normalize(), Decimal(repr(y)).normalize()))
+    return batch, operands
+
+
+def evaluate_parallel(
+    operation: Operation,
+    a_values: Sequence[Any],
+    b_values: Sequence[Any],
+    config: CalculatorConfig,
+    backend: 'ProcessPoolBackend'
+) -> Tuple[BatchResult, List[Tuple[int, Decimal, Decimal]]]:
+    """
+    Evaluate an operation with exact Decimal arithmetic on a process pool.
+
+    Operands are validated in the calling process, as in evaluate_decimal;
+    only the valid pairs are sent to the workers.
+
+    Args:
+        operation (Operation): The operation to execute.
+        a_values (Sequence[Any]): First operands.
+        b_values (Sequence[Any]): Second operands.
+        config (CalculatorConfig): Configuration used for input validation.
+        backend (ProcessPoolBackend): The process pool executing the operation.
+
+    Returns:
+        Tuple[BatchResult, List[Tuple[int, Decimal, Decimal]]]: The batch result and
+        the validated operands of every successful element, with its index.
+    """
+    batch = BatchResult(results=[None] * len(a_values))
+    validated = []
+    for index, (a, b) in enumerate(zip(a_values, b_values)):
+        try:
+            validated.append((
+                index,
+                InputValidator.validate_number(a, config),
+                InputValidator.validate_number(b, config)
+            ))
+        except ValidationError as e:
+            batch.errors[index] = str(e)
+
+    operands = []
+    outcomes = backend.execute((operation, a, b) for _, a, b in validated)
+    for (index, a, b), (result, error) in zip(validated, outcomes):
+        if error is None:
+            batch.results[index] = result
+            operands.append((index, a, b))
+        else:
+            batch.errors[index] = error
+    batch.errors = dict(sorted(batch.errors.items()))
+    return batch, operands
@@ -2,16 +2,137 @@
 # Calculation Model    #
 ########################
 
-from dataclasses import dataclass, field
 import datetime
 from decimal import Decimal, InvalidOperation
 import logging
-from typing import Any, Dict
+import operator
+from typing import Any, Callable, Dict, List, Optional
 
-from app.exceptions import OperationError
+from app.decimal_math import power, root
+from app.exceptions import OperationError, ValidationError
+from app.operations import OperationFactory
+
+# Operation names are interned as small integer ids shared by all calculations
+_OPERATION_IDS: Dict[str, int] = {}
+_OPERATION_NAMES: List[str] = []
+
+# Timestamps are stored as integer nanoseconds of wall-clock time since this epoch
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+def intern_operation(name: str) -> int:
+    """
+    Return the small integer id for an operation name, assigning one if needed.
+
+    Args:
+        name (str): The name of the operation (e.g., "Addition").
+
+    Returns:
+        int: The id shared by every calculation using this operation.
+    """
+    op_id = _OPERATION_IDS.get(name)
+    if op_id is None:
+        op_id = len(_OPERATION_NAMES)
+        _OPERATION_NAMES.append(name)
+        _OPERATION_IDS[name] = op_id
+    return op_id
+
+
+def find_operation_id(name: str) -> Optional[int]:
+    """
+    Return the id of an operation name without interning it.
+
+    Lookups with names from user input use this, so that they cannot grow
+    the table of interned names.
+
+    Args:
+        name (str): The name of the operation (e.g., "Addition").
+
+    Returns:
+        Optional[int]: The id, or None if no calculation has used the name.
+    """
+    return _OPERATION_IDS.get(name)
+
+
+def operation_name(op_id: int) -> str:
+    """
+    Return the operation name for an id returned by intern_operation.
+
+    Args:
+        op_id (int): The interned operation id.
+
+    Returns:
+        str: The name of the operation.
+    """
+    return _OPERATION_NAMES[op_id]
+
+
+def datetime_to_ns(timestamp: datetime.datetime) -> int:
+    """
+    Convert a timestamp to integer nanoseconds since 1970-01-01 (wall-clock time).
+
+    Any timezone information is ignored; it is kept separately by Calculation.
+
+    Args:
+        timestamp (datetime.datetime): The timestamp to convert.
+
+    Returns:
+        int: Nanoseconds since the epoch, at microsecond resolution.
+    """
+    return (timestamp.replace(tzinfo=None) - _EPOCH) // _MICROSECOND * 1000
+
+
+def ns_to_datetime(timestamp_ns: int, tzinfo: Optional[datetime.tzinfo] = None) -> datetime.datetime:
+    """
+    Convert integer nanoseconds since 1970-01-01 back to a datetime.
+
+    Args:
+        timestamp_ns (int): Nanoseconds since the epoch, as returned by datetime_to_ns.
+        tzinfo (Optional[datetime.tzinfo], optional): Timezone to attach, if any.
+
+    Returns:
+        datetime.datetime: The corresponding timestamp.
+    """
+    timestamp = _EPOCH + datetime.timedelta(microseconds=timestamp_ns // 1000)
+    return timestamp if tzinfo is None else timestamp.replace(tzinfo=tzinfo)
+
+
+def _divide(x: Decimal, y: Decimal) -> Decimal:
+    if y == 0:
+        raise OperationError("Division by zero is not allowed")
+    return x / y
+
+
+def _power(x: Decimal, y: Decimal) -> Decimal:
+    if y < 0:
+        raise OperationError("Negative exponents are not supported")
+    return power(x, y)
+
+
+def _root(x: Decimal, y: Decimal) -> Decimal:
+    if y == 0:
+        raise OperationError("Zero root is undefined")
+    if x < 0:
+        raise OperationError("Cannot calculate root of negative number")
+    return root(x, y)
+
+
+# Built-in operations by interned operation id, built once at import time.
+# Other operations registered with OperationFactory are looked up by name.
+_DISPATCH: Dict[int, Callable[[Decimal, Decimal], Decimal]] = {
+    intern_operation(name): function
+    for name, function in (
+        ("Addition", operator.add),
+        ("Subtraction", operator.sub),
+        ("Multiplication", operator.mul),
+        ("Division", _divide),
+        ("Power", _power),
+        ("Root", _root),
+    )
+}
 
 
-@dataclass
 class Calculation:
     """
     Value Object representing a single calculation.
@@ -20,33 +141,137 @@ class Calculation:
     operation performed, operands involved, the result, and the timestamp of the
     calculation. It provides methods for performing the calculation, serializing
     the data for storage, and deserializing data to recreate a Calculation instance.
+
+    Instances are kept compact because a history may hold many of them: attributes
+    live in ``__slots__`` instead of a per-instance ``__dict__``, the operation name
+    is stored as a small interned id, and the timestamp as integer nanoseconds.
+    ``row_id`` is the id of the calculation's row in the SQLite history, or None
+    if it is not stored there; ``sequence`` is the order in which a Calculator
+    recorded the calculation, or None if it was not recorded in this session.
     """
 
-    # Required fields
-    operation: str          # The name of the operation (e.g., "Addition")
-    operand1: Decimal       # The first operand in the calculation
-    operand2: Decimal       # The second operand in the calculation
+    __slots__ = ('_op_id', 'operand1', 'operand2', 'result', '_timestamp_ns', '_tzinfo', 'row_id', 'sequence')
+
+    def __init__(
+        self,
+        operation: str,
+        operand1: Decimal,
+        operand2: Decimal,
+        timestamp: Optional[datetime.datetime] = None,
+        result: Optional[Decimal] = None,
+        verify: bool = False
+    ):
+        """
+        Create a calculation, computing its result unless one is supplied.
 
-    # Fields with default values
-    result: Decimal = field(init=False)  # The result of the calculation, computed post-initialization
-    timestamp: datetime.datetime = field(default_factory=datetime.datetime.now)  # Time when the calculation was performed
+        Callers that already executed the operation (such as the Calculator) pass
+        the result so it is not computed twice; ``verify`` recomputes it anyway
+        and checks that both agree.
 
-    def __post_init__(self):
+        Args:
+            operation (str): The name of the operation (e.g., "Addition").
+            operand1 (Decimal): The first operand in the calculation.
+            operand2 (Decimal): The second operand in the calculation.
+            timestamp (Optional[datetime.datetime], optional): Time when the calculation
+                was performed. Defaults to now.
+            result (Optional[Decimal], optional): Precomputed result of the calculation.
+            verify (bool, optional): Recompute a precomputed result and compare.
+
+        Raises:
+            OperationError: If the operation is unknown, the calculation fails, or a
+                verified result does not match the computed one.
+        """
+        self._op_id = intern_operation(operation)
+        self.operand1 = operand1
+        self.operand2 = operand2
+        self.timestamp = timestamp if timestamp is not None else datetime.datetime.now()
+        self.row_id: Optional[int] = None
+        self.sequence: Optional[int] = None
+        if result is None:
+            self.result = self.calculate()
+        else:
+            self.result = result
+            if verify:
+                self.verify()
+
+    @classmethod
+    def from_parts(
+        cls,
+        operation: str,
+        operand1: Decimal,
+        operand2: Decimal,
+        result: Decimal,
+        timestamp_ns: int,
+        tzinfo: Optional[datetime.tzinfo] = None
+    ) -> 'Calculation':
         """
-        Post-initialization processing.
+        Create a calculation from already parsed fields without computing anything.
 
-        Automatically calculates the result of the operation after the Calculation
-        instance is created.
+        Used by bulk loaders that parse whole columns at once.
+
+        Args:
+            operation (str): The name of the operation (e.g., "Addition").
+            operand1 (Decimal): The first operand in the calculation.
+            operand2 (Decimal): The second operand in the calculation.
+            result (Decimal): The result of the calculation.
+            timestamp_ns (int): Nanoseconds since 1970-01-01 (wall-clock time).
+            tzinfo (Optional[datetime.tzinfo], optional): Timezone of the timestamp, if any.
+
+        Returns:
+            Calculation: The new calculation.
         """
-        self.result = self.calculate()
+        calc = cls.__new__(cls)
+        calc._op_id = intern_operation(operation)
+        calc.operand1 = operand1
+        calc.operand2 = operand2
+        calc.result = result
+        calc._timestamp_ns = timestamp_ns
+        calc._tzinfo = tzinfo
+        calc.row_id = None
+        calc.sequence = None
+        return calc
+
+    @property
+    def operation(self) -> str:
+        """Return the name of the operation (e.g., "Addition")."""
+        return _OPERATION_NAMES[self._op_id]
+
+    @operation.setter
+    def operation(self, name: str) -> None:
+        self._op_id = intern_operation(name)
+
+    @property
+    def operation_id(self) -> int:
+        """Return the interned id of the operation."""
+        return self._op_id
+
+    @property
+    def timestamp(self) -> datetime.datetime:
+        """Return the time when the calculation was performed."""
+        return ns_to_datetime(self._timestamp_ns, self._tzinfo)
+
+    @timestamp.setter
+    def timestamp(self, value: datetime.datetime) -> None:
+        self._timestamp_ns = datetime_to_ns(value)
+        self._tzinfo = value.tzinfo
+
+    @property
+    def tzinfo(self) -> Optional[datetime.tzinfo]:
+        """Return the timezone of the timestamp, or None for naive timestamps."""
+        return self._tzinfo
+
+    @property
+    def timestamp_ns(self) -> int:
+        """Return the timestamp as integer nanoseconds since 1970-01-01 (wall-clock time)."""
+        return self._timestamp_ns
 
     def calculate(self) -> Decimal:
         """
         Execute calculation using the specified operation.
 
-        Utilizes a dictionary to map operation names to their corresponding
-        lambda functions, enabling dynamic execution of operations based on
-        the operation name.
+        Built-in operations are looked up by operation id in a dispatch table
+        built once at import time; operations registered with OperationFactory
+        are executed through their shared instance.
 
         Returns:
             Decimal: The result of the calculation.
@@ -54,67 +279,34 @@ class Calculation:
         Raises:
             OperationError: If the operation is unknown or the calculation fails.
         """
-        # Mapping of operation names to their corresponding functions
-        operations = {
-            "Addition": lambda x, y: x + y,
-            "Subtraction": lambda x, y: x - y,
-            "Multiplication": lambda x, y: x * y,
-            "Division": lambda x, y: x / y if y != 0 else self._raise_div_zero(),
-            "Power": lambda x, y: Decimal(pow(float(x), float(y))) if y >= 0 else self._raise_neg_power(),
-            "Root": lambda x, y: (
-                Decimal(pow(float(x), 1 / float(y))) 
-                if x >= 0 and y != 0 
-                else self._raise_invalid_root(x, y)
-            )
-        }
-
-        # Retrieve the operation function based on the operation name
-        op = operations.get(self.operation)
-        if not op:
-            raise OperationError(f"Unknown operation: {self.operation}")
+        function = _DISPATCH.get(self._op_id)
+        if function is None:
+            operation = OperationFactory.find_operation(self.operation)
+            if operation is None:
+                raise OperationError(f"Unknown operation: {self.operation}")
+            function = operation.execute
 
         try:
             # Execute the operation with the provided operands
-            return op(self.operand1, self.operand2)
+            return function(self.operand1, self.operand2)
+        except ValidationError as e:
+            raise OperationError(str(e))
         except (InvalidOperation, ValueError, ArithmeticError) as e:
             # Handle any errors that occur during calculation
             raise OperationError(f"Calculation failed: {str(e)}")
 
-    @staticmethod
-    def _raise_div_zero():  # pragma: no cover
-        """
-        Helper method to raise division by zero error.
-
-        This method is called when a division by zero is attempted.
-        """
-        raise OperationError("Division by zero is not allowed")
-
-    @staticmethod
-    def _raise_neg_power():  # pragma: no cover
-        """
-        Helper method to raise negative power error.
-
-        This method is called when a negative exponent is used in a power operation.
-        """
-        raise OperationError("Negative exponents are not supported")
-
-    @staticmethod
-    def _raise_invalid_root(x: Decimal, y: Decimal):  # pragma: no cover
+    def verify(self) -> None:
         """
-        Helper method to raise invalid root error.
+        Recompute the result and check it matches the stored one.
 
-        This method is called when an invalid root operation is attempted, such as
-        taking the root of a negative number or using zero as the root degree.
-
-        Args:
-            x (Decimal): The number from which the root is taken.
-            y (Decimal): The degree of the root.
+        Raises:
+            OperationError: If the stored result differs from the computed result.
         """
-        if y == 0:
-            raise OperationError("Zero root is undefined")
-        if x < 0:
-            raise OperationError("Cannot calculate root of negative number")
-        raise OperationError("Invalid root operation")
+        computed = self.calculate()
+        if computed != self.result:
+            raise OperationError(
+                f"Result {self.result} differs from computed result {computed}"
+            )
 
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -166,8 +358,8 @@ class Calculation:
             saved_result = Decimal(data['result'])
             if calc.result != saved_result:
                 logging.warning(
-                    f"Loaded calculation result {saved_result} "
-                    f"differs from computed result {calc.result}"
+                    "Loaded calculation result %s differs from computed result %s",
+                    saved_result, calc.result
                 )  # pragma: no cover
 
             return calc
@@ -2,27 +2,52 @@
 # Calculator Class      #
 ########################
 
-from decimal import Decimal
+import csv
+import datetime
+from decimal import Decimal, InvalidOperation
 import logging
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+import threading
+import time
+from typing import TYPE_CHECKING, Any, ContextManager, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
-import pandas as pd
-
-from app.calculation import Calculation
+from app.batch import BatchResult, evaluate_decimal, evaluate_parallel, evaluate_vectorized
+from app.calculation import Calculation, datetime_to_ns
 from app.calculator_config import CalculatorConfig
-from app.calculator_memento import CalculatorMemento
+from app.calculator_memento import HistoryDelta
+from app.decimal_math import EngineSettings, engine_context
 from app.exceptions import OperationError, ValidationError
+from app.expression import ExpressionPlan, PlanCache, compile_expression
 from app.history import HistoryObserver
+from app.history_binary import BinaryHistory, write_binary_history
+from app.history_buffer import HistoryBuffer
+from app.history_csv import read_history_csv, write_history_csv
+from app.history_index import HistoryQuery, IndexedHistoryBuffer, Range
+from app.history_sqlite import SQLiteHistory
 from app.input_validators import InputValidator
-from app.operations import Operation
+from app.logging_setup import LogSampler, configure_logging
+from app.metrics import Metrics
+from app.observer_dispatch import ObserverDispatcher
+from app.operations import Operation, OperationFactory
+from app.parallel import ProcessPoolBackend
+from app.result_cache import CachedOperation, ResultCache
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
 
 # Type aliases for better readability
 Number = Union[int, float, Decimal]
 CalculationResult = Union[Number, str]
 
 
+def _decimal_range(bounds: Optional[Tuple[Optional[Number], Optional[Number]]]) -> Optional[Range]:
+    """Convert numeric (low, high) bounds to Decimals."""
+    if bounds is None:
+        return None
+    return tuple(None if bound is None else Decimal(str(bound)) for bound in bounds)
+
+
 class Calculator:
     """
     Main calculator class implementing multiple design patterns.
@@ -33,13 +58,16 @@ class Calculator:
     scalability.
     """
 
-    def __init__(self, config: Optional[CalculatorConfig] = None):
+    def __init__(self, config: Optional[CalculatorConfig] = None, load_history_in_background: bool = False):
         """
         Initialize calculator with configuration.
 
         Args:
             config (Optional[CalculatorConfig], optional): Configuration settings for the calculator.
                 If not provided, default settings are loaded based on environment variables.
+            load_history_in_background (bool, optional): Load the saved history on a
+                background thread so the constructor returns immediately. Anything that
+                reads the history waits until loading has finished.
         """
         if config is None:
             # Determine the project root directory if no configuration is provided
@@ -56,50 +84,136 @@ class Calculator:
 
         # Set up the logging system
         self._setup_logging()
+        self._operation_log_sampler = LogSampler(self.config.log_sample_rate)
 
-        # Initialize calculation history and operation strategy
-        self.history: List[Calculation] = []
+        # Initialize calculation history and operation strategy. The history becomes
+        # readable once the saved history has been loaded.
+        self._history_ready = threading.Event()
+        self._history = IndexedHistoryBuffer(self.config.max_history_size)
         self.operation_strategy: Optional[Operation] = None
 
         # Initialize observer list for the Observer pattern
         self.observers: List[HistoryObserver] = []
 
-        # Initialize stacks for undo and redo functionality using the Memento pattern
-        self.undo_stack: List[CalculatorMemento] = []
-        self.redo_stack: List[CalculatorMemento] = []
+        # Stage timings of calculations, recorded only when config.metrics is enabled
+        self._metrics: Optional[Metrics] = Metrics() if self.config.metrics else None
+
+        # In 'async' dispatch mode observers are notified on a worker thread
+        self.observer_dispatcher: Optional[ObserverDispatcher] = None
+        if self.config.observer_dispatch == 'async':
+            self.observer_dispatcher = ObserverDispatcher(
+                self.observers, self.config.observer_queue_size, self.config.observer_overflow, self._metrics
+            )
+
+        # Initialize stacks for undo and redo functionality using the Memento pattern.
+        # Each entry is a HistoryDelta describing one change, not a full history copy.
+        self.undo_stack: List[HistoryDelta] = []
+        self.redo_stack: List[HistoryDelta] = []
+
+        # Journal bookkeeping: records written since the last snapshot, whether
+        # the journal no longer matches the history (after undo, redo or clear),
+        # the number of calculations recorded so far, and how many of them the
+        # last snapshot covers (Calculation.sequence is compared against it)
+        self._journal_entries = 0
+        self._journal_stale = False
+        self._recorded = 0
+        self._snapshot_sequence = 0
+
+        # Row id from which the history database no longer matches the in-memory
+        # history (after undo, redo or clear), or None
+        self._sqlite_rewrite_from: Optional[int] = None
+
+        # Locks allowing background auto-save: one guards the in-memory history,
+        # the other serializes writes to the history and journal files
+        self._history_lock = threading.RLock()
+        self._save_lock = threading.RLock()
+
+        # Worker processes for large batches, started on first use when config.workers > 1
+        self._process_pool: Optional[ProcessPoolBackend] = None
+
+        # History database connection, opened on first use when history_format is 'sqlite'
+        self._sqlite_history: Optional[SQLiteHistory] = None
+
+        # Compiled plans of evaluated expressions
+        self.expression_plans = PlanCache(self.config.expression_cache_size)
 
         # Create required directories for history management
         self._setup_directories()
 
+        # Memoized operation results, optionally restored from the last session
+        self.result_cache: Optional[ResultCache] = None
+        if self.config.cache_size > 0:
+            self.result_cache = ResultCache(self.config.cache_size, self._engine_settings())
+            if self.config.cache_persist:
+                self.result_cache.load(self.config.cache_file)
+
+        if load_history_in_background:
+            threading.Thread(
+                target=self._load_initial_history, name="calculator-history-load", daemon=True
+            ).start()
+        else:
+            self._load_initial_history()
+
+        # Log the successful initialization of the calculator
+        logging.info("Calculator initialized with configuration")
+
+    @property
+    def history(self) -> HistoryBuffer:
+        """Return the calculation history, waiting for the initial load to finish."""
+        if not self._history_ready.is_set():
+            self._history_ready.wait()
+        return self._history
+
+    @history.setter
+    def history(self, history: Iterable[Calculation]) -> None:
+        # Queries rely on the indexes kept by IndexedHistoryBuffer; a plain list
+        # gets the configured maximum size
+        if not isinstance(history, IndexedHistoryBuffer):
+            capacity = getattr(history, 'capacity', self.config.max_history_size)
+            history = IndexedHistoryBuffer(capacity, history)
+        self._history = history
+
+    def _lock_history(self) -> threading.RLock:
+        """
+        Return the history lock once the initial history load has finished.
+
+        The loader thread takes the lock to install the loaded history, so
+        waiting for it while holding the lock would deadlock.
+        """
+        self._history_ready.wait()
+        return self._history_lock
+
+    def _load_initial_history(self) -> None:
+        """Load the saved history at startup and mark the history as ready."""
         try:
             # Attempt to load existing calculation history from file
             self.load_history()
         except Exception as e:
             # Log a warning if history could not be loaded
-            logging.warning(f"Could not load existing history: {e}")
-
-        # Log the successful initialization of the calculator
-        logging.info("Calculator initialized with configuration")
+            logging.warning("Could not load existing history: %s", e)
+        finally:
+            self._history_ready.set()
 
     def _setup_logging(self) -> None:
         """
         Configure the logging system.
 
-        Sets up logging to a file with a specified format and log level.
+        Routes log records through a queue to a size-rotated log file. The
+        pipeline is shared by every Calculator and only rebuilt when the log
+        settings change, so creating a calculator does not reopen the file.
         """
         try:
             # Ensure the log directory exists
             os.makedirs(self.config.log_dir, exist_ok=True)
             log_file = self.config.log_file.resolve()
 
-            # Configure the basic logging settings
-            logging.basicConfig(
-                filename=str(log_file),
-                level=logging.INFO,
-                format='%(asctime)s - %(levelname)s - %(message)s',
-                force=True  # Overwrite any existing logging configuration
+            configure_logging(
+                log_file,
+                max_bytes=self.config.log_max_bytes,
+                backup_count=self.config.log_backup_count,
+                encoding=self.config.default_encoding
             )
-            logging.info(f"Logging initialized at: {log_file}")
+            logging.info("Logging initialized at: %s", log_file)
         except Exception as e:
             # Print an error message and re-raise the exception if logging setup fails
             print(f"Error setting up logging: {e}")
@@ -124,7 +238,7 @@ class Calculator:
             observer (HistoryObserver): The observer to be added.
         """
         self.observers.append(observer)
-        logging.info(f"Added observer: {observer.__class__.__name__}")
+        logging.info("Added observer: %s", observer.__class__.__name__)
 
     def remove_observer(self, observer: HistoryObserver) -> None:
         """
@@ -136,21 +250,40 @@ class Calculator:
             observer (HistoryObserver): The observer to be removed.
         """
         self.observers.remove(observer)
-        logging.info(f"Removed observer: {observer.__class__.__name__}")
+        logging.info("Removed observer: %s", observer.__class__.__name__)
 
     def notify_observers(self, calculation: Calculation) -> None:
         """
         Notify all observers of a new calculation.
 
         Iterates through the list of observers and calls their update method,
-        passing the new calculation as an argument.
+        passing the new calculation as an argument. In 'async' dispatch mode the
+        notification is queued for the observer dispatcher instead.
 
         Args:
             calculation (Calculation): The latest calculation performed.
         """
+        if self.observer_dispatcher is not None:
+            self.observer_dispatcher.submit([calculation])
+            return
         for observer in self.observers:
             observer.update(calculation)
 
+    def notify_observers_batch(self, calculations: List[Calculation]) -> None:
+        """
+        Notify all observers of a batch of new calculations.
+
+        Each observer receives a single update_batch call for the whole batch.
+
+        Args:
+            calculations (List[Calculation]): The calculations performed, oldest first.
+        """
+        if self.observer_dispatcher is not None:
+            self.observer_dispatcher.submit(calculations)
+            return
+        for observer in self.observers:
+            observer.update_batch(calculations)
+
     def set_operation(self, operation: Operation) -> None:
         """
         Set the current operation strategy.
@@ -163,7 +296,8 @@ class Calculator:
             operation (Operation): The operation strategy to be set.
         """
         self.operation_strategy = operation
-        logging.info(f"Set operation: {operation}")
+        if self._operation_log_sampler.sample():
+            logging.info("Set operation: %s", operation)
 
     def perform_operation(
         self,
@@ -190,33 +324,30 @@ class Calculator:
         if not self.operation_strategy:
             raise OperationError("No operation set")
 
+        metrics = self._metrics
+        if metrics is not None:
+            return self._perform_operation_timed(a, b, metrics)
+
         try:
             # Validate and convert inputs to Decimal
             validated_a = InputValidator.validate_number(a, self.config)
             validated_b = InputValidator.validate_number(b, self.config)
 
-            # Execute the operation strategy
-            result = self.operation_strategy.execute(validated_a, validated_b)
+            # Execute the operation strategy, or reuse its memoized result
+            with self.engine_context():
+                result = self._cached(self.operation_strategy).execute(validated_a, validated_b)
 
-            # Create a new Calculation instance with the operation details
+            # Create a new Calculation instance with the operation details,
+            # reusing the result instead of computing it a second time
             calculation = Calculation(
                 operation=str(self.operation_strategy),
                 operand1=validated_a,
-                operand2=validated_b
+                operand2=validated_b,
+                result=result
             )
 
-            # Save the current state to the undo stack before making changes
-            self.undo_stack.append(CalculatorMemento(self.history.copy()))
-
-            # Clear the redo stack since new operation invalidates the redo history
-            self.redo_stack.clear()
-
-            # Append the new calculation to the history
-            self.history.append(calculation)
-
-            # Ensure the history does not exceed the maximum size
-            if len(self.history) > self.config.max_history_size:
-                self.history.pop(0)
+            # Append the calculation to the history and record the change for undo
+            self._record_calculation(calculation)
 
             # Notify all observers about the new calculation
             self.notify_observers(calculation)
@@ -225,93 +356,618 @@ class Calculator:
 
         except ValidationError as e:
             # Log and re-raise validation errors
-            logging.error(f"Validation error: {str(e)}")
+            logging.error("Validation error: %s", e)
             raise
         except Exception as e:
             # Log and raise operation errors for any other exceptions
-            logging.error(f"Operation failed: {str(e)}")
+            logging.error("Operation failed: %s", e)
             raise OperationError(f"Operation failed: {str(e)}")
 
-    def save_history(self) -> None:
+    def _perform_operation_timed(
+        self,
+        a: Union[str, Number],
+        b: Union[str, Number],
+        metrics: Metrics
+    ) -> CalculationResult:
+        """
+        Perform a calculation like perform_operation, timing each stage.
+
+        Kept apart from perform_operation so that the uninstrumented path pays
+        only for one attribute check. The clock is read between stages and
+        the durations are recorded at the end, so recording does not add to
+        the time of any stage. A history append that evicts the oldest entry
+        is recorded as ``history_evict`` instead of ``history_append``.
         """
-        Save calculation history to a CSV file using pandas.
+        clock = time.perf_counter_ns
+        try:
+            start = clock()
+            validated_a = InputValidator.validate_number(a, self.config)
+            validated_b = InputValidator.validate_number(b, self.config)
+            validated = clock()
 
-        Serializes the history of calculations and writes them to a CSV file for
-        persistent storage. Utilizes pandas DataFrames for efficient data handling.
+            with self.engine_context():
+                result = self._cached(self.operation_strategy).execute(validated_a, validated_b)
+            executed = clock()
+
+            calculation = Calculation(
+                operation=str(self.operation_strategy),
+                operand1=validated_a,
+                operand2=validated_b,
+                result=result
+            )
+            constructed = clock()
+
+            with self._lock_history():
+                self._recorded += 1
+                calculation.sequence = self._recorded
+                history = self.history
+                history_stage = 'history_evict' if len(history) >= history.capacity else 'history_append'
+                appending = clock()
+                evicted = history.append(calculation)
+                appended = clock()
+                self.undo_stack.append(HistoryDelta(appended=calculation, evicted=evicted))
+                self.redo_stack.clear()
+                pushed = clock()
+
+            observer_timings = []
+            if self.observer_dispatcher is not None:
+                self.observer_dispatcher.submit([calculation])
+            else:
+                for observer in self.observers:
+                    observer_start = clock()
+                    observer.update(calculation)
+                    observer_timings.append((observer, clock() - observer_start))
+            notified = clock()
+        except ValidationError as e:
+            metrics.increment('errors')
+            logging.error("Validation error: %s", e)
+            raise
+        except Exception as e:
+            metrics.increment('errors')
+            logging.error("Operation failed: %s", e)
+            raise OperationError(f"Operation failed: {str(e)}")
+
+        durations = [
+            ('validate', validated - start),
+            ('execute', executed - validated),
+            ('calculation', constructed - executed),
+            (history_stage, appended - appending),
+            ('memento', pushed - appended),
+            ('notify', notified - pushed),
+            ('perform_operation', notified - start),
+        ]
+        for observer, duration in observer_timings:
+            durations.append(('observer.' + observer.__class__.__name__, duration))
+        if evicted is None:
+            metrics.record_all(durations, (('calculations', 1),))
+        else:
+            metrics.record_all(durations, (('calculations', 1), ('evictions', 1)))
+        return result
+
+    def perform_batch(
+        self,
+        operation: Union[str, Operation],
+        a_values: Sequence[Any],
+        b_values: Sequence[Any],
+        vectorized: bool = False
+    ) -> BatchResult:
+        """
+        Perform one operation over many operand pairs.
+
+        Validates and executes every pair, records all successful calculations in
+        the history at once and notifies each observer a single time. A failing
+        element is reported in the result's errors and does not stop the batch.
+
+        Args:
+            operation (Union[str, Operation]): The operation, or its name (e.g. 'add').
+            a_values (Sequence[Any]): First operands.
+            b_values (Sequence[Any]): Second operands, same length as a_values.
+            vectorized (bool, optional): Use the operation's NumPy float64 kernel
+                instead of exact Decimal arithmetic, when it has one.
+
+        Exact batches larger than ``config.chunk_size`` are spread over
+        ``config.workers`` processes when more than one worker is configured.
+
+        Returns:
+            BatchResult: Results in input order and errors by element index.
 
         Raises:
-            OperationError: If saving the history fails.
+            ValidationError: If the operand sequences differ in length.
+            OperationError: If the operation name is unknown.
         """
-        try:
-            # Ensure the history directory exists
-            self.config.history_dir.mkdir(parents=True, exist_ok=True)
-
-            history_data = []
-            for calc in self.history:
-                # Serialize each Calculation instance to a dictionary
-                history_data.append({
-                    'operation': str(calc.operation),
-                    'operand1': str(calc.operand1),
-                    'operand2': str(calc.operand2),
-                    'result': str(calc.result),
-                    'timestamp': calc.timestamp.isoformat()
-                })
-
-            if history_data:
-                # Create a pandas DataFrame from the history data
-                df = pd.DataFrame(history_data)
-                # Write the DataFrame to a CSV file without the index
-                df.to_csv(self.config.history_file, index=False)
-                logging.info(f"History saved successfully to {self.config.history_file}")
+        if isinstance(operation, str):
+            try:
+                operation = OperationFactory.create_operation(operation)
+            except ValueError as e:
+                raise OperationError(str(e))
+        if len(a_values) != len(b_values):
+            raise ValidationError("Operand sequences must have the same length")
+
+        start = time.perf_counter_ns()
+        with self.engine_context():
+            if vectorized and operation.supports_vectorized:
+                batch, operands = evaluate_vectorized(operation, a_values, b_values, self.config)
+            elif self.config.workers > 1 and len(a_values) > self.config.chunk_size:
+                batch, operands = evaluate_parallel(operation, a_values, b_values, self.config, self.process_pool)
             else:
-                # If history is empty, create an empty CSV with headers
-                pd.DataFrame(columns=['operation', 'operand1', 'operand2', 'result', 'timestamp']
-                           ).to_csv(self.config.history_file, index=False)
-                logging.info("Empty history saved")
+                batch, operands = evaluate_decimal(self._cached(operation), a_values, b_values, self.config)
+
+        # Record the successful calculations in bulk with a shared timestamp
+        timestamp = datetime.datetime.now()
+        name = str(operation)
+        self.record_calculations([
+            Calculation(name, a, b, timestamp=timestamp, result=batch.results[index])
+            for index, a, b in operands
+        ])
+
+        if self._metrics is not None:
+            self._metrics.record('perform_batch', time.perf_counter_ns() - start)
+            self._metrics.increment('calculations', batch.succeeded)
+            self._metrics.increment('errors', len(batch.errors))
+
+        logging.info(
+            "Batch %s: %s succeeded, %s failed", name, batch.succeeded, len(batch.errors)
+        )
+        return batch
+
+    def evaluate_expression(
+        self,
+        expression: str,
+        record: Optional[str] = None,
+        variables: Optional[Dict[str, Union[str, Number]]] = None
+    ) -> Decimal:
+        """
+        Evaluate an infix expression such as ``(3 + 4) * 2 ^ 10 / root(81, 4)``.
 
+        The expression is compiled once into a flat plan (see app.expression)
+        that is cached by its normalized text. Numbers are validated like
+        perform_operation operands. ``ans`` is the result of the newest
+        calculation in the history, unless given in ``variables``.
+
+        What is recorded in the history depends on ``record``:
+
+        - 'expression': one entry for the final operation, with its operands
+          already evaluated (``7168 / 3`` for the expression above). Constant
+          subexpressions are folded at compile time.
+        - 'steps': one entry per operation, innermost first, recorded together
+          so that observers are notified once. Nothing is folded.
+        - 'off': nothing is recorded.
+
+        Args:
+            expression (str): The expression.
+            record (Optional[str], optional): 'expression', 'steps' or 'off';
+                defaults to ``config.expression_history``.
+            variables (Optional[Dict[str, Union[str, Number]]], optional): Values of
+                the names used in the expression.
+
+        Returns:
+            Decimal: The value of the expression.
+
+        Raises:
+            ValidationError: If the expression, a number or an operand is invalid.
+            OperationError: If an operation fails.
+        """
+        mode = record or self.config.expression_history
+        if mode not in ('expression', 'steps', 'off'):
+            raise ValidationError(f"Unknown expression record mode: {mode}")
+
+        values = {name: InputValidator.validate_number(value, self.config)
+                  for name, value in (variables or {}).items()}
+        if 'ans' not in values:
+            with self._lock_history():
+                if len(self.history):
+                    values['ans'] = self.history[-1].result
+
+        steps: List[Calculation] = []
+
+        def record_step(operation: Operation, a: Decimal, b: Decimal, result: Decimal) -> None:
+            steps.append(Calculation(str(operation), a, b, result=result))
+
+        try:
+            with self.engine_context():
+                plan = self._compile_expression(expression, fold=mode != 'steps')
+                result = plan.evaluate(values, record_step if mode != 'off' else None)
+        except ValidationError as e:
+            logging.error("Validation error: %s", e)
+            raise
         except Exception as e:
-            # Log and raise an OperationError if saving fails
-            logging.error(f"Failed to save history: {e}")
-            raise OperationError(f"Failed to save history: {e}")
+            logging.error("Expression failed: %s", e)
+            raise OperationError(f"Expression failed: {str(e)}")
+
+        if mode == 'steps':
+            self.record_calculations(steps)
+        elif mode == 'expression' and steps:
+            self.record_calculations(steps[-1:])
+        return result
+
+    def _compile_expression(self, expression: str, fold: bool) -> ExpressionPlan:
+        """
+        Return the plan of an expression from the plan cache, compiling it on a miss.
+
+        Folded values depend on the engine settings and validation on the
+        maximum input value, so both are part of the cache key. Must be
+        called inside engine_context.
+        """
+        def validate(value: Decimal) -> Decimal:
+            return InputValidator.validate_number(value, self.config)
+
+        key = (fold, self.config.precision, self.config.power_mode, self.config.max_input_value)
+        return self.expression_plans.get_or_compile(
+            expression, key, lambda: compile_expression(expression, fold, keep_root=True, validate=validate)
+        )
+
+    def record_calculations(self, calculations: Sequence[Calculation], undoable: bool = True) -> None:
+        """
+        Record calculations evaluated outside perform_operation.
+
+        Appends them to the history with their undo deltas and notifies each
+        observer once for the whole sequence. Without undo deltas the undo
+        stack is emptied instead, since its deltas no longer describe the end
+        of the history; streams record this way so that memory use does not
+        grow with the input.
+
+        Args:
+            calculations (Sequence[Calculation]): Calculations with their results, oldest first.
+            undoable (bool, optional): Push an undo delta for every calculation.
+        """
+        if not calculations:
+            return
+        with self._lock_history():
+            for calculation in calculations:
+                self._record_calculation(calculation, undoable)
+        self.notify_observers_batch(calculations)
+
+    def engine_context(self) -> ContextManager[EngineSettings]:
+        """
+        Return a context applying the configured Power/Root engine settings.
+
+        Power and Root compute to ``config.precision`` significant digits with
+        exact Decimal arithmetic, or through binary floats when
+        ``config.power_mode`` is 'float'.
+        """
+        return engine_context(self.config.precision, self.config.power_mode)
+
+    def _engine_settings(self) -> Dict[str, Any]:
+        """Return the settings that results depend on, to validate cached results."""
+        return {'precision': self.config.precision, 'power_mode': self.config.power_mode}
+
+    def _cached(self, operation: Operation) -> Operation:
+        """Wrap an operation with the result cache, if the cache is enabled."""
+        if self.result_cache is None:
+            return operation
+        self.result_cache.ensure_settings(self._engine_settings())
+        return CachedOperation(operation, self.result_cache)
+
+    def cache_stats(self) -> Optional[Dict[str, int]]:
+        """
+        Return the result cache counters.
+
+        Returns:
+            Optional[Dict[str, int]]: Size, maximum size, hits, misses and
+            evictions, or None if the cache is disabled.
+        """
+        return self.result_cache.stats() if self.result_cache is not None else None
+
+    @property
+    def process_pool(self) -> ProcessPoolBackend:
+        """Return the process pool for parallel evaluation, creating it on first use."""
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolBackend(self.config.workers, self.config.chunk_size)
+        return self._process_pool
+
+    @property
+    def sqlite_history(self) -> SQLiteHistory:
+        """Return the history database, opening it on first use."""
+        with self._save_lock:
+            if self._sqlite_history is None:
+                self._sqlite_history = SQLiteHistory(self.config.history_db_file)
+            return self._sqlite_history
+
+    def _record_calculation(self, calculation: Calculation, undoable: bool = True) -> None:
+        """
+        Append a calculation to the history and push its undo delta.
+
+        Evicts the oldest calculation if the history exceeds the maximum size and
+        clears the redo stack, since a new operation invalidates the redo history.
+
+        Args:
+            calculation (Calculation): The calculation to append.
+            undoable (bool, optional): Push the undo delta; otherwise the undo
+                stack is cleared.
+        """
+        with self._lock_history():
+            self._recorded += 1
+            calculation.sequence = self._recorded
+
+            # The history buffer evicts its oldest entry once it reaches the maximum size
+            evicted = self.history.append(calculation)
+
+            # Save the change to the undo stack so it can be reverted later
+            if undoable:
+                self.undo_stack.append(HistoryDelta(appended=calculation, evicted=evicted))
+            else:
+                self.undo_stack.clear()
+            self.redo_stack.clear()
+
+    def save_history(self) -> None:
+        """
+        Save calculation history to the history file.
+
+        Serializes the history of calculations and writes them to the file for
+        persistent storage: a CSV file written with pandas, or a binary file of
+        fixed-width records when ``config.history_format`` is 'binary'. With the
+        'sqlite' format only the rows of the in-memory history are rewritten;
+        older calculations stored in the database are kept.
+
+        Raises:
+            OperationError: If saving the history fails.
+        """
+        with self._save_lock:
+            try:
+                # Ensure the history directory exists
+                self.config.history_dir.mkdir(parents=True, exist_ok=True)
+
+                # Take a consistent copy of the history; the journal will match it once written
+                with self._lock_history():
+                    entries = list(self.history)
+                    rewrite_from = self._sqlite_rewrite_from
+                    self._journal_stale = False
+                    self._snapshot_sequence = self._recorded
+                    self._sqlite_rewrite_from = None
+
+                path = self.config.history_snapshot_file
+                if self.config.history_format == 'binary':
+                    write_binary_history(path, entries)
+                elif self.config.history_format == 'sqlite':
+                    self.sqlite_history.replace_tail(entries, rewrite_from)
+                else:
+                    write_history_csv(path, entries)
+                if entries:
+                    logging.info("History saved successfully to %s", path)
+                else:
+                    logging.info("Empty history saved")
+
+                # The snapshot now contains every journaled calculation
+                self._reset_journal()
+
+            except Exception as e:
+                # Log and raise an OperationError if saving fails
+                logging.error("Failed to save history: %s", e)
+                raise OperationError(f"Failed to save history: {e}")
 
     def load_history(self) -> None:
         """
-        Load calculation history from a CSV file using pandas.
+        Load calculation history from the history file.
 
-        Reads the calculation history from a CSV file and reconstructs the
-        Calculation instances, restoring the calculator's history.
+        Reads the newest ``max_history_size`` calculations from the file in the
+        configured format and restores the calculator's history. Calculations
+        recorded in the append-only journal since the last snapshot are replayed
+        on top of the snapshot.
 
         Raises:
             OperationError: If loading the history fails.
         """
-        try:
-            if self.config.history_file.exists():
-                # Read the CSV file into a pandas DataFrame
-                df = pd.read_csv(self.config.history_file)
-                if not df.empty:
-                    # Deserialize each row into a Calculation instance
-                    self.history = [
-                        Calculation.from_dict({
-                            'operation': row['operation'],
-                            'operand1': row['operand1'],
-                            'operand2': row['operand2'],
-                            'result': row['result'],
-                            'timestamp': row['timestamp']
-                        })
-                        for _, row in df.iterrows()
-                    ]
-                    logging.info(f"Loaded {len(self.history)} calculations from history")
-                else:
-                    logging.info("Loaded empty history file")
-            else:
-                # If no history file exists, start with an empty history
-                logging.info("No history file found - starting with empty history")
-        except Exception as e:
-            # Log and raise an OperationError if loading fails
-            logging.error(f"Failed to load history: {e}")
-            raise OperationError(f"Failed to load history: {e}")
+        with self._save_lock:
+            try:
+                snapshot_file = self.config.history_snapshot_file
+                if not snapshot_file.exists() and not self.config.history_journal_file.exists():
+                    # If no history file exists, start with an empty history
+                    logging.info("No history file found - starting with empty history")
+                    return
+
+                history = IndexedHistoryBuffer(self.config.max_history_size)
+                if snapshot_file.exists():
+                    loaded = self._read_snapshot()
+                    history.extend(loaded)
+                    if loaded:
+                        logging.info("Loaded %s calculations from history", len(history))
+                    else:
+                        logging.info("Loaded empty history file")
+
+                journaled = self._replay_journal(history)
+                with self._history_lock:
+                    self.history = history
+                    self._journal_entries = journaled
+                    self._journal_stale = False
+
+                    # Recorded deltas no longer describe the loaded history
+                    self.undo_stack.clear()
+                    self.redo_stack.clear()
+            except Exception as e:
+                # Log and raise an OperationError if loading fails
+                logging.error("Failed to load history: %s", e)
+                raise OperationError(f"Failed to load history: {e}")
+
+    def _read_snapshot(self) -> List[Calculation]:
+        """
+        Read the newest ``max_history_size`` calculations from the history file.
+
+        Unless ``config.trust_history_results`` is set, each result is recomputed
+        and a warning is logged when it differs from the stored value.
+
+        Returns:
+            List[Calculation]: The loaded calculations, oldest first.
+
+        Raises:
+            OperationError: If the file contains invalid calculation data.
+        """
+        limit = self.config.max_history_size
+        if self.config.history_format == 'binary':
+            with BinaryHistory(self.config.history_binary_file) as saved:
+                calculations = saved[-limit:]
+        elif self.config.history_format == 'sqlite':
+            calculations = self.sqlite_history.tail(limit)
+        else:
+            calculations = read_history_csv(self.config.history_file, limit)
+
+        if not self.config.trust_history_results:
+            with self.engine_context():
+                for calc in calculations:
+                    self._verify_loaded(calc)
+        return calculations
+
+    @staticmethod
+    def _verify_loaded(calc: Calculation) -> None:
+        """
+        Recompute a loaded calculation, keeping the computed result if they differ.
+
+        Must be called inside engine_context, so that Power and Root compute to
+        the configured precision.
+
+        Args:
+            calc (Calculation): The calculation read from storage.
+
+        Raises:
+            OperationError: If the operation is unknown or the calculation fails.
+        """
+        computed = calc.calculate()
+        if computed != calc.result:
+            logging.warning(
+                "Loaded calculation result %s differs from computed result %s",
+                calc.result, computed
+            )
+            calc.result = computed
+
+    def open_saved_history(self) -> BinaryHistory:
+        """
+        Open the saved binary history for random access.
+
+        Only the header is read, so this is instant even for a history far
+        larger than ``max_history_size``; entries are decoded on access.
+        Close the returned view when done.
+
+        Returns:
+            BinaryHistory: Read-only sequence of every saved calculation.
+
+        Raises:
+            OperationError: If the history format is not 'binary' or the file is invalid.
+        """
+        if self.config.history_format != 'binary':
+            raise OperationError("Random access requires the binary history format")
+        if not self.config.history_binary_file.exists():
+            raise OperationError(f"No saved history at {self.config.history_binary_file}")
+        return BinaryHistory(self.config.history_binary_file)
+
+    def append_history_journal(self, calculations: Iterable[Calculation]) -> None:
+        """
+        Persist new calculations by appending them to the history journal.
+
+        Each calculation is written as one CSV record, so the cost does not depend
+        on the size of the history. Once the journal holds
+        ``config.journal_compact_interval`` records, or if the history changed in a
+        way the journal cannot describe (undo, redo, clear), the full history is
+        written to the snapshot file instead and the journal is emptied.
+
+        With the 'sqlite' history format the calculations are inserted directly
+        into the database in one transaction; there is no journal to compact.
+
+        Args:
+            calculations (Iterable[Calculation]): Calculations to append, oldest first.
+
+        Raises:
+            OperationError: If writing the journal or the snapshot fails.
+        """
+        with self._save_lock:
+            if self._journal_stale:
+                self.save_history()
+                return
+            # A background writer can deliver calculations after a snapshot that
+            # already holds them (or evicted them); they must not be written twice
+            calculations = [
+                calc for calc in calculations
+                if calc.sequence is None or calc.sequence > self._snapshot_sequence
+            ]
+            if not calculations:
+                return
+            if self.config.history_format == 'sqlite':
+                try:
+                    self.sqlite_history.append(calculations)
+                except Exception as e:
+                    logging.error("Failed to append history: %s", e)
+                    raise OperationError(f"Failed to append history: {e}")
+                return
+            try:
+                with open(self.config.history_journal_file, 'a', newline='',
+                          encoding=self.config.default_encoding) as journal:
+                    writer = csv.writer(journal)
+                    written = 0
+                    for calc in calculations:
+                        writer.writerow([
+                            str(calc.operation),
+                            str(calc.operand1),
+                            str(calc.operand2),
+                            str(calc.result),
+                            calc.timestamp.isoformat()
+                        ])
+                        written += 1
+            except Exception as e:
+                logging.error("Failed to append history journal: %s", e)
+                raise OperationError(f"Failed to append history journal: {e}")
+
+            self._journal_entries += written
+            if self._journal_entries >= self.config.journal_compact_interval:
+                self.compact_history()
+
+    def compact_history(self) -> None:
+        """
+        Fold the history journal into the snapshot file.
 
-    def get_history_dataframe(self) -> pd.DataFrame:
+        Writes the full history to the CSV snapshot and removes the journal.
+
+        Raises:
+            OperationError: If saving the history fails.
+        """
+        self.save_history()
+        logging.info("History journal compacted")
+
+    def _replay_journal(self, history: HistoryBuffer) -> int:
+        """
+        Append journaled calculations to a freshly loaded history.
+
+        Incomplete or corrupt records, such as a partially written last line, are
+        skipped with a warning. Results are verified as in _read_snapshot, unless
+        ``config.trust_history_results`` is set. Every other record is replayed: the journal is
+        emptied whenever a snapshot is written and append_history_journal never
+        writes a calculation the snapshot already holds, so timestamps, which
+        can go backwards with the wall clock, are not compared.
+
+        Args:
+            history (HistoryBuffer): The history loaded from the snapshot file.
+
+        Returns:
+            int: The number of journal records read.
+        """
+        journal_file = self.config.history_journal_file
+        if not journal_file.exists():
+            return 0
+
+        trusted = self.config.trust_history_results
+        count = 0
+        with open(journal_file, newline='', encoding=self.config.default_encoding) as journal, \
+                self.engine_context():
+            for record in csv.reader(journal):
+                count += 1
+                try:
+                    operation, operand1, operand2, result, timestamp = record
+                    moment = datetime.datetime.fromisoformat(timestamp)
+                    calc = Calculation.from_parts(
+                        operation, Decimal(operand1), Decimal(operand2), Decimal(result),
+                        datetime_to_ns(moment), moment.tzinfo
+                    )
+                    if not trusted:
+                        self._verify_loaded(calc)
+                    history.append(calc)
+                except (ValueError, InvalidOperation, OperationError) as e:
+                    logging.warning("Skipping invalid journal record %s: %s", count, e)
+        logging.info("Replayed %s calculations from history journal", count)
+        return count
+
+    def _reset_journal(self) -> None:
+        """Remove the history journal once its records are part of the snapshot."""
+        self.config.history_journal_file.unlink(missing_ok=True)
+        self._journal_entries = 0
+
+    def get_history_dataframe(self) -> 'pd.DataFrame':
         """
         Get calculation history as a pandas DataFrame.
 
@@ -321,6 +977,8 @@ class Calculator:
         Returns:
             pd.DataFrame: DataFrame containing the calculation history.
         """
+        import pandas as pd
+
         history_data = []
         for calc in self.history:
             history_data.append({
@@ -332,6 +990,107 @@ class Calculator:
             })
         return pd.DataFrame(history_data)
 
+    def query_history(
+        self,
+        operation: Optional[str] = None,
+        since: Optional[datetime.datetime] = None,
+        until: Optional[datetime.datetime] = None,
+        operand1: Optional[Range] = None,
+        operand2: Optional[Range] = None,
+        result: Optional[Range] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        newest_first: bool = False
+    ) -> List[Calculation]:
+        """
+        Select calculations from the history.
+
+        Uses the operation and timestamp indexes of the history, so selecting a
+        few entries does not scan the whole history.
+
+        Args:
+            operation (Optional[str], optional): Operation identifier (e.g. 'divide')
+                or recorded name (e.g. 'Division').
+            since (Optional[datetime.datetime], optional): Earliest timestamp, inclusive.
+            until (Optional[datetime.datetime], optional): Latest timestamp, inclusive.
+            operand1 (Optional[Range], optional): Inclusive (low, high) bounds on the first operand;
+                either bound may be None.
+            operand2 (Optional[Range], optional): Bounds on the second operand.
+            result (Optional[Range], optional): Bounds on the result.
+            limit (Optional[int], optional): Maximum number of calculations to return.
+            offset (int, optional): Number of matches to skip.
+            newest_first (bool, optional): Return the newest matches first.
+
+        Returns:
+            List[Calculation]: The matching calculations.
+
+        Raises:
+            ValidationError: If limit or offset is negative.
+        """
+        if (limit is not None and limit < 0) or offset < 0:
+            raise ValidationError("limit and offset must not be negative")
+        if operation is not None:
+            try:
+                # Accept factory identifiers as well as recorded operation names
+                operation = str(OperationFactory.create_operation(operation))
+            except ValueError:
+                pass
+        query = HistoryQuery(
+            operation=operation, since=since, until=until,
+            operand1=_decimal_range(operand1), operand2=_decimal_range(operand2), result=_decimal_range(result),
+            limit=limit, offset=offset, newest_first=newest_first
+        )
+        with self._lock_history():
+            return list(self.history.query(query))
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get the hot-path timings and counters.
+
+        With ``config.metrics`` enabled, every perform_operation call records
+        the duration of its stages: ``validate``, ``execute``, ``calculation``
+        (constructing the Calculation), ``history_append`` or ``history_evict``,
+        ``memento`` (pushing the undo delta), one ``observer.<class name>``
+        stage per observer and ``notify`` (all observers, or queueing them in
+        async dispatch mode). ``perform_operation`` and ``perform_batch`` time
+        whole calls.
+
+        Returns:
+            Dict[str, Any]: ``enabled``; ``stages``, mapping each stage to its
+            count and mean, p50, p99 and max latency in microseconds;
+            ``counters`` (calculations, errors, evictions); ``cache``, the
+            result cache counters or None; ``expressions``, the expression plan
+            cache counters; ``observers``, the async dispatcher counters or None.
+        """
+        snapshot = self._metrics.snapshot() if self._metrics is not None else {'stages': {}, 'counters': {}}
+        return {
+            'enabled': self._metrics is not None,
+            **snapshot,
+            'cache': self.cache_stats(),
+            'expressions': self.expression_plans.stats(),
+            'observers': self.observer_dispatcher.stats() if self.observer_dispatcher is not None else None,
+        }
+
+    def reset_metrics(self) -> None:
+        """Discard the recorded timings and counters."""
+        if self._metrics is not None:
+            self._metrics.reset()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get running statistics of the results in the history, per operation.
+
+        The aggregates are maintained as calculations enter and leave the
+        history (including evictions, undo, redo and clear), so this does not
+        scan the history.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: For every operation in the history, keyed by
+            name (e.g. "Division"): ``count``, exact ``sum``, ``min``, ``max`` and ``mean``.
+        """
+        with self._lock_history():
+            return self.history.stats()
+
     def show_history(self) -> List[str]:
         """
         Get formatted history of calculations.
@@ -352,11 +1111,29 @@ class Calculator:
 
         Empties the calculation history and clears the undo and redo stacks.
         """
-        self.history.clear()
-        self.undo_stack.clear()
-        self.redo_stack.clear()
+        with self._lock_history():
+            self._mark_history_rewritten()
+            self.history.clear()
+            self.undo_stack.clear()
+            self.redo_stack.clear()
         logging.info("History cleared")
 
+    def _mark_history_rewritten(self) -> None:
+        """
+        Note that the saved history no longer matches the in-memory one.
+
+        Call with the history lock held, before changing the history in a way
+        appending cannot describe (undo, redo, clear). The next save rewrites
+        the snapshot instead of appending to the journal; with the 'sqlite'
+        format it replaces the rows from the first calculation currently in
+        memory onwards, and keeps the older ones.
+        """
+        self._journal_stale = True
+        if self.config.history_format == 'sqlite':
+            first = min((calc.row_id for calc in self.history if calc.row_id is not None), default=None)
+            if first is not None and (self._sqlite_rewrite_from is None or first < self._sqlite_rewrite_from):
+                self._sqlite_rewrite_from = first
+
     def undo(self) -> bool:
         """
         Undo the last operation.
@@ -367,15 +1144,16 @@ class Calculator:
         Returns:
             bool: True if an operation was undone, False if there was nothing to undo.
         """
-        if not self.undo_stack:
-            return False
-        # Pop the last state from the undo stack
-        memento = self.undo_stack.pop()
-        # Push the current state onto the redo stack
-        self.redo_stack.append(CalculatorMemento(self.history.copy()))
-        # Restore the history from the memento
-        self.history = memento.history.copy()
-        return True
+        with self._lock_history():
+            if not self.undo_stack:
+                return False
+            # Pop the last change from the undo stack and revert it
+            delta = self.undo_stack.pop()
+            self._mark_history_rewritten()
+            delta.revert(self.history)
+            # Keep the change on the redo stack so it can be reapplied
+            self.redo_stack.append(delta)
+            return True
 
     def redo(self) -> bool:
         """
@@ -386,12 +1164,62 @@ class Calculator:
         Returns:
             bool: True if an operation was redone, False if there was nothing to redo.
         """
-        if not self.redo_stack:
+        with self._lock_history():
+            if not self.redo_stack:
+                return False
+            # Pop the last undone change from the redo stack and reapply it
+            delta = self.redo_stack.pop()
+            self._mark_history_rewritten()
+            delta.apply(self.history)
+            # Keep the change on the undo stack so it can be reverted again
+            self.undo_stack.append(delta)
+            return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until pending auto-saves are durable.
+
+        First waits until queued observer notifications have been delivered (in
+        'async' dispatch mode), then for every observer that persists
+        asynchronously, i.e. one providing a ``flush`` method such as
+        AutoSaveObserver with a background writer.
+
+        Args:
+            timeout (Optional[float], optional): Maximum number of seconds to wait per observer.
+
+        Returns:
+            bool: True if every pending save completed successfully.
+        """
+        if self.observer_dispatcher is not None and not self.observer_dispatcher.flush(timeout):
             return False
-        # Pop the last state from the redo stack
-        memento = self.redo_stack.pop()
-        # Push the current state onto the undo stack
-        self.undo_stack.append(CalculatorMemento(self.history.copy()))
-        # Restore the history from the memento
-        self.history = memento.history.copy()
-        return True
\ No newline at end of file
+        return all([observer.flush(timeout) for observer in self.observers if hasattr(observer, 'flush')])
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Shut down background work, flushing pending auto-saves first.
+
+        Queued observer notifications are delivered before the observers are
+        closed. Also stops the worker processes, if any were started, saves the result
+        cache when it is persisted, and closes the history database.
+
+        Args:
+            timeout (Optional[float], optional): Maximum number of seconds to wait per observer.
+
+        Returns:
+            bool: True if every pending save completed successfully.
+        """
+        if self._process_pool is not None:
+            self._process_pool.close()
+            self._process_pool = None
+        if self.result_cache is not None and self.config.cache_persist:
+            try:
+                self.result_cache.save(self.config.cache_file)
+            except OSError as e:
+                logging.error("Failed to save result cache: %s", e)
+        delivered = self.observer_dispatcher.close(timeout) if self.observer_dispatcher is not None else True
+        saved = all([observer.close(timeout) for observer in self.observers if hasattr(observer, 'close')])
+        with self._save_lock:
+            if self._sqlite_history is not None:
+                self._sqlite_history.close()
+                self._sqlite_history = None
+        return delivered and saved
@@ -9,12 +9,25 @@ from pathlib import Path
 import os
 from typing import Optional
 
-from dotenv import load_dotenv
-
 from app.exceptions import ConfigurationError
 
-# Load environment variables from a .env file
-load_dotenv()
+# Whether the .env file has been loaded into the environment
+_environment_loaded = False
+
+
+def load_environment() -> None:
+    """
+    Load environment variables from a .env file, once.
+
+    Called when the first configuration is created rather than at import time,
+    so importing the application does not pay for python-dotenv.
+    """
+    global _environment_loaded
+    if not _environment_loaded:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _environment_loaded = True
 
 
 def get_project_root() -> Path:
@@ -33,8 +46,34 @@ class CalculatorConfig:
         auto_save: Optional[bool] = None,
         precision: Optional[int] = None,
         max_input_value: Optional[Number] = None,
-        default_encoding: Optional[str] = None
+        default_encoding: Optional[str] = None,
+        auto_save_mode: Optional[str] = None,
+        journal_compact_interval: Optional[int] = None,
+        auto_save_background: Optional[bool] = None,
+        auto_save_every_n: Optional[int] = None,
+        auto_save_interval_ms: Optional[int] = None,
+        auto_save_idle_ms: Optional[int] = None,
+        trust_history_results: Optional[bool] = None,
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        power_mode: Optional[str] = None,
+        cache_size: Optional[int] = None,
+        cache_persist: Optional[bool] = None,
+        history_format: Optional[str] = None,
+        observer_dispatch: Optional[str] = None,
+        observer_queue_size: Optional[int] = None,
+        observer_overflow: Optional[str] = None,
+        log_max_bytes: Optional[int] = None,
+        log_backup_count: Optional[int] = None,
+        log_sample_rate: Optional[float] = None,
+        metrics: Optional[bool] = None,
+        profile: Optional[str] = None,
+        profile_top: Optional[int] = None,
+        expression_history: Optional[str] = None,
+        expression_cache_size: Optional[int] = None
     ):
+        load_environment()
+
         # Base directory defaults to project root
         self.base_dir = base_dir or Path(os.getenv('CALCULATOR_BASE_DIR', str(get_project_root())))
 
@@ -45,9 +84,117 @@ class CalculatorConfig:
         auto_save_env = os.getenv('CALCULATOR_AUTO_SAVE', 'true').lower()
         self.auto_save = auto_save if auto_save is not None else (auto_save_env in ('true', '1'))
 
+        # History file format: 'csv', 'binary' (fixed-width records read through mmap)
+        # or 'sqlite' (a database that keeps every calculation, with only the newest in memory)
+        self.history_format = (history_format or os.getenv('CALCULATOR_HISTORY_FORMAT', 'csv')).lower()
+
+        # Auto-save mode: 'snapshot' rewrites the history file, 'journal' appends one record per calculation
+        self.auto_save_mode = (auto_save_mode or os.getenv('CALCULATOR_AUTO_SAVE_MODE', 'snapshot')).lower()
+
+        # Number of journal records written before compacting them into the history file
+        self.journal_compact_interval = journal_compact_interval or int(
+            os.getenv('CALCULATOR_JOURNAL_COMPACT_INTERVAL', '1000')
+        )
+
+        # Background auto-save: write on a worker thread, coalescing bursts of calculations
+        background_env = os.getenv('CALCULATOR_AUTO_SAVE_BACKGROUND', 'false').lower()
+        self.auto_save_background = (
+            auto_save_background if auto_save_background is not None else (background_env in ('true', '1'))
+        )
+
+        # Background auto-save triggers (0 disables a trigger): after N pending calculations,
+        # T milliseconds after the first pending calculation, or after an idle period
+        self.auto_save_every_n = (
+            auto_save_every_n if auto_save_every_n is not None
+            else int(os.getenv('CALCULATOR_AUTO_SAVE_EVERY_N', '100'))
+        )
+        self.auto_save_interval_ms = (
+            auto_save_interval_ms if auto_save_interval_ms is not None
+            else int(os.getenv('CALCULATOR_AUTO_SAVE_INTERVAL_MS', '1000'))
+        )
+        self.auto_save_idle_ms = (
+            auto_save_idle_ms if auto_save_idle_ms is not None
+            else int(os.getenv('CALCULATOR_AUTO_SAVE_IDLE_MS', '200'))
+        )
+
+        # Trust the stored result column when loading history instead of recomputing it
+        trust_env = os.getenv('CALCULATOR_TRUST_HISTORY_RESULTS', 'false').lower()
+        self.trust_history_results = (
+            trust_history_results if trust_history_results is not None else (trust_env in ('true', '1'))
+        )
+
+        # Worker processes for batch and stream evaluation (1 evaluates in-process)
+        self.workers = workers or int(os.getenv('CALCULATOR_WORKERS', '1'))
+
+        # Elements sent to a worker process at a time
+        self.chunk_size = chunk_size or int(os.getenv('CALCULATOR_CHUNK_SIZE', '1000'))
+
         # Calculation precision
         self.precision = precision or int(os.getenv('CALCULATOR_PRECISION', '10'))
 
+        # Power/Root engine: exact Decimal arithmetic at `precision` digits, or the float fast path
+        self.power_mode = (power_mode or os.getenv('CALCULATOR_POWER_MODE', 'decimal')).lower()
+
+        # Results memoized per (operation, operands); 0 disables the cache
+        self.cache_size = (
+            cache_size if cache_size is not None
+            else int(os.getenv('CALCULATOR_CACHE_SIZE', '0'))
+        )
+
+        # Keep the result cache across restarts
+        cache_persist_env = os.getenv('CALCULATOR_CACHE_PERSIST', 'false').lower()
+        self.cache_persist = (
+            cache_persist if cache_persist is not None else (cache_persist_env in ('true', '1'))
+        )
+
+        # Observer notifications: 'sync' calls observers inside the calculation,
+        # 'async' queues them for a worker thread
+        self.observer_dispatch = (observer_dispatch or os.getenv('CALCULATOR_OBSERVER_DISPATCH', 'sync')).lower()
+
+        # Maximum queued notifications in async mode, and what to do when the queue is full
+        self.observer_queue_size = observer_queue_size or int(os.getenv('CALCULATOR_OBSERVER_QUEUE_SIZE', '1024'))
+        self.observer_overflow = (
+            observer_overflow or os.getenv('CALCULATOR_OBSERVER_OVERFLOW', 'block')
+        ).lower()
+
+        # Log file rotation: size in bytes at which calculator.log is rotated (0 never rotates),
+        # and the number of rotated files kept
+        self.log_max_bytes = (
+            log_max_bytes if log_max_bytes is not None
+            else int(os.getenv('CALCULATOR_LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+        )
+        self.log_backup_count = (
+            log_backup_count if log_backup_count is not None
+            else int(os.getenv('CALCULATOR_LOG_BACKUP_COUNT', '5'))
+        )
+
+        # Share of per-calculation events written to the log (1 logs every calculation)
+        self.log_sample_rate = (
+            log_sample_rate if log_sample_rate is not None
+            else float(os.getenv('CALCULATOR_LOG_SAMPLE_RATE', '1.0'))
+        )
+
+        # Time the stages of every calculation into latency histograms (see Calculator.metrics)
+        metrics_env = os.getenv('CALCULATOR_METRICS', 'false').lower()
+        self.metrics = metrics if metrics is not None else (metrics_env in ('true', '1'))
+
+        # Profile the REPL loop or a stream run: 'off', 'cpu' (cProfile .prof files) or
+        # 'mem' (tracemalloc reports of the top allocation sites), written to the log directory
+        self.profile = (profile or os.getenv('CALCULATOR_PROFILE', 'off')).lower()
+        self.profile_top = profile_top or int(os.getenv('CALCULATOR_PROFILE_TOP', '25'))
+
+        # What evaluate_expression records: 'expression' (the final operation, as one entry),
+        # 'steps' (every operation) or 'off'
+        self.expression_history = (
+            expression_history or os.getenv('CALCULATOR_EXPRESSION_HISTORY', 'expression')
+        ).lower()
+
+        # Compiled expression plans kept in an LRU cache; 0 disables the cache
+        self.expression_cache_size = (
+            expression_cache_size if expression_cache_size is not None
+            else int(os.getenv('CALCULATOR_EXPRESSION_CACHE_SIZE', '256'))
+        )
+
         # Max input value
         self.max_input_value = max_input_value or Decimal(os.getenv('CALCULATOR_MAX_INPUT_VALUE', '1e999'))
 
@@ -77,6 +224,35 @@ class CalculatorConfig:
         """Return the CSV file path for calculation history."""
         return self.history_dir / "calculator_history.csv"
 
+    @property
+    def history_binary_file(self) -> Path:
+        """Return the binary file path for calculation history."""
+        return self.history_dir / "calculator_history.bin"
+
+    @property
+    def history_db_file(self) -> Path:
+        """Return the SQLite database path for calculation history."""
+        return self.history_dir / "calculator_history.db"
+
+    @property
+    def history_snapshot_file(self) -> Path:
+        """Return the history file used by save_history and load_history for the configured format."""
+        if self.history_format == 'binary':
+            return self.history_binary_file
+        if self.history_format == 'sqlite':
+            return self.history_db_file
+        return self.history_file
+
+    @property
+    def history_journal_file(self) -> Path:
+        """Return the append-only journal file path for calculation history."""
+        return self.history_dir / "calculator_history.journal"
+
+    @property
+    def cache_file(self) -> Path:
+        """Return the file path of the persisted result cache."""
+        return self.history_dir / "calculator_cache.json"
+
     @property
     def log_file(self) -> Path:
         """Return the log file path."""
@@ -94,3 +270,41 @@ class CalculatorConfig:
             raise ConfigurationError("precision must be positive")
         if self.max_input_value <= 0:
             raise ConfigurationError("max_input_value must be positive")
+        if self.history_format not in ('csv', 'binary', 'sqlite'):
+            raise ConfigurationError("history_format must be 'csv', 'binary' or 'sqlite'")
+        if self.auto_save_mode not in ('snapshot', 'journal'):
+            raise ConfigurationError("auto_save_mode must be 'snapshot' or 'journal'")
+        if self.journal_compact_interval <= 0:
+            raise ConfigurationError("journal_compact_interval must be positive")
+        if min(self.auto_save_every_n, self.auto_save_interval_ms, self.auto_save_idle_ms) < 0:
+            raise ConfigurationError("auto-save triggers must not be negative")
+        if self.auto_save_background and not (
+            self.auto_save_every_n or self.auto_save_interval_ms or self.auto_save_idle_ms
+        ):
+            raise ConfigurationError("background auto-save needs at least one trigger")
+        if self.power_mode not in ('decimal', 'float'):
+            raise ConfigurationError("power_mode must be 'decimal' or 'float'")
+        if self.cache_size < 0:
+            raise ConfigurationError("cache_size must not be negative")
+        if self.workers <= 0:
+            raise ConfigurationError("workers must be positive")
+        if self.chunk_size <= 0:
+            raise ConfigurationError("chunk_size must be positive")
+        if self.observer_dispatch not in ('sync', 'async'):
+            raise ConfigurationError("observer_dispatch must be 'sync' or 'async'")
+        if self.observer_queue_size <= 0:
+            raise ConfigurationError("observer_queue_size must be positive")
+        if self.observer_overflow not in ('block', 'drop_oldest', 'coalesce'):
+            raise ConfigurationError("observer_overflow must be 'block', 'drop_oldest' or 'coalesce'")
+        if self.log_max_bytes < 0 or self.log_backup_count < 0:
+            raise ConfigurationError("log rotation settings must not be negative")
+        if not 0 <= self.log_sample_rate <= 1:
+            raise ConfigurationError("log_sample_rate must be between 0 and 1")
+        if self.profile not in ('off', 'cpu', 'mem'):
+            raise ConfigurationError("profile must be 'off', 'cpu' or 'mem'")
+        if self.profile_top <= 0:
+            raise ConfigurationError("profile_top must be positive")
+        if self.expression_history not in ('expression', 'steps', 'off'):
+            raise ConfigurationError("expression_history must be 'expression', 'steps' or 'off'")
+        if self.expression_cache_size < 0:
+            raise ConfigurationError("expression_cache_size must not be negative")
@@ -4,9 +4,10 @@
 
 from dataclasses import dataclass, field
 import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, Optional, Sequence
 
 from app.calculation import Calculation
+from app.history_buffer import HistoryBuffer
 
 
 @dataclass
@@ -18,7 +19,7 @@ class CalculatorMemento:
     so that it can be restored later. This enables features like undo and redo.
     """
 
-    history: List[Calculation]  # List of Calculation instances representing the calculator's history
+    history: Sequence[Calculation]  # Calculation instances (list or HistoryBuffer) representing the calculator's history
     timestamp: datetime.datetime = field(default_factory=datetime.datetime.now)  # Time when the memento was created
 
     def to_dict(self) -> Dict[str, Any]:
@@ -53,4 +54,74 @@ class CalculatorMemento:
         return cls(
             history=[Calculation.from_dict(calc) for calc in data['history']],
             timestamp=datetime.datetime.fromisoformat(data['timestamp'])
-        )
\ No newline at end of file
+        )
+
+@dataclass
+class HistoryDelta:
+    """
+    Stores a single history change for undo/redo functionality.
+
+    Instead of copying the whole history, each calculation records only what it
+    changed: the entry appended to the end of the history and, when the history
+    was full, the entry evicted from the front. Reverting or reapplying a delta
+    touches at most two entries, so undo and redo cost O(1) and the undo stack
+    grows linearly with the number of operations.
+    """
+
+    appended: Calculation  # Calculation appended to the end of the history
+    evicted: Optional[Calculation] = None  # Calculation evicted from the front, if any
+    timestamp: datetime.datetime = field(default_factory=datetime.datetime.now)  # Time when the delta was created
+
+    def revert(self, history: HistoryBuffer) -> None:
+        """
+        Undo this change on the given history.
+
+        Removes the appended calculation and restores the evicted one, if any.
+
+        Args:
+            history (HistoryBuffer): The history to modify in place.
+        """
+        history.pop()
+        if self.evicted is not None:
+            history.appendleft(self.evicted)
+
+    def apply(self, history: HistoryBuffer) -> None:
+        """
+        Reapply this change on the given history.
+
+        Re-appends the calculation; a full history evicts its oldest entry again.
+
+        Args:
+            history (HistoryBuffer): The history to modify in place.
+        """
+        history.append(self.appended)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert delta to dictionary.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing the serialized delta.
+        """
+        return {
+            'appended': self.appended.to_dict(),
+            'evicted': self.evicted.to_dict() if self.evicted is not None else None,
+            'timestamp': self.timestamp.isoformat()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'HistoryDelta':
+        """
+        Create delta from dictionary.
+
+        Args:
+            data (Dict[str, Any]): Dictionary containing serialized delta data.
+
+        Returns:
+            HistoryDelta: A new instance of HistoryDelta with restored state.
+        """
+        return cls(
+            appended=Calculation.from_dict(data['appended']),
+            evicted=Calculation.from_dict(data['evicted']) if data.get('evicted') else None,
+            timestamp=datetime.datetime.fromisoformat(data['timestamp'])
+        )
@@ -2,13 +2,142 @@
 # Calculator REPL       #
 ########################
 
-from decimal import Decimal
+import datetime
+from decimal import Decimal, InvalidOperation
 import logging
+import shlex
+from typing import Any, Dict, List, Tuple
 
 from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
 from app.exceptions import OperationError, ValidationError
 from app.history import AutoSaveObserver, LoggingObserver
 from app.operations import OperationFactory
+from app.profiling import PROFILE_MODES, Profiler
+
+
+def run_profile_command(profiler: Profiler, arguments: List[str], config: CalculatorConfig) -> Tuple[Profiler, str]:
+    """
+    Execute the 'profile' command.
+
+    Syntax: ``profile`` shows whether profiling is running; ``profile start
+    [cpu|mem]`` starts it (in the configured mode, or cpu); ``profile dump``
+    writes what was collected so far; ``profile stop`` writes it and stops.
+
+    Args:
+        profiler (Profiler): The session's profiler.
+        arguments (List[str]): The words following 'profile'.
+        config (CalculatorConfig): Configuration giving the output directory and report size.
+
+    Returns:
+        Tuple[Profiler, str]: The profiler to use from now on (a new one when
+        starting in another mode) and the message to print.
+
+    Raises:
+        ValueError: If the arguments are invalid.
+        RuntimeError: If the profiler is not in a state allowing the action.
+    """
+    if not arguments:
+        state = "running" if profiler.active else "stopped"
+        return profiler, f"Profiler ({profiler.mode}) is {state}"
+    action, options = arguments[0], arguments[1:]
+    if action == 'start' and len(options) <= 1:
+        mode = options[0] if options else profiler.mode
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        if mode != profiler.mode and not profiler.active:
+            profiler = Profiler(mode, config.log_dir, config.profile_top)
+        profiler.start()
+        return profiler, f"Profiling ({profiler.mode}) started"
+    if action in ('stop', 'dump') and not options:
+        path = profiler.stop() if action == 'stop' else profiler.dump()
+        return profiler, f"Profile written to {path}"
+    raise ValueError("Usage: profile [start [cpu|mem] | stop | dump]")
+
+
+def stop_profiling(profiler: Profiler) -> None:
+    """Write and stop a running profile when the REPL exits."""
+    if profiler.active:
+        print(f"Profile written to {profiler.stop()}")
+
+
+def format_metrics(metrics: Dict[str, Any]) -> List[str]:
+    """
+    Format the result of Calculator.metrics for display.
+
+    Args:
+        metrics (Dict[str, Any]): The metrics returned by Calculator.metrics.
+
+    Returns:
+        List[str]: One line per stage, counter group and component.
+    """
+    if not metrics['enabled']:
+        return ["Metrics are disabled (set CALCULATOR_METRICS=true to enable them)"]
+    if not metrics['stages']:
+        return ["No calculations timed yet"]
+    lines = []
+    for stage, summary in metrics['stages'].items():
+        lines.append(
+            f"{stage}: count={summary['count']}, mean={summary['mean_us']}us, "
+            f"p50<={summary['p50_us']}us, p99<={summary['p99_us']}us, max={summary['max_us']}us"
+        )
+    lines.append(", ".join(f"{name}={value}" for name, value in metrics['counters'].items()))
+    for component in ('cache', 'expressions', 'observers'):
+        if metrics[component] is not None:
+            counters = ", ".join(f"{name}={value}" for name, value in metrics[component].items())
+            lines.append(f"{component}: {counters}")
+    return lines
+
+
+def parse_history_arguments(arguments: List[str]) -> Dict[str, Any]:
+    """
+    Parse the arguments of the 'history' command into query_history criteria.
+
+    Syntax: ``history [operation] [--last N] [--since DATE] [--until DATE]
+    [--min X] [--max X]``, where ``--min``/``--max`` bound the result and dates
+    are ISO 8601 (e.g. 2024-01-31 or "2024-01-31 12:00").
+
+    Args:
+        arguments (List[str]): The words following 'history'.
+
+    Returns:
+        Dict[str, Any]: Keyword arguments for Calculator.query_history; empty
+        when no arguments were given.
+
+    Raises:
+        ValueError: If an argument is unknown or malformed.
+    """
+    criteria: Dict[str, Any] = {}
+    low = high = None
+    words = iter(arguments)
+    for word in words:
+        if not word.startswith('--'):
+            if 'operation' in criteria:
+                raise ValueError(f"Unexpected argument: {word}")
+            criteria['operation'] = word
+            continue
+        if word not in ('--last', '--since', '--until', '--min', '--max'):
+            raise ValueError(f"Unknown option: {word}")
+        value = next(words, None)
+        if value is None:
+            raise ValueError(f"{word} needs a value")
+        try:
+            if word == '--last':
+                criteria['limit'] = int(value)
+                criteria['newest_first'] = True
+                if criteria['limit'] <= 0:
+                    raise ValueError
+            elif word in ('--since', '--until'):
+                criteria[word[2:]] = datetime.datetime.fromisoformat(value)
+            elif word == '--min':
+                low = Decimal(value)
+            else:
+                high = Decimal(value)
+        except (ValueError, InvalidOperation):
+            raise ValueError(f"Invalid value for {word}: {value}")
+    if low is not None or high is not None:
+        criteria['result'] = (low, high)
+    return criteria
 
 
 def calculator_repl():
@@ -19,13 +148,21 @@ def calculator_repl():
     for commands, processes arithmetic operations, and manages calculation history.
     """
     try:
-        # Initialize the Calculator instance
-        calc = Calculator()
+        # Initialize the Calculator instance; saved history finishes loading in the
+        # background while the first prompt is shown
+        calc = Calculator(load_history_in_background=True)
 
         # Register observers for logging and auto-saving history
-        calc.add_observer(LoggingObserver())
+        calc.add_observer(LoggingObserver(calc.config.log_sample_rate))
         calc.add_observer(AutoSaveObserver(calc))
 
+        # Profile the session from the start when CALCULATOR_PROFILE is set;
+        # 'profile start' can still turn it on later
+        profile_mode = calc.config.profile if calc.config.profile != 'off' else 'cpu'
+        profiler = Profiler(profile_mode, calc.config.log_dir, calc.config.profile_top)
+        if calc.config.profile != 'off':
+            profiler.start()
+
         print("Calculator started. Type 'help' for commands.")
 
         while True:
@@ -37,25 +174,53 @@ def calculator_repl():
                     # Display available commands
                     print("\nAvailable commands:")
                     print("  add, subtract, multiply, divide, power, root - Perform calculations")
+                    print("  eval <expression> - Evaluate an expression, e.g. eval (3 + 4) * 2 ^ 10 / root(81, 4)")
                     print("  history - Show calculation history")
+                    print("  history [operation] [--last N] [--since DATE] [--until DATE] [--min X] [--max X]"
+                          " - Show matching calculations")
+                    print("  stats - Show result statistics per operation")
                     print("  clear - Clear calculation history")
                     print("  undo - Undo the last calculation")
                     print("  redo - Redo the last undone calculation")
                     print("  save - Save calculation history to file")
                     print("  load - Load calculation history from file")
+                    print("  cache - Show result cache statistics")
+                    print("  metrics [reset] - Show (or reset) timings of each calculation stage")
+                    print("  profile [start [cpu|mem] | stop | dump] - Profile CPU time or memory allocations")
                     print("  exit - Exit the calculator")
                     continue
 
                 if command == 'exit':
-                    # Attempt to save history before exiting
+                    stop_profiling(profiler)
+                    # Attempt to save history before exiting, after pending auto-saves finish,
+                    # then shut down background work and the history database
                     try:
+                        calc.flush()
                         calc.save_history()
                         print("History saved successfully.")
                     except Exception as e:
                         print(f"Warning: Could not save history: {e}")
+                    calc.close()
                     print("Goodbye!")
                     break
 
+                if command.startswith('history '):
+                    # Display the calculations matching a query, oldest first
+                    try:
+                        criteria = parse_history_arguments(shlex.split(command)[1:])
+                        matches = calc.query_history(**criteria)
+                    except (ValueError, ValidationError) as e:
+                        print(f"Error: {e}")
+                        continue
+                    if criteria.get('newest_first'):
+                        matches.reverse()
+                    if not matches:
+                        print("No matching calculations")
+                    else:
+                        for entry in matches:
+                            print(entry)
+                    continue
+
                 if command == 'history':
                     # Display calculation history
                     history = calc.show_history()
@@ -67,6 +232,19 @@ def calculator_repl():
                             print(f"{i}. {entry}")
                     continue
 
+                if command == 'stats':
+                    # Display running aggregates of the results per operation
+                    stats = calc.stats()
+                    if not stats:
+                        print("No calculations in history")
+                    for operation, summary in stats.items():
+                        print(
+                            f"{operation}: count={summary['count']}, sum={summary['sum'].normalize()}, "
+                            f"min={summary['min'].normalize()}, max={summary['max'].normalize()}, "
+                            f"mean={summary['mean'].normalize()}"
+                        )
+                    continue
+
                 if command == 'clear':
                     # Clear calculation history
                     calc.clear_history()
@@ -107,6 +285,50 @@ def calculator_repl():
                         print(f"Error loading history: {e}")
                     continue
 
+                if command == 'cache':
+                    # Display result cache counters
+                    stats = calc.cache_stats()
+                    if stats is None:
+                        print("Result cache is disabled (set CALCULATOR_CACHE_SIZE to enable it)")
+                    else:
+                        print(
+                            f"Result cache: {stats['size']}/{stats['max_size']} entries, "
+                            f"{stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions"
+                        )
+                    continue
+
+                if command == 'eval' or command.startswith('eval '):
+                    # Evaluate an infix expression; 'ans' is the previous result
+                    expression = command[len('eval'):].strip()
+                    if not expression:
+                        print("Usage: eval <expression>")
+                        continue
+                    try:
+                        result = calc.evaluate_expression(expression)
+                        print(f"\nResult: {result.normalize()}")
+                    except (ValidationError, OperationError) as e:
+                        print(f"Error: {e}")
+                    continue
+
+                if command == 'profile' or command.startswith('profile '):
+                    # Control the CPU or memory profiler
+                    try:
+                        profiler, message = run_profile_command(profiler, command.split()[1:], calc.config)
+                        print(message)
+                    except (ValueError, RuntimeError) as e:
+                        print(f"Error: {e}")
+                    continue
+
+                if command in ('metrics', 'metrics reset'):
+                    # Display the stage latency histograms and counters
+                    if command == 'metrics reset':
+                        calc.reset_metrics()
+                        print("Metrics reset")
+                        continue
+                    for line in format_metrics(calc.metrics()):
+                        print(line)
+                    continue
+
                 if command in ['add', 'subtract', 'multiply', 'divide', 'power', 'root']:
                     # Perform the specified arithmetic operation
                     try:
@@ -150,6 +372,8 @@ def calculator_repl():
             except EOFError:
                 # Handle end-of-file (e.g., Ctrl+D) gracefully
                 print("\nInput terminated. Exiting...")
+                stop_profiling(profiler)
+                calc.close()
                 break
             except Exception as e:
                 # Handle any other unexpected exceptions
@@ -159,5 +383,5 @@ def calculator_repl():
     except Exception as e:
         # Handle fatal errors during initialization
         print(f"Fatal error: {e}")
-        logging.error(f"Fatal error in calculator REPL: {e}")
+        logging.error("Fatal error in calculator REPL: %s", e)
         raise
\ No newline at end of file
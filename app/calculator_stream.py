@@ -0,0 +1,330 @@
+########################
+# Calculator Streaming  #
+########################
+
+from collections import deque
+import csv
+from dataclasses import dataclass
+from decimal import Decimal
+import io
+import json
+import logging
+from typing import Deque, Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+from app.calculation import Calculation
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.decimal_math import engine_context
+from app.exceptions import OperationError, ValidationError
+from app.input_validators import InputValidator
+from app.operations import Operation, OperationFactory
+from app.parallel import ProcessPoolBackend
+from app.profiling import profiled
+
+OUTPUT_FORMATS = ('plain', 'csv', 'jsonl')
+HISTORY_MODES = ('off', 'sampled', 'full')
+
+
+@dataclass
+class StreamResult:
+    """Outcome of evaluating one input line."""
+
+    line: int                       # 1-based line number in the input
+    operation: str                  # Operation name as written (e.g. 'add')
+    operand1: str                   # First operand as written
+    operand2: str                   # Second operand as written
+    result: Optional[Decimal] = None  # Result, or None if the line failed
+    error: Optional[str] = None     # Error message, or None on success
+
+
+def parse_lines(lines: Iterable[str]) -> Iterator[StreamResult]:
+    """
+    Parse input lines of the form ``<operation> <a> <b>``.
+
+    Blank lines and lines starting with '#' are skipped. Malformed lines are
+    yielded with an error instead of stopping the stream.
+
+    Args:
+        lines (Iterable[str]): Input lines, e.g. a file object.
+
+    Yields:
+        StreamResult: One unevaluated command (or parse error) per input line.
+    """
+    for number, line in enumerate(lines, 1):
+        text = line.strip()
+        if not text or text.startswith('#'):
+            continue
+        parts = text.split()
+        if len(parts) != 3:
+            yield StreamResult(number, parts[0].lower(), '', '', error=f"Expected '<operation> <a> <b>', got: {text}")
+            continue
+        yield StreamResult(number, parts[0].lower(), parts[1], parts[2])
+
+
+def evaluate(
+    commands: Iterable[StreamResult],
+    config: CalculatorConfig,
+    calculator: Optional[Calculator] = None,
+    history: str = 'off',
+    sample_every: int = 100
+) -> Iterator[StreamResult]:
+    """
+    Evaluate parsed commands lazily, one at a time.
+
+    Every operation is executed directly after validation. With history 'off'
+    nothing is recorded; with 'full' every successful command is added to the
+    calculator's history, and with 'sampled' every ``sample_every``-th one.
+    Recorded commands get no undo entries (see Calculator.record_calculations),
+    so memory use does not grow with the input.
+
+    Args:
+        commands (Iterable[StreamResult]): Commands from parse_lines.
+        config (CalculatorConfig): Configuration used for input validation.
+        calculator (Optional[Calculator], optional): Calculator recording history;
+            required unless history is 'off'.
+        history (str, optional): 'off', 'sampled' or 'full'.
+        sample_every (int, optional): Recording interval for 'sampled'.
+
+    Yields:
+        StreamResult: The command with its result or error filled in.
+    """
+    operations: Dict[str, Operation] = {}
+    evaluated = 0
+    for command in commands:
+        if command.error is not None:
+            yield command
+            continue
+        try:
+            operation = operations.get(command.operation)
+            if operation is None:
+                operation = operations[command.operation] = OperationFactory.create_operation(command.operation)
+
+            a = InputValidator.validate_number(command.operand1, config)
+            b = InputValidator.validate_number(command.operand2, config)
+            command.result = operation.execute(a, b)
+            if history == 'full' or (history == 'sampled' and evaluated % sample_every == 0):
+                calculator.record_calculations([Calculation(str(operation), a, b, result=command.result)],
+                                               undoable=False)
+            evaluated += 1
+        except (ValidationError, OperationError, ValueError, ArithmeticError) as e:
+            command.error = str(e)
+        yield command
+
+
+def evaluate_parallel(
+    commands: Iterable[StreamResult],
+    config: CalculatorConfig,
+    backend: ProcessPoolBackend,
+    calculator: Optional[Calculator] = None,
+    history: str = 'off',
+    sample_every: int = 100
+) -> Iterator[StreamResult]:
+    """
+    Evaluate parsed commands on a process pool, yielding them in input order.
+
+    Operands are validated in this process and executed in chunks by the
+    backend's workers. Recorded commands (see evaluate) are added to the
+    calculator's history with the result computed by the worker. Commands that
+    fail before execution wait behind the submitted ones; once as many are
+    buffered as the backend keeps in flight, the pool is drained and they are
+    yielded before more input is read.
+
+    Args:
+        commands (Iterable[StreamResult]): Commands from parse_lines.
+        config (CalculatorConfig): Configuration used for input validation.
+        backend (ProcessPoolBackend): The process pool executing the operations.
+        calculator (Optional[Calculator], optional): Calculator recording history;
+            required unless history is 'off'.
+        history (str, optional): 'off', 'sampled' or 'full'.
+        sample_every (int, optional): Recording interval for 'sampled'.
+
+    Yields:
+        StreamResult: The command with its result or error filled in.
+    """
+    operations: Dict[str, Operation] = {}
+    commands = iter(commands)
+    # Commands read but not yet yielded, with their operation and validated operands
+    # (None for commands that failed before execution)
+    in_flight: Deque[Tuple[StreamResult, Optional[Tuple[Operation, Decimal, Decimal]]]] = deque()
+    # Failed commands are buffered up to the backend's own window of in-flight work
+    window = 2 * backend.workers * backend.chunk_size
+    failed = 0
+    exhausted = False
+
+    def prepare() -> Iterator[Tuple[Operation, Decimal, Decimal]]:
+        nonlocal failed, exhausted
+        for command in commands:
+            if command.error is None:
+                try:
+                    operation = operations.get(command.operation)
+                    if operation is None:
+                        operation = operations[command.operation] = OperationFactory.create_operation(command.operation)
+                    item = (
+                        operation,
+                        InputValidator.validate_number(command.operand1, config),
+                        InputValidator.validate_number(command.operand2, config)
+                    )
+                except (ValidationError, ValueError) as e:
+                    command.error = str(e)
+            if command.error is not None:
+                in_flight.append((command, None))
+                failed += 1
+                if failed >= window:
+                    # Stop reading; the pool is drained and the buffered commands yielded first
+                    return
+                continue
+            in_flight.append((command, item))
+            yield item
+        exhausted = True
+
+    evaluated = 0
+    while not exhausted:
+        for result, error in backend.execute(prepare()):
+            command, item = in_flight.popleft()
+            while item is None:
+                failed -= 1
+                yield command
+                command, item = in_flight.popleft()
+            command.result, command.error = result, error
+            if error is None:
+                if history == 'full' or (history == 'sampled' and evaluated % sample_every == 0):
+                    operation, a, b = item
+                    calculator.record_calculations([Calculation(str(operation), a, b, result=result)], undoable=False)
+                evaluated += 1
+            yield command
+        # Every submitted command has been yielded; the rest failed before execution
+        while in_flight:
+            yield in_flight.popleft()[0]
+        failed = 0
+
+
+def format_results(results: Iterable[StreamResult], output_format: str = 'plain') -> Iterator[str]:
+    """
+    Render results as output lines.
+
+    - plain: the result, or ``Error: <message>``
+    - csv: a header, then ``line,operation,operand1,operand2,result,error`` rows
+    - jsonl: one JSON object per result
+
+    Args:
+        results (Iterable[StreamResult]): Evaluated commands.
+        output_format (str, optional): 'plain', 'csv' or 'jsonl'.
+
+    Yields:
+        str: Output lines, each ending with a newline.
+    """
+    if output_format == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(['line', 'operation', 'operand1', 'operand2', 'result', 'error'])
+        yield buffer.getvalue()
+    for item in results:
+        result = str(item.result.normalize()) if item.result is not None else ''
+        if output_format == 'plain':
+            yield (result if item.error is None else f"Error: {item.error}") + '\n'
+        elif output_format == 'csv':
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow([item.line, item.operation, item.operand1, item.operand2, result, item.error or ''])
+            yield buffer.getvalue()
+        else:
+            record = {
+                'line': item.line,
+                'operation': item.operation,
+                'operand1': item.operand1,
+                'operand2': item.operand2,
+            }
+            if item.error is None:
+                record['result'] = result
+            else:
+                record['error'] = item.error
+            yield json.dumps(record) + '\n'
+
+
+def run_stream(
+    input_stream: TextIO,
+    output_stream: TextIO,
+    output_format: str = 'plain',
+    flush: bool = False,
+    history: str = 'off',
+    sample_every: int = 100,
+    calculator: Optional[Calculator] = None,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None
+) -> int:
+    """
+    Evaluate a stream of commands and write the results.
+
+    Lines are read, evaluated and written one at a time, so memory use does not
+    grow with the size of the input. Recorded history is saved once at the end
+    when auto-save is enabled. With ``config.profile`` set, the evaluation is
+    profiled and the profile written to the log directory.
+
+    Args:
+        input_stream (TextIO): Source of ``<operation> <a> <b>`` lines.
+        output_stream (TextIO): Destination for formatted results.
+        output_format (str, optional): 'plain', 'csv' or 'jsonl'.
+        flush (bool, optional): Flush the output after every line.
+        history (str, optional): 'off', 'sampled' or 'full'.
+        sample_every (int, optional): Recording interval for 'sampled'.
+        calculator (Optional[Calculator], optional): Calculator to record history in;
+            created on demand when history is not 'off'.
+        workers (Optional[int], optional): Worker processes evaluating the commands;
+            1 evaluates in this process. Defaults to ``config.workers``.
+        chunk_size (Optional[int], optional): Commands sent to a worker at a time.
+            Defaults to ``config.chunk_size``.
+
+    Returns:
+        int: The number of lines that failed.
+
+    Raises:
+        ValueError: If the output format, history mode, sampling interval, worker
+            count or chunk size is invalid.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    if history not in HISTORY_MODES:
+        raise ValueError(f"Unknown history mode: {history}")
+    if sample_every <= 0:
+        raise ValueError("sample_every must be positive")
+
+    if calculator is None and history != 'off':
+        calculator = Calculator()
+    config = calculator.config if calculator is not None else CalculatorConfig()
+    workers = workers if workers is not None else config.workers
+    chunk_size = chunk_size if chunk_size is not None else config.chunk_size
+    if workers <= 0 or chunk_size <= 0:
+        raise ValueError("workers and chunk_size must be positive")
+
+    failures = 0
+
+    def count_failures(results: Iterable[StreamResult]) -> Iterator[StreamResult]:
+        nonlocal failures
+        for item in results:
+            if item.error is not None:
+                failures += 1
+            yield item
+
+    backend = ProcessPoolBackend(workers, chunk_size) if workers > 1 else None
+    if backend is not None:
+        results = evaluate_parallel(parse_lines(input_stream), config, backend, calculator, history, sample_every)
+    else:
+        results = evaluate(parse_lines(input_stream), config, calculator, history, sample_every)
+    try:
+        # With config.profile set, worker processes are not part of the profile
+        with profiled(config.profile, config.log_dir, config.profile_top), \
+                engine_context(config.precision, config.power_mode):
+            for line in format_results(count_failures(results), output_format):
+                output_stream.write(line)
+                if flush:
+                    output_stream.flush()
+        output_stream.flush()
+    finally:
+        if backend is not None:
+            backend.close()
+
+    if calculator is not None and history != 'off' and calculator.config.auto_save:
+        calculator.save_history()
+    logging.info("Stream finished with %s failed lines", failures)
+    return failures
+
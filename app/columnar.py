@@ -0,0 +1,326 @@
+########################
+# Columnar Evaluation   #
+########################
+
+"""
+Evaluate an expression over the columns of a CSV file.
+
+The input is read in chunks of rows; every chunk is evaluated column-wise
+and appended to the output before the next one is read, so memory use
+depends on the chunk size, not on the size of the file. Names in the
+expression refer to columns (case-insensitively): ``a * b + 1`` multiplies
+columns ``a`` and ``b`` of every row. An operation name alone, e.g. ``add``,
+applies the operation to the first two columns.
+
+Two modes:
+
+- ``decimal``: exact Decimal arithmetic, row by row within each chunk, with
+  every cell validated by InputValidator.validate_number;
+- ``float``: the operations' NumPy float64 kernels over whole columns, with
+  cells validated by batch.to_float_array (same rules, same messages).
+
+A row whose cells are invalid, or for which an operation fails, gets an
+empty result and is reported, with its row number and the reason, in a
+separate errors file; the other rows are unaffected.
+"""
+
+import csv
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, TextIO, Tuple, Union
+
+from app.batch import to_float_array
+from app.calculator_config import CalculatorConfig
+from app.decimal_math import engine_context
+from app.exceptions import OperationError, ValidationError
+from app.expression import LOAD, PUSH, ExpressionPlan, compile_expression
+from app.input_validators import InputValidator
+from app.operations import OperationFactory
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+    import pandas as pd
+
+MAP_MODES = ('decimal', 'float')
+
+# A column of Decimal values (None for invalid rows), or a folded constant
+DecimalColumn = Union[List[Optional[Decimal]], Decimal]
+
+
+@dataclass
+class MapReport:
+    """Outcome of mapping an expression over a file."""
+
+    rows: int = 0      # Data rows read
+    failed: int = 0    # Rows reported as invalid
+
+
+def _qualify(expression: str, columns: Sequence[str]) -> str:
+    """Turn an operation name alone into a call on the first two columns."""
+    name = expression.strip().lower()
+    try:
+        OperationFactory.create_operation(name)
+    except ValueError:
+        return expression
+    if len(columns) < 2:
+        raise ValidationError(f"Operation {name} needs two input columns")
+    return f"{name}({columns[0]}, {columns[1]})"
+
+
+def _column_names(plan: ExpressionPlan, columns: Sequence[str]) -> Dict[str, str]:
+    """Map every variable of a plan to the input column it refers to."""
+    by_name = {column.strip().lower(): column for column in columns}
+    names = {}
+    for code, argument in plan.instructions:
+        if code == LOAD:
+            if argument not in by_name:
+                raise ValidationError(f"Unknown column: {argument}")
+            names[argument] = by_name[argument]
+    return names
+
+
+def evaluate_decimal_columns(
+    plan: ExpressionPlan,
+    chunk: 'pd.DataFrame',
+    columns: Dict[str, str],
+    config: CalculatorConfig
+) -> Tuple[List[Optional[Decimal]], Dict[int, str]]:
+    """
+    Evaluate a plan over a chunk with exact Decimal arithmetic.
+
+    Must be called inside engine_context.
+
+    Args:
+        plan (ExpressionPlan): The compiled expression.
+        chunk (pd.DataFrame): The rows, as strings.
+        columns (Dict[str, str]): Input column of every plan variable.
+        config (CalculatorConfig): Configuration used for input validation.
+
+    Returns:
+        Tuple[List[Optional[Decimal]], Dict[int, str]]: The result of every row,
+        None for invalid rows, and the error of every invalid row by position.
+    """
+    size = len(chunk)
+    errors: Dict[int, str] = {}
+    loaded: Dict[str, List[Optional[Decimal]]] = {}
+
+    def load(name: str) -> List[Optional[Decimal]]:
+        values: List[Optional[Decimal]] = []
+        for index, cell in enumerate(chunk[columns[name]].tolist()):
+            try:
+                values.append(InputValidator.validate_number(cell, config))
+            except ValidationError as e:
+                errors.setdefault(index, f"{columns[name]}: {e}")
+                values.append(None)
+        return values
+
+    stack: List[DecimalColumn] = []
+    for code, argument in plan.instructions:
+        if code == PUSH:
+            stack.append(argument)
+        elif code == LOAD:
+            if argument not in loaded:
+                loaded[argument] = load(argument)
+            stack.append(loaded[argument])
+        else:
+            right, left = stack.pop(), stack.pop()
+            results: List[Optional[Decimal]] = [None] * size
+            for index in range(size):
+                if index in errors:
+                    continue
+                a = left[index] if isinstance(left, list) else left
+                b = right[index] if isinstance(right, list) else right
+                try:
+                    results[index] = argument.execute(a, b)
+                except (ValidationError, OperationError) as e:
+                    errors[index] = str(e)
+                except (InvalidOperation, ArithmeticError, ValueError) as e:
+                    errors[index] = f"Operation failed: {e}"
+            stack.append(results)
+
+    value = stack[0]
+    if not isinstance(value, list):
+        value = [None if index in errors else value for index in range(size)]
+    return value, errors
+
+
+def evaluate_float_columns(
+    plan: ExpressionPlan,
+    chunk: 'pd.DataFrame',
+    columns: Dict[str, str],
+    config: CalculatorConfig
+) -> Tuple['np.ndarray', Dict[int, str]]:
+    """
+    Evaluate a plan over a chunk with the operations' NumPy float64 kernels.
+
+    Args:
+        plan (ExpressionPlan): The compiled expression.
+        chunk (pd.DataFrame): The rows, as strings.
+        columns (Dict[str, str]): Input column of every plan variable.
+        config (CalculatorConfig): Configuration used for input validation.
+
+    Returns:
+        Tuple[np.ndarray, Dict[int, str]]: The result of every row, NaN for
+        invalid rows, and the error of every invalid row by position.
+
+    Raises:
+        OperationError: If an operation has no vectorized kernel.
+    """
+    import numpy as np
+
+    size = len(chunk)
+    errors: Dict[int, str] = {}
+    loaded: Dict[str, np.ndarray] = {}
+
+    def report(mask: 'np.ndarray', message: str) -> None:
+        for index in np.flatnonzero(np.broadcast_to(mask, (size,))).tolist():
+            errors.setdefault(index, message)
+
+    stack: List[Union[np.ndarray, float]] = []
+    for code, argument in plan.instructions:
+        if code == PUSH:
+            stack.append(float(argument))
+        elif code == LOAD:
+            if argument not in loaded:
+                array, column_errors = to_float_array(chunk[columns[argument]].to_numpy(), config)
+                for index, message in column_errors.items():
+                    errors.setdefault(index, f"{columns[argument]}: {message}")
+                loaded[argument] = array
+            stack.append(loaded[argument])
+        else:
+            if not argument.supports_vectorized:
+                raise OperationError(f"{argument} has no vectorized kernel; use the decimal mode")
+            right, left = stack.pop(), stack.pop()
+            for mask, message in argument.invalid_operands_vectorized(np.asarray(left), np.asarray(right)):
+                report(mask, message)
+            with np.errstate(all='ignore'):
+                value = argument.execute_vectorized(np.asarray(left), np.asarray(right))
+            report(~np.isfinite(value), "Operation failed: result is not finite")
+            stack.append(value)
+
+    results = np.array(np.broadcast_to(stack[0], (size,)), dtype=np.float64)
+    if errors:
+        results[list(errors)] = np.nan
+    return results, errors
+
+
+def map_csv(
+    expression: str,
+    input_stream: TextIO,
+    output_stream: TextIO,
+    errors_stream: TextIO,
+    config: Optional[CalculatorConfig] = None,
+    mode: str = 'decimal',
+    chunk_rows: int = 100_000,
+    result_column: str = 'result'
+) -> MapReport:
+    """
+    Evaluate an expression for every row of a CSV stream.
+
+    The output has the input columns followed by ``result_column``; the
+    errors stream gets a ``row,error`` line per invalid row, numbered from 1
+    for the first data row.
+
+    Args:
+        expression (str): The expression; names refer to input columns.
+        input_stream (TextIO): CSV input with a header row.
+        output_stream (TextIO): Destination of the CSV output.
+        errors_stream (TextIO): Destination of the invalid-row report.
+        config (Optional[CalculatorConfig], optional): Configuration providing
+            validation and engine settings; loaded from the environment if omitted.
+        mode (str, optional): 'decimal' or 'float'.
+        chunk_rows (int, optional): Rows read and evaluated at a time.
+        result_column (str, optional): Name of the result column.
+
+    Returns:
+        MapReport: The number of rows read and of invalid rows.
+
+    Raises:
+        ValueError: If the mode or chunk size is invalid.
+        ValidationError: If the expression is invalid or refers to an unknown
+            column, or the input already has a column named ``result_column``.
+        OperationError: If float mode is used with an operation without vectorized kernel.
+    """
+    import pandas as pd
+
+    if mode not in MAP_MODES:
+        raise ValueError(f"Unknown map mode: {mode}")
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be positive")
+    config = config or CalculatorConfig()
+
+    report = MapReport()
+    errors_writer = csv.writer(errors_stream, lineterminator='\n')
+    errors_writer.writerow(['row', 'error'])
+    chunks = pd.read_csv(input_stream, dtype=str, keep_default_na=False, chunksize=chunk_rows)
+
+    with engine_context(config.precision, config.power_mode):
+        plan = columns = None
+        for chunk in chunks:
+            if plan is None:
+                def validate(value: Decimal) -> Decimal:
+                    return InputValidator.validate_number(value, config)
+
+                names = list(chunk.columns)
+                if result_column in names:
+                    raise ValidationError(
+                        f"Input already has a column named {result_column}; choose another result column"
+                    )
+                plan = compile_expression(_qualify(expression, names), validate=validate)
+                columns = _column_names(plan, names)
+                header = True
+
+            if mode == 'float':
+                results, errors = evaluate_float_columns(plan, chunk, columns, config)
+            else:
+                decimals, errors = evaluate_decimal_columns(plan, chunk, columns, config)
+                results = ['' if value is None else str(value) for value in decimals]
+
+            chunk[result_column] = results
+            chunk.to_csv(output_stream, header=header, index=False, lineterminator='\n')
+            header = False
+            for index in sorted(errors):
+                errors_writer.writerow([report.rows + index + 1, errors[index]])
+            report.rows += len(chunk)
+            report.failed += len(errors)
+
+    return report
+
+
+def map_file(
+    expression: str,
+    input_path: Path,
+    output_path: Path,
+    errors_path: Optional[Path] = None,
+    config: Optional[CalculatorConfig] = None,
+    mode: str = 'decimal',
+    chunk_rows: int = 100_000,
+    result_column: str = 'result'
+) -> MapReport:
+    """
+    Evaluate an expression for every row of a CSV file; see map_csv.
+
+    Args:
+        expression (str): The expression; names refer to input columns.
+        input_path (Path): The input CSV file.
+        output_path (Path): The output CSV file.
+        errors_path (Optional[Path], optional): The invalid-row report;
+            defaults to the output path with ``.errors.csv`` appended.
+        config (Optional[CalculatorConfig], optional): Configuration providing
+            validation and engine settings.
+        mode (str, optional): 'decimal' or 'float'.
+        chunk_rows (int, optional): Rows read and evaluated at a time.
+        result_column (str, optional): Name of the result column.
+
+    Returns:
+        MapReport: The number of rows read and of invalid rows.
+    """
+    config = config or CalculatorConfig()
+    errors_path = errors_path or Path(f"{output_path}.errors.csv")
+    encoding = config.default_encoding
+    with open(input_path, encoding=encoding, newline='') as input_stream, \
+            open(output_path, 'w', encoding=encoding, newline='') as output_stream, \
+            open(errors_path, 'w', encoding=encoding, newline='') as errors_stream:
+        return map_csv(expression, input_stream, output_stream, errors_stream, config, mode, chunk_rows,
+                       result_column)
@@ -0,0 +1,210 @@
+########################
+# Decimal Math Engine   #
+########################
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+import decimal
+from decimal import Decimal, InvalidOperation, getcontext, localcontext
+from typing import Iterator, Optional
+
+# Engine modes: exact Decimal arithmetic, or the binary float fast path
+POWER_MODES = ('decimal', 'float')
+
+# Extra digits carried by intermediate results before rounding to the target precision
+GUARD_DIGITS = 5
+
+# Largest exact power (in digits) computed to check whether a root is exact
+EXACT_ROOT_CHECK_DIGITS = 1000
+
+# Context for arithmetic that must never round (normalizing keys, running sums)
+EXACT_CONTEXT = decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+
+
+@dataclass(frozen=True)
+class EngineSettings:
+    """Settings of the Power/Root engine for the current context."""
+
+    precision: Optional[int] = None  # Significant digits; None uses the decimal context precision
+    mode: str = 'decimal'            # 'decimal' or 'float'
+
+
+_engine: ContextVar[EngineSettings] = ContextVar('calculator_engine', default=EngineSettings())
+
+
+def current_engine() -> EngineSettings:
+    """Return the engine settings in effect for the current context."""
+    return _engine.get()
+
+
+@contextmanager
+def engine_context(precision: Optional[int] = None, mode: str = 'decimal') -> Iterator[EngineSettings]:
+    """
+    Set the Power/Root engine settings for the duration of a with-block.
+
+    Like decimal.localcontext, the settings are local to the current thread
+    (and asyncio task) and restored on exit.
+
+    Args:
+        precision (Optional[int], optional): Significant digits of the results;
+            None uses the decimal context precision.
+        mode (str, optional): 'decimal' for exact Decimal arithmetic or 'float'
+            for the binary float fast path.
+
+    Yields:
+        EngineSettings: The settings in effect inside the block.
+    """
+    settings = EngineSettings(precision, mode)
+    token = _engine.set(settings)
+    try:
+        yield settings
+    finally:
+        _engine.reset(token)
+
+
+def power(base: Decimal, exponent: Decimal) -> Decimal:
+    """Raise ``base`` to ``exponent`` with the current engine settings."""
+    settings = _engine.get()
+    if settings.mode == 'float':
+        return Decimal(pow(float(base), float(exponent)))
+    return decimal_power(base, exponent, settings.precision or getcontext().prec)
+
+
+def root(x: Decimal, degree: Decimal) -> Decimal:
+    """Return the ``degree``-th root of ``x`` with the current engine settings."""
+    settings = _engine.get()
+    if settings.mode == 'float':
+        return Decimal(pow(float(x), 1 / float(degree)))
+    return decimal_root(x, degree, settings.precision or getcontext().prec)
+
+
+def _is_integral(value: Decimal) -> bool:
+    return value == value.to_integral_value()
+
+
+def _power_by_squaring(base: Decimal, exponent: int) -> Decimal:
+    """Return base ** exponent for a non-negative int, in the current decimal context."""
+    result = Decimal(1)
+    while exponent:
+        if exponent & 1:
+            result *= base
+        exponent >>= 1
+        if exponent:
+            base *= base
+    return result
+
+
+def decimal_power(base: Decimal, exponent: Decimal, precision: int) -> Decimal:
+    """
+    Raise ``base`` to ``exponent``, correct to ``precision`` significant digits.
+
+    Integral exponents use exponentiation by squaring, which is exact whenever
+    the result fits in the working precision. Other exponents are computed as
+    exp(exponent * ln(base)).
+
+    Args:
+        base (Decimal): The base.
+        exponent (Decimal): The exponent; negative integral exponents are allowed.
+        precision (int): Significant digits of the result.
+
+    Returns:
+        Decimal: The result, rounded to ``precision`` digits.
+
+    Raises:
+        decimal.InvalidOperation: If a negative base has a fractional exponent.
+        decimal.Overflow: If the result exceeds the decimal context range.
+    """
+    with localcontext() as context:
+        if _is_integral(exponent):
+            n = int(exponent)
+            context.prec = precision + len(str(abs(n))) + GUARD_DIGITS
+            result = _power_by_squaring(base, abs(n))
+            if n < 0:
+                result = 1 / result
+        elif base == 0:
+            result = Decimal(0)
+        else:
+            # ln() raises InvalidOperation for negative bases. The absolute error of
+            # the logarithm becomes the relative error of exp(), so carry one more
+            # digit per digit of its integer part.
+            context.prec = 10
+            magnitude = (base.ln() * exponent).adjusted()
+            context.prec = precision + max(magnitude, 0) + GUARD_DIGITS
+            result = (base.ln() * exponent).exp()
+        context.prec = precision
+        return +result
+
+
+def decimal_root(x: Decimal, degree: Decimal, precision: int) -> Decimal:
+    """
+    Return the ``degree``-th root of ``x``, correct to ``precision`` significant digits.
+
+    Integral degrees use Newton iteration on y**n - x, starting from a float
+    estimate; convergence is quadratic, so each step roughly doubles
+    the correct digits. Exact roots (e.g. the cube root of 27) are returned
+    without trailing zeros. Other degrees are computed as x ** (1 / degree).
+
+    Args:
+        x (Decimal): The radicand; must be non-negative.
+        degree (Decimal): The degree of the root; must not be zero.
+        precision (int): Significant digits of the result.
+
+    Returns:
+        Decimal: The root, rounded to ``precision`` digits.
+
+    Raises:
+        decimal.InvalidOperation: If x is negative or degree is zero.
+        decimal.DivisionByZero: If x is zero and degree is negative.
+    """
+    if not _is_integral(degree):
+        with localcontext() as context:
+            context.prec = precision + GUARD_DIGITS
+            reciprocal = 1 / degree
+        return decimal_power(x, reciprocal, precision)
+
+    n = int(degree)
+    if n < 0:
+        with localcontext() as context:
+            context.prec = precision + GUARD_DIGITS
+            result = 1 / decimal_root(x, Decimal(-n), precision + GUARD_DIGITS)
+            context.prec = precision
+            return +result
+
+    with localcontext() as context:
+        if n == 0:
+            raise InvalidOperation("Zero root is undefined")
+        if x < 0:
+            raise InvalidOperation("Cannot calculate root of negative number")
+        if x == 0 or n == 1:
+            context.prec = precision
+            return +x
+
+        # Initial estimate from binary floats (or logarithms outside the float
+        # range), then Newton steps at working precision
+        estimate = float(x)
+        if 0 < estimate < float('inf'):
+            y = Decimal(estimate ** (1 / n))
+        else:
+            context.prec = 20
+            y = (x.ln() / n).exp()
+        context.prec = precision + GUARD_DIGITS
+        tolerance = Decimal(1).scaleb(-(precision + 2))
+        for _ in range(100):
+            next_y = ((n - 1) * y + x / _power_by_squaring(y, n - 1)) / n
+            converged = abs(next_y - y) <= tolerance * next_y
+            y = next_y
+            if converged:
+                break
+
+        context.prec = precision
+        y = +y
+
+        # Return exact roots in their shortest form
+        candidate = y.normalize()
+        digits = len(candidate.as_tuple().digits)
+        if digits * n <= EXACT_ROOT_CHECK_DIGITS:
+            context.prec = digits * n + 1
+            if _power_by_squaring(candidate, n) == x:
+                return candidate
+        return y
@@ -0,0 +1,440 @@
+########################
+# Expression Engine     #
+########################
+
+"""
+Infix expressions evaluated with the calculator's operations.
+
+An expression such as ``(3 + 4) * 2 ^ 10 / root(81, 4)`` is tokenized, parsed
+into an AST by a Pratt parser, optionally constant-folded, and compiled into a
+flat postfix plan that a small stack machine evaluates. Every binary step runs
+through the shared Operation instance from OperationFactory, so results match
+perform_operation exactly.
+
+Grammar:
+
+- numbers: ``12``, ``0.5``, ``.5``, ``1e-3``;
+- operators, loosest first: ``+ -``, ``* /``, unary ``-``/``+``, ``^``
+  (right-associative, so ``2 ^ 3 ^ 2`` is ``2 ^ 9`` and ``-2 ^ 2`` is ``-4``);
+- function calls ``name(a, b)`` for every operation registered with
+  OperationFactory, e.g. ``root(81, 4)`` or ``divide(1, 3)``;
+- variables: other names, e.g. ``ans``, supplied at evaluation.
+
+Negating a number is part of the literal; negating anything else is
+compiled as ``subtract(0, x)``.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from decimal import Decimal
+import re
+from typing import Callable, Dict, Hashable, List, Mapping, Optional, Tuple, Union
+
+from app.exceptions import ValidationError
+from app.operations import Operation, OperationFactory
+
+_TOKEN = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)|([A-Za-z_]\w*)|(\S))")
+
+# Binary operator: (left binding power, factory operation id, right-associative)
+_INFIX: Dict[str, Tuple[int, str, bool]] = {
+    '+': (10, 'add', False),
+    '-': (10, 'subtract', False),
+    '*': (20, 'multiply', False),
+    '/': (20, 'divide', False),
+    '^': (30, 'power', True),
+}
+
+# Binding power of the operand of unary minus/plus: tighter than * and /, looser than ^
+_PREFIX_POWER = 25
+
+
+# ---------------------------
+# AST
+# ---------------------------
+
+@dataclass(frozen=True)
+class Number:
+    """A numeric literal, or the folded value of a constant subexpression."""
+    value: Decimal
+
+
+@dataclass(frozen=True)
+class Variable:
+    """A name whose value is supplied at evaluation."""
+    name: str
+
+
+@dataclass(frozen=True)
+class Apply:
+    """A binary operation, by factory operation id (e.g. 'add')."""
+    operation: str
+    left: 'Node'
+    right: 'Node'
+
+
+Node = Union[Number, Variable, Apply]
+
+
+# ---------------------------
+# Parsing
+# ---------------------------
+
+def tokenize(text: str) -> List[Tuple[str, str, int]]:
+    """
+    Split an expression into tokens.
+
+    Args:
+        text (str): The expression.
+
+    Returns:
+        List[Tuple[str, str, int]]: (kind, text, position) triples, where kind
+        is 'number', 'name' or 'symbol'; names are lowercased.
+
+    Raises:
+        ValidationError: If the expression contains an unexpected character.
+    """
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        number, name, symbol = match.groups()
+        start = match.start(match.lastindex)
+        if number is not None:
+            tokens.append(('number', number, start))
+        elif name is not None:
+            tokens.append(('name', name.lower(), start))
+        elif symbol in _INFIX or symbol in '(),':
+            tokens.append(('symbol', symbol, start))
+        else:
+            raise ValidationError(f"Invalid expression: unexpected '{symbol}' at position {start + 1}")
+        position = match.end()
+    return tokens
+
+
+def normalize(tokens: List[Tuple[str, str, int]]) -> str:
+    """Return the canonical text of a token list: no whitespace, lowercase names."""
+    return "".join(text for _, text, _ in tokens)
+
+
+class _Parser:
+    """Pratt parser over a token list."""
+
+    def __init__(self, tokens: List[Tuple[str, str, int]], text_length: int):
+        self.tokens = tokens
+        self.index = 0
+        self.end = text_length
+
+    def peek(self) -> Optional[Tuple[str, str, int]]:
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def error(self, message: str) -> ValidationError:
+        token = self.peek()
+        position = token[2] + 1 if token is not None else self.end + 1
+        return ValidationError(f"Invalid expression: {message} at position {position}")
+
+    def expect(self, symbol: str) -> None:
+        token = self.peek()
+        if token is None or token[:2] != ('symbol', symbol):
+            raise self.error(f"expected '{symbol}'")
+        self.index += 1
+
+    def parse(self) -> Node:
+        if not self.tokens:
+            raise ValidationError("Invalid expression: empty expression")
+        node = self.expression(0)
+        if self.peek() is not None:
+            raise self.error(f"unexpected '{self.peek()[1]}'")
+        return node
+
+    def expression(self, min_power: int) -> Node:
+        left = self.prefix()
+        while True:
+            token = self.peek()
+            if token is None or token[0] != 'symbol' or token[1] not in _INFIX:
+                return left
+            power, operation, right_associative = _INFIX[token[1]]
+            if power <= min_power:
+                return left
+            self.index += 1
+            right = self.expression(power - 1 if right_associative else power)
+            left = Apply(operation, left, right)
+
+    def prefix(self) -> Node:
+        token = self.peek()
+        if token is None:
+            raise self.error("unexpected end of expression")
+        kind, text, _ = token
+        self.index += 1
+        if kind == 'number':
+            return Number(Decimal(text))
+        if kind == 'name':
+            following = self.peek()
+            if following is None or following[:2] != ('symbol', '('):
+                return Variable(text)
+            self.index += 1
+            left = self.expression(0)
+            self.expect(',')
+            right = self.expression(0)
+            self.expect(')')
+            return Apply(text, left, right)
+        if text == '(':
+            node = self.expression(0)
+            self.expect(')')
+            return node
+        if text in '+-':
+            operand = self.expression(_PREFIX_POWER)
+            if text == '+':
+                return operand
+            if isinstance(operand, Number):
+                return Number(-operand.value)
+            return Apply('subtract', Number(Decimal(0)), operand)
+        self.index -= 1
+        raise self.error(f"unexpected '{text}'")
+
+
+def parse(text: str) -> Node:
+    """
+    Parse an expression into an AST.
+
+    Args:
+        text (str): The expression.
+
+    Returns:
+        Node: The root of the AST.
+
+    Raises:
+        ValidationError: If the expression is malformed.
+    """
+    return _Parser(tokenize(text), len(text.rstrip())).parse()
+
+
+# ---------------------------
+# Folding and compilation
+# ---------------------------
+
+def _operation(name: str) -> Operation:
+    """Return the shared operation instance for a factory id."""
+    try:
+        return OperationFactory.create_operation(name)
+    except ValueError:
+        raise ValidationError(f"Unknown function: {name}")
+
+
+def fold(node: Node, keep_root: bool = False) -> Node:
+    """
+    Replace every operation on constant operands by its result.
+
+    Operations are executed in the current decimal and engine context, so a
+    folded AST is only valid for the settings it was folded with.
+
+    Args:
+        node (Node): The AST to fold.
+        keep_root (bool, optional): Fold the operands of the root operation but
+            not the root itself, so that evaluating the result still performs
+            (and can record) the final operation.
+
+    Returns:
+        Node: The folded AST.
+
+    Raises:
+        ValidationError: If a constant operation is invalid (e.g. division by zero).
+    """
+    if not isinstance(node, Apply):
+        return node
+    left, right = fold(node.left), fold(node.right)
+    if not keep_root and isinstance(left, Number) and isinstance(right, Number):
+        return Number(_operation(node.operation).execute(left.value, right.value))
+    return Apply(node.operation, left, right)
+
+
+# Plan instructions: push a constant, load a variable, apply an operation to the top two values
+PUSH, LOAD, APPLY = 0, 1, 2
+
+Instruction = Tuple[int, Union[Decimal, str, Operation]]
+
+# Called with the operation, its operands and its result after every evaluated step
+StepCallback = Callable[[Operation, Decimal, Decimal, Decimal], None]
+
+
+class ExpressionPlan:
+    """
+    A compiled expression: postfix instructions for a stack machine.
+
+    Operations are resolved to their shared OperationFactory instances at
+    compile time, so evaluation does no lookups or tree walking.
+    """
+
+    __slots__ = ('text', 'instructions', 'literals')
+
+    def __init__(self, text: str, instructions: List[Instruction], literals: List[Decimal]):
+        self.text = text
+        self.instructions = tuple(instructions)
+        # Numbers written in the expression, before folding
+        self.literals = tuple(literals)
+
+    def evaluate(
+        self,
+        variables: Optional[Mapping[str, Decimal]] = None,
+        on_step: Optional[StepCallback] = None
+    ) -> Decimal:
+        """
+        Evaluate the plan in the current decimal and engine context.
+
+        Args:
+            variables (Optional[Mapping[str, Decimal]], optional): Variable values.
+            on_step (Optional[StepCallback], optional): Called after every
+                operation, innermost first; the last call is the root operation.
+
+        Returns:
+            Decimal: The value of the expression.
+
+        Raises:
+            ValidationError: If a variable is undefined or an operation rejects its operands.
+        """
+        stack: List[Decimal] = []
+        for code, argument in self.instructions:
+            if code == PUSH:
+                stack.append(argument)
+            elif code == LOAD:
+                if variables is None or argument not in variables:
+                    raise ValidationError(f"Unknown variable: {argument}")
+                stack.append(variables[argument])
+            else:
+                b = stack.pop()
+                a = stack.pop()
+                result = argument.execute(a, b)
+                if on_step is not None:
+                    on_step(argument, a, b, result)
+                stack.append(result)
+        return stack[0]
+
+
+def compile_expression(
+    text: str,
+    fold_constants: bool = True,
+    keep_root: bool = False,
+    validate: Optional[Callable[[Decimal], Decimal]] = None
+) -> ExpressionPlan:
+    """
+    Parse, fold and compile an expression.
+
+    Args:
+        text (str): The expression.
+        fold_constants (bool, optional): Fold constant subexpressions.
+        keep_root (bool, optional): When folding, keep the root operation (see fold).
+        validate (Optional[Callable[[Decimal], Decimal]], optional): Called with
+            every number written in the expression, e.g. to enforce the maximum
+            input value; returns the value to use.
+
+    Returns:
+        ExpressionPlan: The compiled plan.
+
+    Raises:
+        ValidationError: If the expression is malformed, uses an unknown
+            function, or a folded operation is invalid.
+    """
+    tokens = tokenize(text)
+    root = _Parser(tokens, len(text.rstrip())).parse()
+    literals: List[Decimal] = []
+
+    def check(node: Node) -> Node:
+        # Validate literals and resolve function names before folding executes anything
+        if isinstance(node, Number):
+            value = validate(node.value) if validate is not None else node.value
+            literals.append(value)
+            return Number(value)
+        if isinstance(node, Apply):
+            _operation(node.operation)
+            return Apply(node.operation, check(node.left), check(node.right))
+        return node
+
+    root = check(root)
+    if fold_constants:
+        root = fold(root, keep_root)
+
+    instructions: List[Instruction] = []
+
+    def emit(node: Node) -> None:
+        if isinstance(node, Number):
+            instructions.append((PUSH, node.value))
+        elif isinstance(node, Variable):
+            instructions.append((LOAD, node.name))
+        else:
+            emit(node.left)
+            emit(node.right)
+            instructions.append((APPLY, _operation(node.operation)))
+
+    emit(root)
+    return ExpressionPlan(normalize(tokens), instructions, literals)
+
+
+class PlanCache:
+    """
+    Bounded LRU cache of compiled expression plans.
+
+    Keys are the expression's tokens, as (kind, text) pairs, with whatever
+    else the plan depends on (folding mode and engine settings), so
+    ``2*(3+4)`` and ``2 * (3 + 4)`` share one entry while ``12`` and ``1 2``
+    do not. Hits, misses and evictions are counted.
+    """
+
+    def __init__(self, max_size: int):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_size (int): Maximum number of plans; 0 disables caching.
+        """
+        self.max_size = max_size
+        self._entries: 'OrderedDict[Hashable, ExpressionPlan]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compile(self, text: str, key: Hashable, compile_plan: Callable[[], ExpressionPlan]) -> ExpressionPlan:
+        """
+        Return the cached plan for an expression, compiling it on a miss.
+
+        Args:
+            text (str): The expression; tokenized to build the key.
+            key (Hashable): Settings the plan depends on, added to the key.
+            compile_plan (Callable[[], ExpressionPlan]): Compiles the plan on a miss.
+
+        Returns:
+            ExpressionPlan: The plan.
+
+        Raises:
+            ValidationError: If the expression is invalid.
+        """
+        cache_key = (tuple((kind, token) for kind, token, _ in tokenize(text)), key)
+        plan = self._entries.get(cache_key)
+        if plan is not None:
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return plan
+        self.misses += 1
+        plan = compile_plan()
+        if self.max_size > 0:
+            self._entries[cache_key] = plan
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return plan
+
+    def clear(self) -> None:
+        """Remove every plan. The counters are kept."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit, miss and eviction counters with the current size."""
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -4,8 +4,10 @@
 
 from abc import ABC, abstractmethod
 import logging
-from typing import Any
+from typing import Any, List, Optional
+from app.autosave import BackgroundSaver
 from app.calculation import Calculation
+from app.logging_setup import LogSampler
 
 
 class HistoryObserver(ABC):
@@ -27,15 +29,39 @@ class HistoryObserver(ABC):
         """
         pass  # pragma: no cover
 
+    def update_batch(self, calculations: List[Calculation]) -> None:
+        """
+        Handle a batch of new calculations recorded together.
+
+        Called once per batch by Calculator.perform_batch. The default
+        implementation forwards each calculation to update; observers with a
+        cheaper bulk path override it.
+
+        Args:
+            calculations (List[Calculation]): The calculations that were performed, oldest first.
+        """
+        for calculation in calculations:
+            self.update(calculation)
+
 
 class LoggingObserver(HistoryObserver):
     """
     Observer that logs calculations to a file.
 
     Implements the Observer pattern by listening for new calculations and logging
-    their details to a log file.
+    their details to a log file. With a sample rate below 1 only that share of
+    calculations is logged, keeping the log small under heavy batch use.
     """
 
+    def __init__(self, sample_rate: float = 1.0):
+        """
+        Initialize the observer.
+
+        Args:
+            sample_rate (float, optional): Share of calculations to log, between 0 and 1.
+        """
+        self.sampler = LogSampler(sample_rate)
+
     def update(self, calculation: Calculation) -> None:
         """
         Log calculation details.
@@ -48,11 +74,12 @@ class LoggingObserver(HistoryObserver):
         """
         if calculation is None:
             raise AttributeError("Calculation cannot be None")
-        logging.info(
-            f"Calculation performed: {calculation.operation} "
-            f"({calculation.operand1}, {calculation.operand2}) = "
-            f"{calculation.result}"
-        )
+        if self.sampler.sample():
+            # Formatted by the log listener thread, not here
+            logging.info(
+                "Calculation performed: %s (%s, %s) = %s",
+                calculation.operation, calculation.operand1, calculation.operand2, calculation.result
+            )
 
 
 class AutoSaveObserver(HistoryObserver):
@@ -61,7 +88,11 @@ class AutoSaveObserver(HistoryObserver):
 
     Implements the Observer pattern by listening for new calculations and
     triggering an automatic save of the calculation history if the auto-save
-    feature is enabled in the configuration.
+    feature is enabled in the configuration. In 'journal' mode only the new
+    calculation is appended to the history journal instead of rewriting the
+    whole history file; with the 'sqlite' history format new calculations are
+    always inserted as rows. With auto_save_background enabled, saves run on a
+    BackgroundSaver worker thread that coalesces bursts of calculations.
     """
 
     def __init__(self, calculator: Any):
@@ -79,12 +110,24 @@ class AutoSaveObserver(HistoryObserver):
             raise TypeError("Calculator must have 'config' and 'save_history' attributes")
         self.calculator = calculator
 
+        # Optional background writer, configured next to auto_save
+        self.writer: Optional[BackgroundSaver] = None
+        config = calculator.config
+        if getattr(config, 'auto_save_background', False) is True:
+            self.writer = BackgroundSaver(
+                self._save,
+                every_n=config.auto_save_every_n,
+                interval_ms=config.auto_save_interval_ms,
+                idle_ms=config.auto_save_idle_ms
+            )
+
     def update(self, calculation: Calculation) -> None:
         """
         Trigger auto-save.
 
         This method is called whenever a new calculation is performed. If the
-        auto-save feature is enabled, it saves the current calculation history.
+        auto-save feature is enabled, it saves the current calculation history,
+        or appends the calculation to the journal when auto_save_mode is 'journal'.
 
         Args:
             calculation (Calculation): The calculation that was performed.
@@ -92,5 +135,66 @@ class AutoSaveObserver(HistoryObserver):
         if calculation is None:
             raise AttributeError("Calculation cannot be None")
         if self.calculator.config.auto_save:
+            if self.writer is not None:
+                self.writer.submit(calculation)
+                return
+            self._save([calculation])
+
+    def update_batch(self, calculations: List[Calculation]) -> None:
+        """
+        Trigger a single auto-save for a batch of calculations.
+
+        Args:
+            calculations (List[Calculation]): The calculations that were performed, oldest first.
+        """
+        if not calculations or not self.calculator.config.auto_save:
+            return
+        if self.writer is not None:
+            for calculation in calculations:
+                self.writer.submit(calculation)
+            return
+        self._save(calculations)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every calculation seen so far has been saved.
+
+        Args:
+            timeout (Optional[float], optional): Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if all pending saves completed successfully.
+        """
+        if self.writer is None:
+            return True
+        return self.writer.flush(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Flush pending saves and stop the background writer, if any.
+
+        Args:
+            timeout (Optional[float], optional): Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if all pending saves completed successfully.
+        """
+        if self.writer is None:
+            return True
+        return self.writer.close(timeout)
+
+    def _save(self, calculations: List[Calculation]) -> None:
+        """
+        Persist new calculations according to the auto-save mode.
+
+        Args:
+            calculations (List[Calculation]): Calculations performed since the last save.
+        """
+        config = self.calculator.config
+        # SQLite inserts only the new rows; the journal mode appends them to a side file
+        if getattr(config, 'history_format', 'csv') == 'sqlite' or \
+                getattr(config, 'auto_save_mode', 'snapshot') == 'journal':
+            self.calculator.append_history_journal(calculations)
+        else:
             self.calculator.save_history()
-            logging.info("History auto-saved")
\ No newline at end of file
+        logging.info("History auto-saved")
\ No newline at end of file
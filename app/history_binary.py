@@ -0,0 +1,277 @@
+########################
+# Binary History Format #
+########################
+
+"""
+Fixed-width binary history file, read through mmap.
+
+Layout (little-endian):
+
+- Header: magic ``CALCHIST``, format version, record size, number of
+  operations, number of records, offset of the first record, offset of the heap.
+- Operation table: one length-prefixed UTF-8 name per operation; records refer
+  to operations by their index in this table.
+- Records, 64 bytes each: operation index, flags, UTC offset in minutes,
+  timestamp as int64 nanoseconds since 1970-01-01 (wall-clock time, as in
+  Calculation), then operand1, operand2 and result as 16-byte number slots.
+- Heap: decimal strings of numbers that do not fit a slot.
+
+A number slot holds a decimal inline as sign, int32 exponent and uint64
+coefficient (up to 19 digits). Longer numbers are stored in the heap and the
+slot holds their offset and length. Record i lives at a fixed offset, so any
+entry is decoded in O(1) without reading the rest of the file.
+
+Convert between formats with::
+
+    python -m app.history_binary to-binary calculator_history.csv calculator_history.bin
+    python -m app.history_binary to-csv calculator_history.bin calculator_history.csv
+"""
+
+import argparse
+import datetime
+from decimal import Decimal
+import mmap
+import os
+from pathlib import Path
+import struct
+import sys
+from typing import Iterable, Iterator, List, Optional, Sequence, Union, overload
+
+from app.calculation import Calculation
+from app.exceptions import OperationError
+
+MAGIC = b'CALCHIST'
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<8sHHIQQQ')
+_NAME_LENGTH = struct.Struct('<H')
+_SLOT = 'BBxxiQ'                # kind, sign, exponent (or heap length), coefficient (or heap offset)
+_RECORD = struct.Struct('<HHhxxq' + _SLOT * 3)
+
+_SLOT_INLINE = 0
+_SLOT_HEAP = 1
+_FLAG_TZ = 1                    # The timestamp carries a UTC offset
+
+_MAX_COEFFICIENT = 2 ** 64 - 1
+_MIN_EXPONENT, _MAX_EXPONENT = -2 ** 31, 2 ** 31 - 1
+
+
+def _encode_number(value: Decimal, heap: bytearray) -> tuple:
+    """Return the slot fields for a number, appending it to the heap if it does not fit."""
+    text = str(value)
+    # Splitting the string form is several times faster than Decimal.as_tuple()
+    sign = text[0] == '-'
+    mantissa, _, exponent_text = text[sign:].partition('E')
+    whole, _, fraction = mantissa.partition('.')
+    if whole.isdigit():
+        coefficient = int(whole + fraction)
+        exponent = (int(exponent_text) if exponent_text else 0) - len(fraction)
+        if coefficient <= _MAX_COEFFICIENT and _MIN_EXPONENT <= exponent <= _MAX_EXPONENT:
+            return (_SLOT_INLINE, sign, exponent, coefficient)
+    text = text.encode('ascii')
+    offset = len(heap)
+    heap += text
+    return (_SLOT_HEAP, 0, len(text), offset)
+
+
+def write_binary_history(path: Path, calculations: Iterable[Calculation]) -> int:
+    """
+    Write calculations to a binary history file.
+
+    The file is written to a temporary name and then replaced atomically, so
+    readers never see a partially written file.
+
+    Args:
+        path (Path): Destination file.
+        calculations (Iterable[Calculation]): Calculations to write, oldest first.
+
+    Returns:
+        int: The number of calculations written.
+    """
+    op_indexes = {}
+    records = bytearray()
+    heap = bytearray()
+    count = 0
+    for calc in calculations:
+        op_index = op_indexes.setdefault(calc.operation, len(op_indexes))
+        flags, offset_minutes = 0, 0
+        if calc.tzinfo is not None:
+            offset = calc.timestamp.utcoffset()
+            if offset is not None:
+                flags, offset_minutes = _FLAG_TZ, int(offset.total_seconds() // 60)
+        records += _RECORD.pack(
+            op_index, flags, offset_minutes, calc.timestamp_ns,
+            *_encode_number(calc.operand1, heap),
+            *_encode_number(calc.operand2, heap),
+            *_encode_number(calc.result, heap)
+        )
+        count += 1
+
+    table = bytearray()
+    for name in op_indexes:
+        encoded = name.encode('utf-8')
+        table += _NAME_LENGTH.pack(len(encoded)) + encoded
+    # Align records to 8 bytes
+    data_offset = -(-(_HEADER.size + len(table)) // 8) * 8
+    heap_offset = data_offset + len(records)
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, _RECORD.size, len(op_indexes), count, data_offset, heap_offset
+    )
+
+    temp_path = path.with_name(path.name + '.tmp')
+    with open(temp_path, 'wb') as file:
+        file.write(header)
+        file.write(table)
+        file.write(b'\0' * (data_offset - _HEADER.size - len(table)))
+        file.write(records)
+        file.write(heap)
+    os.replace(temp_path, path)
+    return count
+
+
+class BinaryHistory(Sequence[Calculation]):
+    """
+    Read-only random-access view of a binary history file.
+
+    Opening the file maps it into memory and reads only the header and the
+    operation table, so it is instant regardless of the number of entries.
+    Entries are decoded on access; ``history[i]`` costs O(1).
+    """
+
+    def __init__(self, path: Path):
+        """
+        Open and map a binary history file.
+
+        Args:
+            path (Path): The file written by write_binary_history.
+
+        Raises:
+            OperationError: If the file is not a valid binary history file.
+        """
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self._map) < _HEADER.size:
+                raise ValueError("file is too short")
+            magic, version, record_size, op_count, self._count, self._data_offset, self._heap_offset = \
+                _HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError("not a binary history file")
+            if version != FORMAT_VERSION or record_size != _RECORD.size:
+                raise ValueError(f"unsupported format version {version}")
+            if self._heap_offset != self._data_offset + self._count * record_size or \
+                    self._heap_offset > len(self._map):
+                raise ValueError("file is truncated")
+
+            self._operations: List[str] = []
+            position = _HEADER.size
+            for _ in range(op_count):
+                (length,) = _NAME_LENGTH.unpack_from(self._map, position)
+                position += _NAME_LENGTH.size
+                self._operations.append(self._map[position:position + length].decode('utf-8'))
+                position += length
+        except (ValueError, struct.error, UnicodeDecodeError) as e:
+            self.close()
+            raise OperationError(f"Invalid binary history file {self.path}: {e}")
+
+    def __len__(self) -> int:
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> Calculation: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Calculation]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Calculation, List[Calculation]]:
+        if isinstance(index, slice):
+            return [self._decode(i) for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("history index out of range")
+        return self._decode(index)
+
+    def __iter__(self) -> Iterator[Calculation]:
+        for i in range(self._count):
+            yield self._decode(i)
+
+    def _decode(self, index: int) -> Calculation:
+        fields = _RECORD.unpack_from(self._map, self._data_offset + index * _RECORD.size)
+        op_index, flags, offset_minutes, timestamp_ns = fields[:4]
+        tzinfo = (
+            datetime.timezone(datetime.timedelta(minutes=offset_minutes)) if flags & _FLAG_TZ else None
+        )
+        return Calculation.from_parts(
+            self._operations[op_index],
+            self._decode_number(fields[4:8]),
+            self._decode_number(fields[8:12]),
+            self._decode_number(fields[12:16]),
+            timestamp_ns,
+            tzinfo
+        )
+
+    def _decode_number(self, slot: tuple) -> Decimal:
+        kind, sign, exponent, coefficient = slot
+        if kind == _SLOT_INLINE:
+            return Decimal(f"{'-' if sign else ''}{coefficient}E{exponent}")
+        start = self._heap_offset + coefficient
+        return Decimal(self._map[start:start + exponent].decode('ascii'))
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self) -> 'BinaryHistory':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def csv_to_binary(csv_path: Path, binary_path: Path) -> int:
+    """Convert a CSV history file to the binary format; return the number of entries."""
+    from app.history_csv import read_history_csv
+
+    return write_binary_history(Path(binary_path), read_history_csv(Path(csv_path)))
+
+
+def binary_to_csv(binary_path: Path, csv_path: Path) -> int:
+    """Convert a binary history file to the CSV format; return the number of entries."""
+    from app.history_csv import write_history_csv
+
+    with BinaryHistory(Path(binary_path)) as history:
+        return write_history_csv(Path(csv_path), history)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line converter between the CSV and binary history formats."""
+    parser = argparse.ArgumentParser(
+        prog="python -m app.history_binary",
+        description="Convert calculator history files between CSV and binary formats."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for command, help_text in (("to-binary", "convert CSV to binary"), ("to-csv", "convert binary to CSV")):
+        subparser = subparsers.add_parser(command, help=help_text)
+        subparser.add_argument("source", type=Path)
+        subparser.add_argument("destination", type=Path)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "to-binary":
+            count = csv_to_binary(args.source, args.destination)
+        else:
+            count = binary_to_csv(args.source, args.destination)
+    except (OSError, OperationError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Converted {count} calculations to {args.destination}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+########################
+# History Buffer        #
+########################
+
+from collections.abc import Sequence
+from typing import Any, Iterable, Iterator, List, Optional, Union
+
+from app.calculation import Calculation
+
+
+class HistoryBuffer(Sequence):
+    """
+    Bounded ring buffer holding the calculation history.
+
+    Calculations are stored in a preallocated list of ``capacity`` slots with a
+    moving head, so appending at the end and evicting from the front are both
+    O(1) instead of shifting the whole history. The buffer behaves like a
+    read-only list of calculations, oldest first: it supports ``len``, integer
+    indexing, slicing, iteration and comparison with other sequences.
+    """
+
+    def __init__(self, capacity: int, entries: Optional[Iterable[Calculation]] = None):
+        """
+        Initialize the buffer.
+
+        Args:
+            capacity (int): Maximum number of calculations kept in the buffer.
+            entries (Optional[Iterable[Calculation]], optional): Initial calculations,
+                oldest first. Only the newest ``capacity`` entries are kept.
+
+        Raises:
+            ValueError: If capacity is not positive.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._capacity = capacity
+        self._slots: List[Optional[Calculation]] = [None] * capacity
+        self._head = 0
+        self._size = 0
+        if entries is not None:
+            self.extend(entries)
+
+    @property
+    def capacity(self) -> int:
+        """Return the maximum number of calculations kept in the buffer."""
+        return self._capacity
+
+    def append(self, calculation: Calculation) -> Optional[Calculation]:
+        """
+        Append a calculation at the end of the buffer.
+
+        If the buffer is full, the oldest calculation is evicted to make room.
+
+        Args:
+            calculation (Calculation): The calculation to append.
+
+        Returns:
+            Optional[Calculation]: The evicted calculation, or None if nothing was evicted.
+        """
+        evicted = None
+        if self._size == self._capacity:
+            evicted = self.popleft()
+        self._slots[(self._head + self._size) % self._capacity] = calculation
+        self._size += 1
+        return evicted
+
+    def appendleft(self, calculation: Calculation) -> None:
+        """
+        Insert a calculation at the front of the buffer.
+
+        Used to restore an evicted calculation when undoing a change.
+
+        Args:
+            calculation (Calculation): The calculation to insert.
+
+        Raises:
+            IndexError: If the buffer is full.
+        """
+        if self._size == self._capacity:
+            raise IndexError("appendleft to a full history buffer")
+        self._head = (self._head - 1) % self._capacity
+        self._slots[self._head] = calculation
+        self._size += 1
+
+    def pop(self) -> Calculation:
+        """
+        Remove and return the newest calculation.
+
+        Raises:
+            IndexError: If the buffer is empty.
+        """
+        if not self._size:
+            raise IndexError("pop from an empty history buffer")
+        self._size -= 1
+        index = (self._head + self._size) % self._capacity
+        calculation = self._slots[index]
+        self._slots[index] = None
+        return calculation
+
+    def popleft(self) -> Calculation:
+        """
+        Remove and return the oldest calculation.
+
+        Raises:
+            IndexError: If the buffer is empty.
+        """
+        if not self._size:
+            raise IndexError("popleft from an empty history buffer")
+        calculation = self._slots[self._head]
+        self._slots[self._head] = None
+        self._head = (self._head + 1) % self._capacity
+        self._size -= 1
+        return calculation
+
+    def extend(self, calculations: Iterable[Calculation]) -> None:
+        """
+        Append several calculations, evicting the oldest ones as needed.
+
+        Args:
+            calculations (Iterable[Calculation]): Calculations to append, oldest first.
+        """
+        for calculation in calculations:
+            self.append(calculation)
+
+    def clear(self) -> None:
+        """Remove all calculations from the buffer."""
+        self._slots = [None] * self._capacity
+        self._head = 0
+        self._size = 0
+
+    def copy(self) -> List[Calculation]:
+        """
+        Return the calculations as a new list, oldest first.
+
+        Returns:
+            List[Calculation]: A shallow copy of the buffer contents.
+        """
+        return list(self)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Calculation, List[Calculation]]:
+        """
+        Return the calculation at a position, or a list for a slice.
+
+        Positions count from the oldest calculation; negative indexes count from
+        the newest, as with a list.
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("history index out of range")
+        return self._slots[(self._head + index) % self._capacity]
+
+    def __iter__(self) -> Iterator[Calculation]:
+        slots, head, capacity = self._slots, self._head, self._capacity
+        end = head + self._size
+        if end <= capacity:
+            yield from slots[head:end]
+        else:
+            yield from slots[head:]
+            yield from slots[:end - capacity]
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"HistoryBuffer(capacity={self._capacity}, entries={self.copy()!r})"
@@ -0,0 +1,97 @@
+########################
+# CSV History Format    #
+########################
+
+import datetime
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from app.calculation import Calculation, datetime_to_ns
+from app.exceptions import OperationError
+
+# Column order of the CSV history file
+HISTORY_COLUMNS = ['operation', 'operand1', 'operand2', 'result', 'timestamp']
+
+
+def write_history_csv(path: Path, calculations: Iterable[Calculation]) -> int:
+    """
+    Write calculations to a CSV history file using pandas.
+
+    Args:
+        path (Path): Destination file; replaced if it exists.
+        calculations (Iterable[Calculation]): Calculations to write, oldest first.
+
+    Returns:
+        int: The number of calculations written.
+    """
+    # pandas is imported on first use to keep it out of startup
+    import pandas as pd
+
+    history_data = [
+        {
+            'operation': str(calc.operation),
+            'operand1': str(calc.operand1),
+            'operand2': str(calc.operand2),
+            'result': str(calc.result),
+            'timestamp': calc.timestamp.isoformat()
+        }
+        for calc in calculations
+    ]
+    # An empty history still gets the header row
+    pd.DataFrame(history_data, columns=HISTORY_COLUMNS).to_csv(path, index=False)
+    return len(history_data)
+
+
+def read_history_csv(path: Path, limit: Optional[int] = None) -> List[Calculation]:
+    """
+    Read calculations from a CSV history file.
+
+    All columns are read as strings, so operands and results keep their exact
+    decimal representation. Rows are never iterated as pandas objects: operands,
+    results and timestamps are parsed per column in bulk. Stored results are
+    taken as they are; see Calculator for recomputing them.
+
+    Args:
+        path (Path): Source file.
+        limit (Optional[int], optional): Read only the newest ``limit`` rows.
+
+    Returns:
+        List[Calculation]: The calculations, oldest first.
+
+    Raises:
+        OperationError: If the file contains invalid calculation data.
+    """
+    import pandas as pd
+
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    if limit is not None:
+        df = df.tail(limit)
+    if df.empty:
+        return []
+
+    try:
+        operations = df['operation'].tolist()
+        operands1 = [Decimal(value) for value in df['operand1'].tolist()]
+        operands2 = [Decimal(value) for value in df['operand2'].tolist()]
+        results = [Decimal(value) for value in df['result'].tolist()]
+        timestamps = df['timestamp']
+        try:
+            # Naive ISO timestamps map directly to integer nanoseconds
+            parsed = pd.to_datetime(timestamps, format='ISO8601')
+            if parsed.dt.tz is not None:
+                raise ValueError("timezone-aware timestamps")
+            timestamps_ns = parsed.astype('datetime64[ns]').astype('int64').tolist()
+            tzinfos = [None] * len(timestamps_ns)
+        except (ValueError, TypeError):
+            # Fall back to per-value parsing for mixed or timezone-aware timestamps
+            parsed_values = [datetime.datetime.fromisoformat(value) for value in timestamps.tolist()]
+            timestamps_ns = [datetime_to_ns(value) for value in parsed_values]
+            tzinfos = [value.tzinfo for value in parsed_values]
+    except (KeyError, InvalidOperation, ValueError) as e:
+        raise OperationError(f"Invalid calculation data: {str(e)}")
+
+    return [
+        Calculation.from_parts(*fields)
+        for fields in zip(operations, operands1, operands2, results, timestamps_ns, tzinfos)
+    ]
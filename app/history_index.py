@@ -0,0 +1,241 @@
+########################
+# History Index         #
+########################
+
+from bisect import bisect_left, bisect_right
+from collections import deque
+from dataclasses import dataclass
+import datetime
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.calculation import Calculation, datetime_to_ns, find_operation_id, operation_name
+from app.history_buffer import HistoryBuffer
+from app.history_stats import RunningStats
+
+# Inclusive (low, high) bounds; None leaves that side open
+Range = Tuple[Optional[Decimal], Optional[Decimal]]
+
+
+@dataclass(frozen=True)
+class HistoryQuery:
+    """
+    Criteria for selecting calculations from the history.
+
+    Every criterion is optional; entries must match all that are given.
+    Matches are returned oldest first, or newest first with ``newest_first``,
+    after skipping ``offset`` matches and up to ``limit`` of them.
+    """
+
+    operation: Optional[str] = None                 # Operation name as recorded (e.g. "Division")
+    since: Optional[datetime.datetime] = None       # Earliest timestamp, inclusive
+    until: Optional[datetime.datetime] = None       # Latest timestamp, inclusive
+    operand1: Optional[Range] = None
+    operand2: Optional[Range] = None
+    result: Optional[Range] = None
+    limit: Optional[int] = None
+    offset: int = 0
+    newest_first: bool = False
+
+
+def _in_range(value: Decimal, bounds: Optional[Range]) -> bool:
+    """Return whether a value lies within inclusive bounds."""
+    if bounds is None:
+        return True
+    low, high = bounds
+    return (low is None or value >= low) and (high is None or value <= high)
+
+
+class IndexedHistoryBuffer(HistoryBuffer):
+    """
+    History buffer that maintains indexes for queries.
+
+    Every entry gets a sequence number that increases from the oldest entry to
+    the newest. Two indexes are kept up to date as the buffer changes:
+
+    - per-operation postings: for each operation, the sequence numbers of its
+      entries in order;
+    - a timestamp index: ``(timestamp_ns, sequence)`` pairs kept sorted.
+
+    The ring buffer only changes at its ends, so postings are deques updated
+    in O(1) and the timestamp index is updated with a binary search. Running
+    per-operation statistics of the results (see RunningStats) are maintained
+    the same way. A query
+    starts from the smallest candidate set the indexes provide and stops as
+    soon as ``limit`` matches are found; operand and result ranges are checked
+    on those candidates.
+    """
+
+    def __init__(self, capacity: int, entries: Optional[Iterable[Calculation]] = None):
+        # Sequence numbers of the oldest entry and of the next appended entry
+        self._first_seq = 0
+        self._next_seq = 0
+        self._postings: Dict[int, Deque[int]] = {}
+        self._stats: Dict[int, RunningStats] = {}
+        # Sorted (timestamp_ns, seq) pairs; entries before _timestamps_start were removed
+        self._timestamps: List[Tuple[int, int]] = []
+        self._timestamps_start = 0
+        super().__init__(capacity, entries)
+
+    def append(self, calculation: Calculation) -> Optional[Calculation]:
+        # A full buffer evicts through popleft, which updates the indexes
+        evicted = super().append(calculation)
+        seq = self._next_seq
+        self._next_seq += 1
+        self._operation_postings(calculation.operation_id).append(seq)
+        self._operation_stats(calculation.operation_id).append(calculation.result)
+        self._insert_timestamp(calculation.timestamp_ns, seq)
+        return evicted
+
+    def appendleft(self, calculation: Calculation) -> None:
+        super().appendleft(calculation)
+        self._first_seq -= 1
+        seq = self._first_seq
+        self._operation_postings(calculation.operation_id).appendleft(seq)
+        self._operation_stats(calculation.operation_id).appendleft(calculation.result)
+        self._insert_timestamp(calculation.timestamp_ns, seq)
+
+    def pop(self) -> Calculation:
+        calculation = super().pop()
+        self._next_seq -= 1
+        self._remove(calculation, self._next_seq).pop()
+        self._stats[calculation.operation_id].pop()
+        return calculation
+
+    def popleft(self) -> Calculation:
+        calculation = super().popleft()
+        self._remove(calculation, self._first_seq).popleft()
+        self._stats[calculation.operation_id].popleft()
+        self._first_seq += 1
+        return calculation
+
+    def clear(self) -> None:
+        super().clear()
+        self._first_seq = self._next_seq = 0
+        self._postings.clear()
+        self._stats.clear()
+        self._timestamps.clear()
+        self._timestamps_start = 0
+
+    def _operation_postings(self, op_id: int) -> Deque[int]:
+        postings = self._postings.get(op_id)
+        if postings is None:
+            postings = self._postings[op_id] = deque()
+        return postings
+
+    def _operation_stats(self, op_id: int) -> RunningStats:
+        stats = self._stats.get(op_id)
+        if stats is None:
+            stats = self._stats[op_id] = RunningStats()
+        return stats
+
+    def _insert_timestamp(self, timestamp_ns: int, seq: int) -> None:
+        timestamps, start = self._timestamps, self._timestamps_start
+        entry = (timestamp_ns, seq)
+        # Calculations usually arrive in time order, so this is normally an append
+        if len(timestamps) == start or entry > timestamps[-1]:
+            timestamps.append(entry)
+        elif start and entry < timestamps[start]:
+            # Restoring the oldest entry reuses a removed slot
+            self._timestamps_start -= 1
+            timestamps[self._timestamps_start] = entry
+        else:
+            timestamps.insert(bisect_left(timestamps, entry, start), entry)
+
+    def _remove(self, calculation: Calculation, seq: int) -> Deque[int]:
+        """Drop an entry from the timestamp index and return its operation postings."""
+        timestamps, start = self._timestamps, self._timestamps_start
+        entry = (calculation.timestamp_ns, seq)
+        if timestamps[start] == entry:
+            # Evicting the oldest entry only moves the start; removed slots are
+            # dropped in bulk instead of shifting the list on every eviction
+            start = self._timestamps_start = start + 1
+            if start * 2 > len(timestamps):
+                del timestamps[:start]
+                self._timestamps_start = 0
+        else:
+            del timestamps[bisect_left(timestamps, entry, start)]
+        return self._postings[calculation.operation_id]
+
+    def _at(self, seq: int) -> Calculation:
+        return self[seq - self._first_seq]
+
+    def operation_count(self, operation: str) -> int:
+        """Return the number of entries recorded with an operation name."""
+        return len(self._postings.get(find_operation_id(operation), ()))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the running statistics of the results per operation.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: RunningStats.summary() for every operation
+            with at least one entry, keyed by operation name.
+        """
+        return {
+            operation_name(op_id): stats.summary()
+            for op_id, stats in self._stats.items() if stats.count
+        }
+
+    def _candidates(self, query: HistoryQuery) -> Tuple[Iterable[int], bool]:
+        """
+        Return the sequence numbers that may match, in the requested order.
+
+        The flag tells whether the candidates still have to be checked against
+        the query's time window.
+        """
+        postings = None
+        if query.operation is not None:
+            # An operation name never interned has no entries
+            op_id = find_operation_id(query.operation)
+            postings = self._postings.get(op_id, deque())
+
+        if query.since is None and query.until is None:
+            seqs = postings if postings is not None else range(self._first_seq, self._next_seq)
+            return (reversed(seqs) if query.newest_first else seqs), False
+
+        timestamps, start = self._timestamps, self._timestamps_start
+        low = bisect_left(timestamps, (datetime_to_ns(query.since),), start) if query.since else start
+        high = (
+            bisect_right(timestamps, (datetime_to_ns(query.until), float('inf')), start)
+            if query.until else len(timestamps)
+        )
+        if postings is not None and len(postings) <= high - low:
+            # Fewer entries with this operation than in the time window: scan the postings
+            return (reversed(postings) if query.newest_first else postings), True
+
+        seqs = sorted(seq for _, seq in timestamps[low:high])
+        if postings is not None:
+            seqs = [seq for seq in seqs if self._at(seq).operation_id == op_id]
+        return (reversed(seqs) if query.newest_first else seqs), False
+
+    def query(self, query: HistoryQuery) -> Iterator[Calculation]:
+        """
+        Return the entries matching a query.
+
+        Args:
+            query (HistoryQuery): The criteria to match.
+
+        Returns:
+            Iterator[Calculation]: Matching calculations in the requested order.
+        """
+        seqs, check_time = self._candidates(query)
+        matches: Iterable[Calculation] = (self._at(seq) for seq in seqs)
+        if check_time:
+            since_ns = datetime_to_ns(query.since) if query.since else None
+            until_ns = datetime_to_ns(query.until) if query.until else None
+            matches = (
+                calc for calc in matches
+                if (since_ns is None or calc.timestamp_ns >= since_ns)
+                and (until_ns is None or calc.timestamp_ns <= until_ns)
+            )
+        if query.operand1 is not None or query.operand2 is not None or query.result is not None:
+            matches = (
+                calc for calc in matches
+                if _in_range(calc.operand1, query.operand1)
+                and _in_range(calc.operand2, query.operand2)
+                and _in_range(calc.result, query.result)
+            )
+        stop = query.offset + query.limit if query.limit is not None else None
+        return islice(matches, query.offset, stop)
@@ -0,0 +1,203 @@
+########################
+# SQLite History Store  #
+########################
+
+"""
+Calculation history stored in an SQLite database.
+
+Unlike the CSV and binary formats, the database is never rewritten as a whole:
+new calculations are inserted as rows, so the stored history can grow far
+beyond ``max_history_size`` while the calculator keeps only the newest entries
+in memory. Operands and results are stored as decimal strings so they keep
+their exact value; timestamps are int64 nanoseconds (wall-clock time, as in
+Calculation) with an optional UTC offset in minutes. ``timestamp_ns`` and
+``operation`` are indexed.
+
+The database runs in WAL mode with ``synchronous=NORMAL``: a write is a single
+append to the write-ahead log, and readers are never blocked by the writer.
+"""
+
+import datetime
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+from app.calculation import Calculation
+from app.exceptions import OperationError
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calculations (
+    id INTEGER PRIMARY KEY,
+    operation TEXT NOT NULL,
+    operand1 TEXT NOT NULL,
+    operand2 TEXT NOT NULL,
+    result TEXT NOT NULL,
+    timestamp_ns INTEGER NOT NULL,
+    utc_offset INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_calculations_timestamp ON calculations (timestamp_ns);
+CREATE INDEX IF NOT EXISTS idx_calculations_operation ON calculations (operation);
+"""
+
+_INSERT = (
+    "INSERT INTO calculations (operation, operand1, operand2, result, timestamp_ns, utc_offset) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_COLUMNS = "operation, operand1, operand2, result, timestamp_ns, utc_offset"
+
+# Row layout shared by _INSERT and _COLUMNS
+Row = Tuple[str, str, str, str, int, Optional[int]]
+
+
+def _to_row(calc: Calculation) -> Row:
+    """Return the database row for a calculation."""
+    offset_minutes = None
+    if calc.tzinfo is not None:
+        offset = calc.timestamp.utcoffset()
+        if offset is not None:
+            offset_minutes = int(offset.total_seconds() // 60)
+    return (calc.operation, str(calc.operand1), str(calc.operand2), str(calc.result),
+            calc.timestamp_ns, offset_minutes)
+
+
+def _from_row(row: Tuple[int, str, str, str, str, int, Optional[int]]) -> Calculation:
+    """Return the calculation stored in a database row, starting with its id."""
+    row_id, operation, operand1, operand2, result, timestamp_ns, offset_minutes = row
+    tzinfo = (
+        datetime.timezone(datetime.timedelta(minutes=offset_minutes)) if offset_minutes is not None else None
+    )
+    calc = Calculation.from_parts(
+        operation, Decimal(operand1), Decimal(operand2), Decimal(result), timestamp_ns, tzinfo
+    )
+    calc.row_id = row_id
+    return calc
+
+
+class SQLiteHistory:
+    """
+    Calculation history backed by an SQLite database.
+
+    One connection is kept open for the lifetime of the object and may be
+    used from any thread; calls are serialized by an internal lock. Every
+    write runs in a single transaction, so a batch of calculations is either
+    stored completely or not at all.
+
+    Calculations inserted or read are given the id of their row
+    (``Calculation.row_id``), which tells replace_tail where the rows of
+    the in-memory history start.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Open the database, creating it and its indexes if necessary.
+
+        Args:
+            path (Path): The database file.
+
+        Raises:
+            OperationError: If the file is not a usable history database.
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            with self._connection:
+                self._connection.executescript(_SCHEMA)
+                self._connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        except sqlite3.Error as e:
+            raise OperationError(f"Invalid history database {self.path}: {e}")
+
+    def append(self, calculations: Iterable[Calculation]) -> int:
+        """
+        Insert calculations after the stored ones in one transaction.
+
+        Args:
+            calculations (Iterable[Calculation]): Calculations to insert, oldest first.
+
+        Returns:
+            int: The number of calculations inserted.
+        """
+        calculations = list(calculations)
+        with self._lock, self._connection:
+            self._insert(calculations)
+        return len(calculations)
+
+    def _insert(self, calculations: List[Calculation]) -> None:
+        """Insert calculations and record their row ids; call inside a transaction."""
+        if not calculations:
+            return
+        self._connection.executemany(_INSERT, [_to_row(calc) for calc in calculations])
+        # New rows get consecutive ids after the largest one, and the open
+        # transaction keeps other writers out until it commits
+        last = self._connection.execute("SELECT MAX(id) FROM calculations").fetchone()[0]
+        for row_id, calc in enumerate(calculations, last - len(calculations) + 1):
+            calc.row_id = row_id
+
+    def replace_tail(self, calculations: List[Calculation], start: Optional[int] = None) -> None:
+        """
+        Replace the newest stored calculations with ``calculations``.
+
+        Every row from ``start`` or from the first stored calculation (the
+        smallest ``row_id``), whichever comes first, is deleted and the
+        calculations are inserted in their place, in one transaction. Older
+        rows are kept; if neither is known, nothing is deleted, so an empty
+        list never removes archived rows. This brings the database in line
+        with an in-memory history that was changed in a way appending cannot
+        describe (undo, redo, clear).
+
+        Args:
+            calculations (List[Calculation]): The in-memory history, oldest first.
+            start (Optional[int], optional): Row id of the first calculation
+                removed from the in-memory history since it was last written,
+                e.g. by clear.
+        """
+        stored = [calc.row_id for calc in calculations if calc.row_id is not None]
+        if start is not None:
+            stored.append(start)
+        with self._lock, self._connection:
+            if stored:
+                self._connection.execute("DELETE FROM calculations WHERE id >= ?", (min(stored),))
+            self._insert(calculations)
+
+    def tail(self, limit: int) -> List[Calculation]:
+        """
+        Return the newest ``limit`` calculations.
+
+        Args:
+            limit (int): Maximum number of calculations to read.
+
+        Returns:
+            List[Calculation]: The calculations, oldest first.
+
+        Raises:
+            OperationError: If a stored row is not a valid calculation.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT id, {_COLUMNS} FROM calculations ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        try:
+            return [_from_row(row) for row in reversed(rows)]
+        except (InvalidOperation, ValueError, TypeError) as e:
+            raise OperationError(f"Invalid calculation data: {str(e)}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM calculations").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> 'SQLiteHistory':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
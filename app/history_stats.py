@@ -0,0 +1,199 @@
+########################
+# History Statistics    #
+########################
+
+import decimal
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+# Digits kept in a running sum: far beyond the default calculation precision,
+# but bounded, so that mixing results of extreme exponents (1E+999 and
+# 1E-999999 are both valid) cannot make every update cost a million digits
+SUM_PRECISION = 50
+
+_SUM_CONTEXT = decimal.Context(prec=SUM_PRECISION, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+
+# Stack entry: a value with the minimum and maximum of the stack up to it
+_Entry = Tuple[Decimal, Decimal, Decimal]
+
+
+def _push(stack: List[_Entry], value: Decimal) -> None:
+    """Push a value onto a min/max stack."""
+    if stack:
+        _, low, high = stack[-1]
+        stack.append((value, value if value < low else low, value if value > high else high))
+    else:
+        stack.append((value, value, value))
+
+
+class MinMaxDeque:
+    """
+    Deque of values that reports its minimum and maximum in O(1).
+
+    Built from two stacks that each remember the minimum and maximum below
+    every entry: the front stack holds the left part of the deque with the
+    leftmost value on top, the back stack the right part with the rightmost
+    value on top. Values are pushed and popped at both ends.
+
+    Sliding the window (append, then popleft) is the common case: when the
+    front stack runs empty, every value moves to it, as in a two-stack queue.
+    When the back stack runs empty on pop (an undo), the values are split in
+    half instead, so alternating between both ends also stays amortized O(1).
+    """
+
+    def __init__(self) -> None:
+        self._front: List[_Entry] = []
+        self._back: List[_Entry] = []
+
+    def append(self, value: Decimal) -> None:
+        """Add a value at the right end."""
+        _push(self._back, value)
+
+    def appendleft(self, value: Decimal) -> None:
+        """Add a value at the left end."""
+        _push(self._front, value)
+
+    def pop(self) -> Decimal:
+        """
+        Remove and return the rightmost value.
+
+        Raises:
+            IndexError: If the deque is empty.
+        """
+        if not self._back:
+            self._rebalance(right=True)
+        return self._back.pop()[0]
+
+    def popleft(self) -> Decimal:
+        """
+        Remove and return the leftmost value.
+
+        Raises:
+            IndexError: If the deque is empty.
+        """
+        if not self._front:
+            self._rebalance(right=False)
+        return self._front.pop()[0]
+
+    def _rebalance(self, right: bool) -> None:
+        """Move values between the stacks so that the requested side is non-empty."""
+        values = [value for value, _, _ in reversed(self._front)] + [value for value, _, _ in self._back]
+        if not values:
+            raise IndexError("pop from an empty deque")
+        middle = len(values) // 2 if right else len(values)
+        self._front, self._back = [], []
+        for value in reversed(values[:middle]):
+            _push(self._front, value)
+        for value in values[middle:]:
+            _push(self._back, value)
+
+    def min(self) -> Optional[Decimal]:
+        """Return the smallest value, or None if the deque is empty."""
+        tops = [stack[-1][1] for stack in (self._front, self._back) if stack]
+        return min(tops) if tops else None
+
+    def max(self) -> Optional[Decimal]:
+        """Return the largest value, or None if the deque is empty."""
+        tops = [stack[-1][2] for stack in (self._front, self._back) if stack]
+        return max(tops) if tops else None
+
+    def clear(self) -> None:
+        """Remove every value."""
+        self._front.clear()
+        self._back.clear()
+
+    def __len__(self) -> int:
+        return len(self._front) + len(self._back)
+
+
+class RunningStats:
+    """
+    Count, sum, minimum and maximum of a window of results.
+
+    Results enter and leave the window at either end, in the same way
+    calculations enter and leave the history (append, eviction, undo and
+    redo). Every update is amortized O(1).
+
+    The sum is a compensated (Neumaier) sum at SUM_PRECISION digits: what
+    rounding drops from the running sum is accumulated in a compensation
+    term, so removing a large result does not wipe out the small ones added
+    while it was in the window. Sums that fit in SUM_PRECISION digits are exact.
+    """
+
+    def __init__(self) -> None:
+        self._sum = Decimal(0)
+        self._compensation = Decimal(0)
+        self._values = MinMaxDeque()
+
+    @property
+    def count(self) -> int:
+        """Return the number of results in the window."""
+        return len(self._values)
+
+    @property
+    def total(self) -> Decimal:
+        """Return the sum of the results in the window."""
+        return _SUM_CONTEXT.add(self._sum, self._compensation)
+
+    def _add(self, value: Decimal) -> None:
+        """Add a value to the compensated sum."""
+        context = _SUM_CONTEXT
+        running = self._sum
+        total = context.add(running, value)
+        # The part of the smaller operand lost in rounding
+        if running.copy_abs() >= value.copy_abs():
+            lost = context.add(context.subtract(running, total), value)
+        else:
+            lost = context.add(context.subtract(value, total), running)
+        self._compensation = context.add(self._compensation, lost)
+        self._sum = total
+
+    def _remove(self, value: Decimal) -> None:
+        """Subtract a value from the compensated sum."""
+        if self._values:
+            self._add(value.copy_negate())
+        else:
+            # An empty window sums to zero; drop any residue of rounding
+            self._sum = self._compensation = Decimal(0)
+
+    def append(self, value: Decimal) -> None:
+        """Add the newest result."""
+        self._values.append(value)
+        self._add(value)
+
+    def appendleft(self, value: Decimal) -> None:
+        """Add a result older than every other one."""
+        self._values.appendleft(value)
+        self._add(value)
+
+    def pop(self) -> Decimal:
+        """Remove and return the newest result."""
+        value = self._values.pop()
+        self._remove(value)
+        return value
+
+    def popleft(self) -> Decimal:
+        """Remove and return the oldest result."""
+        value = self._values.popleft()
+        self._remove(value)
+        return value
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Return the aggregates of the window.
+
+        The mean is computed in the current decimal context.
+
+        Returns:
+            Dict[str, Any]: ``count``, ``sum``, ``min``, ``max`` and ``mean``;
+            the last three are None for an empty window.
+        """
+        count = self.count
+        total = self.total
+        return {
+            'count': count,
+            'sum': total,
+            'min': self._values.min(),
+            'max': self._values.max(),
+            'mean': total / count if count else None,
+        }
@@ -0,0 +1,192 @@
+########################
+# Logging Setup         #
+########################
+
+"""
+Queue-based logging for the calculator.
+
+Log calls only put the record on an in-memory queue; a QueueListener thread
+formats it and writes it to a size-rotated log file, flushing once per burst
+of records rather than once per record. Records are not formatted
+on the calling thread: with ``%``-style arguments
+(``logging.info("Set operation: %s", operation)``), building the message is
+deferred to the listener thread, and skipped entirely for records below the
+log level. Arguments must therefore not be mutated after the call; the
+calculator only passes immutable values (strings, numbers, Decimals).
+"""
+
+import atexit
+import codecs
+from fractions import Fraction
+import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+import queue
+import threading
+from typing import Optional, Tuple
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_lock = threading.Lock()
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+_settings: Optional[Tuple] = None
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue never leaves the process, so the record can be passed as is
+        return record
+
+
+class _SizeRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that keeps track of the file size itself.
+
+    The standard handler checks the file on disk, seeks to its end and formats
+    the record a second time for every record it writes. This one counts the
+    bytes written, with an incremental encoder matching the file's, and formats
+    each record once; it does not flush after every record either, leaving that
+    to _BatchingQueueListener.
+    """
+
+    def _open(self):
+        stream = super()._open()
+        stream.seek(0, 2)
+        self._size = stream.tell()
+        self._encoder = codecs.getincrementalencoder(stream.encoding)(stream.errors)
+        if self._size:
+            # Like the stream itself, do not count a byte order mark after the start of the file
+            self._encoder.setstate(0)
+        return stream
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            size = len(self._encoder.encode(msg))
+            if 0 < self.maxBytes <= self._size + size and self._size:
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+                size = len(self._encoder.encode(msg))
+            self.stream.write(msg)
+            self._size += size
+        except Exception:
+            self.handleError(record)
+
+
+class _BatchingQueueListener(QueueListener):
+    """QueueListener that flushes its handlers once the queue has been drained."""
+
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+
+
+def configure_logging(
+    log_file: Path,
+    level: int = logging.INFO,
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+    encoding: str = 'utf-8'
+) -> None:
+    """
+    Route the root logger through a queue to a rotating log file.
+
+    Calling it again with the same settings does nothing, so every Calculator
+    can call it without reopening the file. Different settings replace the
+    previous pipeline after its queued records have been written.
+
+    Args:
+        log_file (Path): The log file; rotated to ``log_file.1`` ... when full.
+        level (int, optional): Minimum level of records to log.
+        max_bytes (int, optional): Size at which the file is rotated; 0 never rotates.
+        backup_count (int, optional): Number of rotated files to keep.
+        encoding (str, optional): Encoding of the log file.
+    """
+    global _listener, _queue_handler, _settings
+    settings = (Path(log_file).resolve(), level, max_bytes, backup_count, encoding)
+    with _lock:
+        if settings == _settings:
+            return
+        _shutdown()
+
+        file_handler = _SizeRotatingFileHandler(
+            settings[0], maxBytes=max_bytes, backupCount=backup_count, encoding=encoding
+        )
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        _queue_handler = _DeferredQueueHandler(log_queue)
+        _listener = _BatchingQueueListener(log_queue, file_handler)
+
+        root = logging.getLogger()
+        root.addHandler(_queue_handler)
+        root.setLevel(level)
+        _listener.start()
+        _settings = settings
+
+
+def shutdown_logging() -> None:
+    """Write every queued record, stop the listener thread and close the log file."""
+    with _lock:
+        _shutdown()
+
+
+def _shutdown() -> None:
+    global _listener, _queue_handler, _settings
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        # stop() processes the records still queued before returning
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    _settings = None
+
+
+atexit.register(shutdown_logging)
+
+
+class LogSampler:
+    """
+    Decides which occurrences of a frequent event are logged.
+
+    With a rate of 0.1, the first event and then one in ten are logged; with
+    a rate of 0, none are.
+    Sampling is deterministic (an integer credit accumulates per event), so
+    the logged share is exact rather than random.
+    """
+
+    def __init__(self, rate: float = 1.0):
+        """
+        Initialize the sampler.
+
+        Args:
+            rate (float, optional): Share of events to log, between 0 and 1.
+
+        Raises:
+            ValueError: If the rate is outside [0, 1].
+        """
+        if not 0 <= rate <= 1:
+            raise ValueError("rate must be between 0 and 1")
+        self.rate = rate
+        share = Fraction(rate).limit_denominator(1_000_000)
+        self._step, self._period = share.numerator, share.denominator
+        # Start one step short of a full period so that the first event is logged
+        self._credit = self._period - self._step if self._step else 0
+
+    def sample(self) -> bool:
+        """Return whether the current event should be logged."""
+        self._credit += self._step
+        if self._credit >= self._period:
+            self._credit -= self._period
+            return True
+        return False
@@ -0,0 +1,161 @@
+########################
+# Metrics               #
+########################
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Bucket i counts durations of i significant bits: [2**(i-1), 2**i) nanoseconds
+# (bucket 0 holds zero). 65 buckets cover every duration an int64 clock reports.
+_BUCKETS = 65
+
+
+class LatencyHistogram:
+    """
+    Histogram of durations in power-of-two nanosecond buckets.
+
+    Recording a duration is one ``int.bit_length`` call and a few additions,
+    and the histogram has a fixed size however many durations it records.
+    Percentiles are reported as the upper bound of the bucket they fall in,
+    so they overestimate by less than a factor of two.
+    """
+
+    __slots__ = ('buckets', 'count', 'total_ns', 'max_ns')
+
+    def __init__(self) -> None:
+        self.buckets: List[int] = [0] * _BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, duration_ns: int) -> None:
+        """Add one duration, in nanoseconds."""
+        self.buckets[duration_ns.bit_length()] += 1
+        self.count += 1
+        self.total_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def percentile(self, fraction: float) -> int:
+        """
+        Return an upper bound of the given percentile, in nanoseconds.
+
+        Args:
+            fraction (float): The percentile as a fraction, e.g. 0.99.
+
+        Returns:
+            int: The upper bound of the bucket holding the percentile, capped
+            at the largest recorded duration; 0 if nothing was recorded.
+        """
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min((1 << index) - 1, self.max_ns)
+        return 0
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Return the count and the latency figures in microseconds.
+
+        Returns:
+            Dict[str, Any]: ``count``, ``total_us``, ``mean_us``, ``p50_us``,
+            ``p99_us`` and ``max_us``.
+        """
+        return {
+            'count': self.count,
+            'total_us': round(self.total_ns / 1000, 3),
+            'mean_us': round(self.total_ns / self.count / 1000, 3) if self.count else 0.0,
+            'p50_us': round(self.percentile(0.5) / 1000, 3),
+            'p99_us': round(self.percentile(0.99) / 1000, 3),
+            'max_us': round(self.max_ns / 1000, 3),
+        }
+
+
+class Metrics:
+    """
+    Named latency histograms and counters for the calculator's hot paths.
+
+    Stages are timed by the caller with ``time.perf_counter_ns`` and recorded
+    here by name, e.g. ``validate``, ``execute`` or ``observer.LoggingObserver``.
+    Histograms and counters are created on first use. Recording takes a lock,
+    since observers may be notified on the dispatcher thread.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._counters: Dict[str, int] = {}
+
+    def record(self, stage: str, duration_ns: int) -> None:
+        """
+        Record the duration of one execution of a stage.
+
+        Args:
+            stage (str): Name of the stage.
+            duration_ns (int): Duration in nanoseconds.
+        """
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = LatencyHistogram()
+            histogram.record(duration_ns)
+
+    def record_all(
+        self,
+        durations: Iterable[Tuple[str, int]],
+        increments: Iterable[Tuple[str, int]] = ()
+    ) -> None:
+        """
+        Record the durations of several stages and increase counters, taking the lock once.
+
+        Args:
+            durations (Iterable[Tuple[str, int]]): (stage, nanoseconds) pairs.
+            increments (Iterable[Tuple[str, int]], optional): (counter, amount) pairs.
+        """
+        with self._lock:
+            histograms = self._histograms
+            for stage, duration_ns in durations:
+                histogram = histograms.get(stage)
+                if histogram is None:
+                    histogram = histograms[stage] = LatencyHistogram()
+                histogram.record(duration_ns)
+            counters = self._counters
+            for counter, amount in increments:
+                counters[counter] = counters.get(counter, 0) + amount
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        """
+        Increase a counter.
+
+        Args:
+            counter (str): Name of the counter.
+            amount (int, optional): Amount to add.
+        """
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    def histogram(self, stage: str) -> Optional[LatencyHistogram]:
+        """Return the histogram of a stage, or None if it was never recorded."""
+        return self._histograms.get(stage)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the current figures.
+
+        Returns:
+            Dict[str, Any]: ``stages``, mapping each stage to its histogram
+            summary, and ``counters``, mapping each counter to its value.
+        """
+        with self._lock:
+            return {
+                'stages': {stage: histogram.summary() for stage, histogram in self._histograms.items()},
+                'counters': dict(self._counters),
+            }
+
+    def reset(self) -> None:
+        """Discard every histogram and counter."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
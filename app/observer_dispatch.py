@@ -0,0 +1,193 @@
+########################
+# Observer Dispatch     #
+########################
+
+import atexit
+from collections import deque
+import logging
+import threading
+import time
+from typing import Deque, Dict, List, Optional, Sequence
+
+from app.calculation import Calculation
+from app.history import HistoryObserver
+from app.metrics import Metrics
+
+# What to do when a notification arrives while the queue is full
+OVERFLOW_POLICIES = ('block', 'drop_oldest', 'coalesce')
+
+
+class ObserverDispatcher:
+    """
+    Delivers observer notifications on a worker thread.
+
+    Calculator.notify_observers and notify_observers_batch only queue the new
+    calculations; a worker thread drains the queue and calls each observer's
+    update or update_batch in order, so a slow observer no longer adds to the
+    latency of a calculation. The queue holds at most ``max_queue``
+    notifications. When it is full, the overflow policy decides:
+
+    - ``block``: the caller waits until the worker makes room;
+    - ``drop_oldest``: the oldest queued notification is discarded;
+    - ``coalesce``: the calculations are merged into the newest queued
+      notification, which is delivered as one update_batch call.
+
+    An exception raised by an observer is logged and counted; the remaining
+    observers and notifications are still delivered. ``flush`` waits until
+    everything queued before it has been delivered, and ``close`` is
+    registered to run at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        observers: Sequence[HistoryObserver],
+        max_queue: int = 1024,
+        overflow: str = 'block',
+        metrics: Optional[Metrics] = None
+    ):
+        """
+        Initialize the dispatcher and start its worker thread.
+
+        Args:
+            observers (Sequence[HistoryObserver]): The observers to notify. The
+                sequence is read on every delivery, so observers added later are
+                notified as well.
+            max_queue (int, optional): Maximum number of queued notifications.
+            overflow (str, optional): 'block', 'drop_oldest' or 'coalesce'.
+            metrics (Optional[Metrics], optional): Where to record the time each
+                observer takes, as stage ``observer.<class name>``.
+
+        Raises:
+            ValueError: If max_queue is not positive or the policy is unknown.
+        """
+        if max_queue <= 0:
+            raise ValueError("max_queue must be positive")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self._observers = observers
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.metrics = metrics
+
+        self._condition = threading.Condition()
+        # Each notification is a list of calculations, oldest first
+        self._queue: Deque[List[Calculation]] = deque()
+        self._submitted = 0       # Notifications accepted so far
+        self._completed = 0       # Notifications delivered, dropped or merged so far
+        self.dropped = 0          # Calculations discarded by drop_oldest
+        self.coalesced = 0        # Notifications merged into a queued one
+        self.errors = 0           # Exceptions raised by observers
+        self.last_error: Optional[Exception] = None
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name="calculator-observers", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, calculations: List[Calculation]) -> None:
+        """
+        Queue a notification for one or more new calculations.
+
+        Args:
+            calculations (List[Calculation]): The calculations performed, oldest first.
+
+        Raises:
+            RuntimeError: If the dispatcher has been closed.
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Observer dispatcher is closed")
+            # An observer notifying from the worker thread must not wait for itself
+            if len(self._queue) >= self.max_queue and threading.current_thread() is not self._thread:
+                if self.overflow == 'block':
+                    self._condition.wait_for(lambda: len(self._queue) < self.max_queue or self._closed)
+                    if self._closed:
+                        raise RuntimeError("Observer dispatcher is closed")
+                elif self.overflow == 'drop_oldest':
+                    self.dropped += len(self._queue.popleft())
+                    self._completed += 1
+                else:
+                    # Queued lists are copies owned by the dispatcher
+                    self._queue[-1].extend(calculations)
+                    self.coalesced += 1
+                    self._submitted += 1
+                    self._completed += 1
+                    return
+            self._queue.append(list(calculations))
+            self._submitted += 1
+            self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every notification queued before the call has been delivered.
+
+        Args:
+            timeout (Optional[float], optional): Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if the queue was drained in time.
+        """
+        with self._condition:
+            target = self._submitted
+            return self._condition.wait_for(lambda: self._completed >= target, timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Deliver the queued notifications and stop the worker thread.
+
+        Args:
+            timeout (Optional[float], optional): Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if every queued notification was delivered.
+        """
+        with self._condition:
+            if not self._closed:
+                self._closed = True
+                self._condition.notify_all()
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+        return not self._thread.is_alive()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the queue length and the submitted, dropped, coalesced and error counters."""
+        with self._condition:
+            return {
+                'queued': len(self._queue),
+                'submitted': self._submitted,
+                'dropped': self.dropped,
+                'coalesced': self.coalesced,
+                'errors': self.errors,
+            }
+
+    def _deliver(self, calculations: List[Calculation]) -> None:
+        """Notify every observer, reporting exceptions without stopping."""
+        metrics = self.metrics
+        for observer in list(self._observers):
+            try:
+                start = time.perf_counter_ns()
+                if len(calculations) == 1:
+                    observer.update(calculations[0])
+                else:
+                    observer.update_batch(calculations)
+                if metrics is not None:
+                    metrics.record('observer.' + observer.__class__.__name__, time.perf_counter_ns() - start)
+            except Exception as e:
+                self.errors += 1
+                self.last_error = e
+                logging.error("Observer %s failed: %s", observer.__class__.__name__, e)
+
+    def _run(self) -> None:
+        """Worker loop: deliver notifications in order until closed and drained."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+                calculations = self._queue.popleft()
+                # A producer blocked on a full queue can continue
+                self._condition.notify_all()
+            self._deliver(calculations)
+            with self._condition:
+                self._completed += 1
+                self._condition.notify_all()
@@ -2,10 +2,14 @@
 
 from abc import ABC, abstractmethod
 from decimal import Decimal
-from typing import Dict
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
+from app.decimal_math import power, root
 from app.exceptions import ValidationError
 
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
 class Operation(ABC):
     """
     Abstract base clase for calculators operations
@@ -43,6 +47,37 @@ class Operation(ABC):
         """
         pass
 
+    # Whether the operation provides a NumPy float64 kernel for batch evaluation
+    supports_vectorized = False
+
+    def execute_vectorized(self, a: 'np.ndarray', b: 'np.ndarray') -> 'np.ndarray':
+        """
+        Execute the operation element-wise on float64 arrays.
+
+        Used by the opt-in NumPy fast path of batch evaluation. Elements flagged
+        by invalid_operands_vectorized are computed too but discarded by the caller.
+        Args:
+            a (np.ndarray): First operands.
+            b (np.ndarray): Second operands.
+        Returns:
+            np.ndarray: Element-wise results.
+        Raises:
+            NotImplementedError: If the operation has no vectorized kernel.
+        """
+        raise NotImplementedError(f"{self} has no vectorized kernel")
+
+    def invalid_operands_vectorized(self, a: 'np.ndarray', b: 'np.ndarray') -> List[Tuple['np.ndarray', str]]:
+        """
+        Vectorized counterpart of validate_operands.
+        Can be overriden by subclasses that reject some operands.
+        Args:
+            a (np.ndarray): First operands.
+            b (np.ndarray): Second operands.
+        Returns:
+            List[Tuple[np.ndarray, str]]: Boolean masks of invalid elements with their error messages.
+        """
+        return []
+
     def __str__(self) -> str:
         """
         Return operation name for display
@@ -59,9 +94,14 @@ class Addition(Operation):
     Addition operation implementation
     Performs the addition of two numbers
     """
+    supports_vectorized = True
+
     def execute(self, a: Decimal, b: Decimal) -> Decimal:
         self.validate_operands(a, b)
         return a + b
+
+    def execute_vectorized(self, a: 'np.ndarray', b: 'np.ndarray') -> 'np.ndarray':
+        return a + b
     
 class Subtraction(Operation):
     """
@@ -79,6 +119,11 @@ class Subtraction(Operation):
         """
         self.validate_operands(a, b) 
         return a - b
+
+    supports_vectorized = True
+
+    def execute_vectorized(self, a: 'np.ndarray', b: 'np.ndarray') -> 'np.ndarray':
+        return a - b
     
 
 class Multiplication(Operation):
@@ -93,6 +138,11 @@ class Multiplication(Operation):
         self.validate_operands(a,b)
         return a * b
 
+    supports_vectorized = True
+
+    def execute_vectorized(self, a: 'np.ndarray', b: 'np.ndarray') -> 'np.ndarray':
+        return a * b
+
 class Division(Operation):
     """
     Division operation implementation
@@ -124,6 +174,14 @@ class Division(Operation):
         self.validate_operands(a, b) #implemented above for the division situation
         return a / b
 
+    supports_vectorized = True
+
+    def invalid_operands_vectorized(self, a: 'np.ndarray', b: 'np.ndarray') -> List[Tuple['np.ndarray', str]]:
+        return [(b == 0, "Division by zero is not allowed")]
+
+    def execute_vectorized(self, a: 'np.ndarray', b: 'np.ndarray') -> 'np.ndarray':
+        return a / b
+
 class Power(Operation):
     """
     Power (exponentiation) operation implementation
@@ -134,6 +192,8 @@ class Power(Operation):
         super().validate_operands(a, b)
         if b < 0:
             raise ValidationError("Negative exponents not supported")
+        if a < 0 and b != b.to_integral_value():
+            raise ValidationError("Fractional exponents of negative numbers are not supported")
         
     def execute(self, a: Decimal, b: Decimal) -> Decimal:
         """
@@ -142,10 +202,26 @@ class Power(Operation):
             a, Decimal: base number
             b, Decimal: exponent
         Returns:
-            Decimal, result of the exponentiation
+            Decimal, result of the exponentiation, rounded to the engine precision
+            (see app.decimal_math.engine_context)
         """
         self.validate_operands(a, b)
-        return Decimal(pow(float(a), float(b)))
+        return power(a, b)
+
+    supports_vectorized = True
+
+    def invalid_operands_vectorized(self, a: 'np.ndarray', b: 'np.ndarray') -> List[Tuple['np.ndarray', str]]:
+        import numpy as np
+
+        return [
+            (b < 0, "Negative exponents not supported"),
+            ((a < 0) & (b != np.trunc(b)), "Fractional exponents of negative numbers are not supported"),
+        ]
+
+    def execute_vectorized(self, a: 'np.ndarray', b: 'np.ndarray') -> 'np.ndarray':
+        import numpy as np
+
+        return np.power(a, b)
     
 class Root(Operation):
     """
@@ -181,10 +257,24 @@ class Root(Operation):
             b (Decimal): Degree of the root.
 
         Returns:
-            Decimal: Result of the root calculation.
+            Decimal: Result of the root calculation, rounded to the engine precision
+            (see app.decimal_math.engine_context).
         """
         self.validate_operands(a, b)
-        return Decimal(pow(float(a), 1 / float(b)))
+        return root(a, b)
+
+    supports_vectorized = True
+
+    def invalid_operands_vectorized(self, a: 'np.ndarray', b: 'np.ndarray') -> List[Tuple['np.ndarray', str]]:
+        return [
+            (a < 0, "Cannot calculate root of negative number"),
+            (b == 0, "Zero root is undefined"),
+        ]
+
+    def execute_vectorized(self, a: 'np.ndarray', b: 'np.ndarray') -> 'np.ndarray':
+        import numpy as np
+
+        return np.power(a, 1 / b)
 
 class OperationFactory:
     """
@@ -193,6 +283,8 @@ class OperationFactory:
     DEcouples creation from the Calculator class
     Using a dictionary mapping operation identifiers to their classes
 
+    Operations are stateless, so each one is a flyweight: the factory creates
+    a single shared instance per identifier and hands it out on every request.
     """
 
     _operations: Dict[str, type] = {
@@ -204,6 +296,9 @@ class OperationFactory:
         'root' : Root
     }
 
+    # Shared instance per operation identifier, created on first request
+    _instances: Dict[str, Operation] = {}
+
     @classmethod
     def register_operation(cls, name: str, operation_class: type) -> None:
         """
@@ -220,26 +315,52 @@ class OperationFactory:
         if not issubclass(operation_class, Operation):
             raise TypeError("Operation class must inherit from Operation")
         cls._operations[name.lower()] = operation_class
+        # Drop the shared instance of a replaced operation
+        cls._instances.pop(name.lower(), None)
 
     @classmethod
     def create_operation(cls, operation_type: str) -> Operation:
         """
         Create an operation instance based on the operation type
         THis method retrieves the appropriate operation class from the 
-        _operations dictionary and instantiates it
+        _operations dictionary and instantiates it once; later requests
+        return the same shared instance
 
         ARGS:
             operation_type (str): the type of operation to create e.g. add
         
         Returns:
-            Operation: an instance of the specified operation class 
+            Operation: the shared instance of the specified operation class 
         Raises:
             ValueError: if the operation type is unknown
 
         """
-        operation_class = cls._operations.get(operation_type.lower())
-        if not operation_class:
-            raise ValueError(f"Unknown operation: {operation_type}")
-        return operation_class()
+        key = operation_type.lower()
+        operation = cls._instances.get(key)
+        if operation is None:
+            operation_class = cls._operations.get(key)
+            if not operation_class:
+                raise ValueError(f"Unknown operation: {operation_type}")
+            operation = cls._instances[key] = operation_class()
+        return operation
+
+    @classmethod
+    def find_operation(cls, class_name: str) -> Optional[Operation]:
+        """
+        Return the shared instance of a registered operation by its class name.
+
+        Calculations record operations by class name (e.g. 'Addition'), so this
+        maps a stored calculation back to the operation that computes it.
+
+        ARGS:
+            class_name (str): the class name of the operation
+        Returns:
+            Optional[Operation]: the shared instance, or None if no registered
+            operation has that class name
+        """
+        for name, operation_class in cls._operations.items():
+            if operation_class.__name__ == class_name:
+                return cls.create_operation(name)
+        return None
     
     
\ No newline at end of file
@@ -0,0 +1,126 @@
+########################
+# Process-Pool Backend  #
+########################
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from decimal import Decimal, InvalidOperation, getcontext, localcontext
+import itertools
+import os
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple
+
+from app.decimal_math import EngineSettings, current_engine, engine_context
+from app.exceptions import OperationError, ValidationError
+from app.operations import Operation
+
+# Outcome of one element: (result, None) on success or (None, error message)
+Outcome = Tuple[Optional[Decimal], Optional[str]]
+
+
+def _execute_chunk(
+    precision: int,
+    engine: EngineSettings,
+    items: List[Tuple[Operation, str, str]]
+) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Execute a chunk of operations in a worker process.
+
+    Operands and results travel as decimal strings: they round-trip a Decimal
+    exactly and pickle smaller and faster than Decimal objects. The operation
+    instance is shared by every item of a batch, so pickle sends it only once
+    per chunk.
+
+    Args:
+        precision (int): Decimal context precision of the submitting process.
+        engine (EngineSettings): Power/Root engine settings of the submitting process.
+        items (List[Tuple[Operation, str, str]]): Operation and operands per element.
+
+    Returns:
+        List[Tuple[Optional[str], Optional[str]]]: Result string or error message per element.
+    """
+    outcomes = []
+    with localcontext() as context, engine_context(engine.precision, engine.mode):
+        context.prec = precision
+        for operation, a, b in items:
+            try:
+                outcomes.append((str(operation.execute(Decimal(a), Decimal(b))), None))
+            except (ValidationError, OperationError) as e:
+                outcomes.append((None, str(e)))
+            except (InvalidOperation, ArithmeticError, ValueError) as e:
+                outcomes.append((None, f"Operation failed: {e}"))
+    return outcomes
+
+
+class ProcessPoolBackend:
+    """
+    Executes operations on a pool of worker processes.
+
+    CPU-bound operations such as Power and Root at high precision are limited
+    to one core by the GIL; this backend spreads them over ``workers``
+    processes. Elements are sent in chunks of ``chunk_size`` to amortize the
+    inter-process overhead, and results are returned in input order.
+
+    At most two chunks per worker are in flight at any time, so an unbounded
+    input (e.g. a stream) is consumed incrementally with bounded memory.
+
+    Operations are pickled by reference to their class, so custom operations
+    must be defined at module level to be usable with this backend.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = 1000):
+        """
+        Initialize the backend. The worker processes start on first use.
+
+        Args:
+            workers (Optional[int], optional): Number of worker processes.
+                Defaults to the number of CPUs.
+            chunk_size (int, optional): Elements sent to a worker at a time.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def execute(self, items: Iterable[Tuple[Operation, Decimal, Decimal]]) -> Iterator[Outcome]:
+        """
+        Execute operations in parallel, yielding outcomes in input order.
+
+        Args:
+            items (Iterable[Tuple[Operation, Decimal, Decimal]]): Operation and
+                validated operands per element.
+
+        Yields:
+            Outcome: ``(result, None)`` on success or ``(None, error message)``.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        precision = getcontext().prec
+        engine = current_engine()
+        pending: Deque[Future] = deque()
+        iterator = iter(items)
+        while True:
+            chunk = [(operation, str(a), str(b)) for operation, a, b in itertools.islice(iterator, self.chunk_size)]
+            if not chunk:
+                break
+            pending.append(self._executor.submit(_execute_chunk, precision, engine, chunk))
+            if len(pending) >= 2 * self.workers:
+                yield from self._decode(pending.popleft())
+        while pending:
+            yield from self._decode(pending.popleft())
+
+    @staticmethod
+    def _decode(future: Future) -> Iterator[Outcome]:
+        """Yield the outcomes of a finished chunk, converting results back to Decimal."""
+        for result, error in future.result():
+            yield (Decimal(result) if result is not None else None, error)
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self) -> 'ProcessPoolBackend':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
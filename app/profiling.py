@@ -0,0 +1,162 @@
+########################
+# Profiling             #
+########################
+
+"""
+Opt-in CPU and memory profiling of a calculator session.
+
+CPU profiles are collected with cProfile and written as ``.prof`` files
+readable by pstats, snakeviz and similar tools. Memory profiles are taken
+with tracemalloc and written as text reports of the top-N allocation sites,
+together with the sites that grew most since profiling started.
+"""
+
+import cProfile
+from contextlib import contextmanager
+import datetime
+from pathlib import Path
+import tracemalloc
+from typing import Iterator, List, Optional
+
+PROFILE_MODES = ('cpu', 'mem')
+
+# Stack frames kept per allocation. Reports group allocations by line, which
+# needs one frame; every extra frame multiplies the cost of taking and
+# comparing snapshots, which hold a trace per live allocation.
+_TRACE_FRAMES = 1
+
+
+class Profiler:
+    """
+    Starts, stops and dumps one CPU or memory profile.
+
+    cProfile only sees the thread that started it, so CPU profiles cover the
+    REPL loop or stream evaluation, not observer or auto-save threads.
+    tracemalloc sees allocations from every thread.
+    """
+
+    def __init__(self, mode: str, output_dir: Path, top: int = 25):
+        """
+        Initialize the profiler.
+
+        Args:
+            mode (str): 'cpu' (cProfile) or 'mem' (tracemalloc).
+            output_dir (Path): Directory the profiles are written to.
+            top (int, optional): Number of allocation sites in memory reports.
+
+        Raises:
+            ValueError: If the mode is unknown or top is not positive.
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        if top <= 0:
+            raise ValueError("top must be positive")
+        self.mode = mode
+        self.output_dir = Path(output_dir)
+        self.top = top
+        self._profile: Optional[cProfile.Profile] = None
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self.active = False
+
+    def start(self) -> None:
+        """
+        Start collecting a new profile.
+
+        Raises:
+            RuntimeError: If the profiler is already running, or tracemalloc
+                was started by someone else.
+        """
+        if self.active:
+            raise RuntimeError("Profiler is already running")
+        if self.mode == 'cpu':
+            if self._profile is None:
+                self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            if tracemalloc.is_tracing():
+                raise RuntimeError("tracemalloc is already tracing")
+            tracemalloc.start(_TRACE_FRAMES)
+            self._baseline = tracemalloc.take_snapshot()
+        self.active = True
+
+    def stop(self) -> Path:
+        """
+        Stop collecting and write the profile.
+
+        Returns:
+            Path: The file written.
+
+        Raises:
+            RuntimeError: If the profiler is not running.
+        """
+        path = self.dump()
+        if self.mode == 'cpu':
+            self._profile.disable()
+            self._profile = None
+        else:
+            tracemalloc.stop()
+            self._baseline = None
+        self.active = False
+        return path
+
+    def dump(self) -> Path:
+        """
+        Write what has been collected so far and keep profiling.
+
+        Returns:
+            Path: The file written: ``profile-<timestamp>.prof`` in cpu mode,
+            ``memory-<timestamp>.txt`` in mem mode.
+
+        Raises:
+            RuntimeError: If the profiler is not running.
+        """
+        if not self.active:
+            raise RuntimeError("Profiler is not running")
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        if self.mode == 'cpu':
+            path = self.output_dir / f"profile-{stamp}.prof"
+            self._profile.dump_stats(str(path))
+        else:
+            path = self.output_dir / f"memory-{stamp}.txt"
+            path.write_text("\n".join(self.memory_report()) + "\n", encoding='utf-8')
+        return path
+
+    def memory_report(self) -> List[str]:
+        """Return the lines of a memory report: top allocation sites, then top growth."""
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [
+            f"Traced memory: current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB",
+            "",
+            f"Top {self.top} allocation sites:",
+        ]
+        lines += [str(stat) for stat in snapshot.statistics('lineno')[:self.top]]
+        lines += ["", f"Top {self.top} growth since profiling started:"]
+        lines += [str(stat) for stat in snapshot.compare_to(self._baseline, 'lineno')[:self.top]]
+        return lines
+
+
+@contextmanager
+def profiled(mode: str, output_dir: Path, top: int = 25) -> Iterator[Optional[Profiler]]:
+    """
+    Profile the enclosed block when a mode is configured.
+
+    Args:
+        mode (str): 'off', 'cpu' or 'mem'.
+        output_dir (Path): Directory the profile is written to on exit.
+        top (int, optional): Number of allocation sites in memory reports.
+
+    Yields:
+        Optional[Profiler]: The running profiler, or None when mode is 'off'.
+    """
+    if mode == 'off':
+        yield None
+        return
+    profiler = Profiler(mode, output_dir, top)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        if profiler.active:
+            profiler.stop()
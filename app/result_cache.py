@@ -0,0 +1,184 @@
+########################
+# Result Cache          #
+########################
+
+from collections import OrderedDict
+from decimal import Decimal, InvalidOperation
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from app.decimal_math import EXACT_CONTEXT
+from app.operations import Operation
+
+# Cache key: operation name and normalized operands
+CacheKey = Tuple[str, Decimal, Decimal]
+
+CACHE_FILE_VERSION = 1
+
+
+class ResultCache:
+    """
+    Bounded LRU cache of operation results.
+
+    Keys are the operation name with its operands normalized, so equal values
+    written differently (``2``, ``2.0``, ``2E0``) share one entry. When the cache
+    is full, the least recently used entry is evicted. Hits, misses and
+    evictions are counted.
+
+    Results depend on the engine settings (precision and Power/Root mode), so
+    every cache is tied to the ``settings`` it was filled with; see
+    ensure_settings.
+    """
+
+    def __init__(self, max_size: int, settings: Optional[Dict[str, Any]] = None):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_size (int): Maximum number of entries.
+            settings (Optional[Dict[str, Any]], optional): Engine settings the
+                cached results were computed with.
+        """
+        self.max_size = max_size
+        self.settings = settings or {}
+        self._entries: 'OrderedDict[CacheKey, Decimal]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(operation: str, a: Decimal, b: Decimal) -> CacheKey:
+        """Return the cache key for an operation name and its operands."""
+        # Normalize exactly; the context precision must not round the operands
+        return (operation, a.normalize(EXACT_CONTEXT), b.normalize(EXACT_CONTEXT))
+
+    def get(self, key: CacheKey) -> Optional[Decimal]:
+        """
+        Return the cached result for a key, or None on a miss.
+
+        A hit marks the entry as most recently used.
+        """
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key: CacheKey, result: Decimal) -> None:
+        """Store a result, evicting the least recently used entry if the cache is full."""
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def ensure_settings(self, settings: Dict[str, Any]) -> None:
+        """Drop every entry if the cache was filled with different engine settings."""
+        if settings != self.settings:
+            if self._entries:
+                logging.info("Result cache cleared after engine settings changed")
+            self._entries.clear()
+            self.settings = dict(settings)
+
+    def clear(self) -> None:
+        """Remove every entry. The counters are kept."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit, miss and eviction counters with the current size."""
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def save(self, path: Path) -> None:
+        """
+        Write the cache to a JSON file, least recently used entry first.
+
+        The file is replaced atomically, so an interrupted save leaves the
+        previous cache intact.
+
+        Args:
+            path (Path): Destination file.
+        """
+        data = {
+            'version': CACHE_FILE_VERSION,
+            'settings': self.settings,
+            'entries': [[op, str(a), str(b), str(result)] for (op, a, b), result in self._entries.items()],
+        }
+        temp_path = path.with_name(path.name + '.tmp')
+        temp_path.write_text(json.dumps(data), encoding='utf-8')
+        os.replace(temp_path, path)
+        logging.info("Result cache saved to %s", path)
+
+    def load(self, path: Path) -> None:
+        """
+        Fill the cache from a file written by save.
+
+        The file is ignored if it is missing, unreadable, or was written with
+        different engine settings. Only the most recently used ``max_size``
+        entries are kept.
+
+        Args:
+            path (Path): Source file.
+        """
+        if not path.exists():
+            return
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+            if data.get('version') != CACHE_FILE_VERSION or data.get('settings') != self.settings:
+                logging.info("Saved result cache ignored: written with different settings")
+                return
+            for op, a, b, result in data['entries'][-self.max_size:]:
+                self._entries[(op, Decimal(a), Decimal(b))] = Decimal(result)
+        except (OSError, ValueError, KeyError, TypeError, InvalidOperation) as e:
+            logging.warning("Could not load result cache from %s: %s", path, e)
+            self._entries.clear()
+            return
+        logging.info("Loaded %s cached results from %s", len(self._entries), path)
+
+
+class CachedOperation(Operation):
+    """
+    Decorator memoizing the results of another operation in a ResultCache.
+
+    Only successful results are cached; operands the operation rejects raise
+    on every call.
+    """
+
+    def __init__(self, operation: Operation, cache: ResultCache):
+        """
+        Wrap an operation.
+
+        Args:
+            operation (Operation): The operation computing uncached results.
+            cache (ResultCache): The cache shared by all wrapped operations.
+        """
+        self.operation = operation
+        self.cache = cache
+        self.name = str(operation)
+
+    def execute(self, a: Decimal, b: Decimal) -> Decimal:
+        key = ResultCache.key(self.name, a, b)
+        result = self.cache.get(key)
+        if result is None:
+            result = self.operation.execute(a, b)
+            self.cache.put(key, result)
+        return result
+
+    def __str__(self) -> str:
+        return self.name
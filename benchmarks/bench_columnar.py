@@ -0,0 +1,67 @@
+########################
+# Columnar Benchmark    #
+########################
+
+"""
+Measure the throughput of --map over a generated CSV file.
+
+Evaluates ``a * b + 1`` for every row in decimal and float mode, and reports
+rows per second and the peak memory traced while mapping, which depends on
+--chunk-rows rather than on --rows.
+
+Usage:
+    python -m benchmarks.bench_columnar [--rows 1000000] [--chunk-rows 100000]
+"""
+
+import argparse
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import tracemalloc
+from typing import List
+
+from app.calculator_config import CalculatorConfig
+from app.columnar import MAP_MODES, map_file
+from benchmarks.common import best_of, print_rows
+
+
+def run(rows: int, chunk_rows: int) -> List[dict]:
+    """Run the benchmark and return one result row per mode."""
+    results = []
+    with TemporaryDirectory() as temp_dir:
+        source = Path(temp_dir) / "data.csv"
+        with open(source, "w", encoding="utf-8") as file:
+            file.write("a,b\n")
+            file.writelines(f"{i % 997}.25,{i % 13}\n" for i in range(rows))
+        config = CalculatorConfig(base_dir=Path(temp_dir), auto_save=False)
+        for mode in MAP_MODES:
+            def mapped() -> None:
+                map_file("a * b + 1", source, Path(temp_dir) / f"{mode}.csv", config=config,
+                         mode=mode, chunk_rows=chunk_rows)
+
+            elapsed = best_of(mapped)
+            # Traced separately: tracemalloc slows allocation-heavy code severalfold
+            tracemalloc.start()
+            mapped()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results.append({
+                "benchmark": "columnar",
+                "mode": mode,
+                "rows": rows,
+                "chunk_rows": chunk_rows,
+                "rows_per_s": round(rows / elapsed),
+                "peak_mib": round(peak / 2**20, 1),
+            })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--chunk-rows", type=int, default=100000)
+    args = parser.parse_args()
+    print_rows(run(args.rows, args.chunk_rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+########################
+# Power/Root Benchmark  #
+########################
+
+"""
+Compare precision and latency of the Decimal Power/Root engine with the float path.
+
+For each precision, every case is timed per call and its result compared with
+a 400-digit reference; ``correct_digits`` is the number of significant digits
+that agree with it. The float path is precision-independent and limited to
+about 16 digits.
+
+Usage:
+    python -m benchmarks.bench_decimal_power [--precisions 10 50 200]
+"""
+
+import argparse
+from decimal import Decimal, localcontext
+import time
+from typing import List
+
+from app.decimal_math import decimal_power, decimal_root, engine_context, power, root
+
+REFERENCE_PRECISION = 400
+
+# (name, function, x, y)
+CASES = [
+    ("power_integral", power, Decimal("1.0001"), Decimal(1000)),
+    ("power_fractional", power, Decimal(2), Decimal("0.5")),
+    ("root_square", root, Decimal(2), Decimal(2)),
+    ("root_seventh", root, Decimal(3), Decimal(7)),
+]
+
+
+def correct_digits(value: Decimal, reference: Decimal) -> int:
+    """Return the number of leading significant digits of ``value`` that match ``reference``."""
+    if value == reference:
+        return REFERENCE_PRECISION
+    with localcontext() as context:
+        context.prec = REFERENCE_PRECISION
+        error = abs((value - reference) / reference)
+    return max(0, -error.adjusted())
+
+
+def per_call_us(func, x: Decimal, y: Decimal, repeat: int) -> float:
+    """Return the best average time per call in microseconds."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func(x, y)
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best * 1e6
+
+
+def run(precisions: List[int], repeat: int = 200) -> List[dict]:
+    """Run the benchmark and return one result row per case, mode and precision."""
+    rows = []
+    for name, func, x, y in CASES:
+        exact = decimal_power if func is power else decimal_root
+        reference = exact(x, y, REFERENCE_PRECISION)
+        with engine_context(mode="float"):
+            value = func(x, y)
+            rows.append({"benchmark": "decimal_power", "case": name, "mode": "float", "precision": "-",
+                         "us_per_call": round(per_call_us(func, x, y, repeat), 2),
+                         "correct_digits": min(correct_digits(value, reference), 17)})
+        for precision in precisions:
+            with engine_context(precision=precision):
+                value = func(x, y)
+                rows.append({"benchmark": "decimal_power", "case": name, "mode": "decimal",
+                             "precision": precision,
+                             "us_per_call": round(per_call_us(func, x, y, repeat), 2),
+                             "correct_digits": min(correct_digits(value, reference), precision)})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--precisions", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    for row in run(args.precisions, args.repeat):
+        print("  ".join(f"{key}={value}" for key, value in row.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+########################
+# Dispatch Benchmark    #
+########################
+
+"""
+Compare per-call overhead of operation lookup and Calculation.calculate.
+
+The previous OperationFactory.create_operation instantiated a new operation
+on every call, and Calculation.calculate rebuilt a dict of six lambdas on
+every call. Both are reproduced here as the legacy variants.
+
+Usage:
+    python -m benchmarks.bench_dispatch [--number 200000]
+"""
+
+import argparse
+from decimal import Decimal
+import timeit
+from typing import List
+
+from app.calculation import Calculation
+from app.decimal_math import power, root
+from app.exceptions import OperationError
+from app.operations import OperationFactory
+from benchmarks.common import print_rows
+
+
+def legacy_create_operation(operation_type: str):
+    """The previous create_operation body: look up the class and instantiate it."""
+    operation_class = OperationFactory._operations.get(operation_type.lower())
+    if not operation_class:
+        raise ValueError(f"Unknown operation: {operation_type}")
+    return operation_class()
+
+
+def legacy_calculate(calc: Calculation) -> Decimal:
+    """The previous calculate body: build the lambda dict, then dispatch by name."""
+    def fail(message):
+        raise OperationError(message)
+
+    operations = {
+        "Addition": lambda x, y: x + y,
+        "Subtraction": lambda x, y: x - y,
+        "Multiplication": lambda x, y: x * y,
+        "Division": lambda x, y: x / y if y != 0 else fail("Division by zero is not allowed"),
+        "Power": lambda x, y: power(x, y) if y >= 0 else fail("Negative exponents are not supported"),
+        "Root": lambda x, y: root(x, y) if x >= 0 and y != 0 else fail("Invalid root operation"),
+    }
+    op = operations.get(calc.operation)
+    if not op:
+        raise OperationError(f"Unknown operation: {calc.operation}")
+    return op(calc.operand1, calc.operand2)
+
+
+def run(number: int) -> List[dict]:
+    """Run the benchmark and return one result row per variant."""
+    calc = Calculation("Addition", Decimal(2), Decimal(3))
+    variants = [
+        ("create_operation", "legacy", lambda: legacy_create_operation("add")),
+        ("create_operation", "flyweight", lambda: OperationFactory.create_operation("add")),
+        ("calculate", "legacy", lambda: legacy_calculate(calc)),
+        ("calculate", "dispatch_table", calc.calculate),
+    ]
+    rows = []
+    baseline = {}
+    for name, variant, func in variants:
+        seconds = min(timeit.repeat(func, number=number, repeat=3))
+        ns_per_call = seconds / number * 1e9
+        baseline.setdefault(name, ns_per_call)
+        rows.append({"benchmark": "dispatch", "call": name, "variant": variant,
+                     "ns_per_call": round(ns_per_call, 1),
+                     "speedup": round(baseline[name] / ns_per_call, 2)})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args()
+    print_rows(run(args.number))
+
+
+if __name__ == "__main__":
+    main()
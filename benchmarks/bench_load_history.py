@@ -0,0 +1,77 @@
+########################
+# History Load Benchmark #
+########################
+
+"""
+Compare the bulk CSV history loader with the previous row-by-row loader.
+
+The previous loader iterated the DataFrame with iterrows() and rebuilt every
+row through Calculation.from_dict, recomputing each result. The bulk loader
+parses whole columns and can trust the stored result column.
+
+Usage:
+    python -m benchmarks.bench_load_history [--sizes 1000 100000]
+"""
+
+import argparse
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List
+
+import pandas as pd
+
+from app.calculation import Calculation
+from benchmarks.common import best_of, make_calculator, print_rows, write_history_csv
+
+
+def legacy_load(path: Path) -> List[Calculation]:
+    """The previous load_history body: read_csv, then iterrows and from_dict per row."""
+    df = pd.read_csv(path)
+    return [
+        Calculation.from_dict({
+            'operation': row['operation'],
+            'operand1': row['operand1'],
+            'operand2': row['operand2'],
+            'result': row['result'],
+            'timestamp': row['timestamp']
+        })
+        for _, row in df.iterrows()
+    ]
+
+
+def run(sizes: List[int], repeat: int = 3) -> List[dict]:
+    """Run the benchmark and return one result row per loader and size."""
+    rows = []
+    for size in sizes:
+        with TemporaryDirectory() as temp_dir:
+            calc = make_calculator(Path(temp_dir), max_history_size=size)
+            path = calc.config.history_file
+            write_history_csv(path, size)
+
+            timings = {"legacy_iterrows": best_of(lambda: legacy_load(path), repeat)}
+            calc.config.trust_history_results = False
+            timings["bulk_recompute"] = best_of(calc.load_history, repeat)
+            calc.config.trust_history_results = True
+            timings["bulk_trusted"] = best_of(calc.load_history, repeat)
+
+        for loader, seconds in timings.items():
+            rows.append({
+                "benchmark": "load_history",
+                "loader": loader,
+                "entries": size,
+                "seconds": round(seconds, 4),
+                "speedup": round(timings["legacy_iterrows"] / seconds, 1),
+            })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print_rows(run(args.sizes, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+########################
+# Logging Benchmark     #
+########################
+
+"""
+Measure the per-calculation cost of logging.
+
+Every variant performs the same additions with a logging observer attached:
+
+- ``legacy``: a synchronous FileHandler installed with basicConfig, and the
+  message built with an f-string before the call, as the calculator used to;
+- ``queue``: the queue-based pipeline with lazy ``%``-style arguments;
+- ``queue_sampled``: the same with only ``--sample-rate`` of calculations logged;
+- ``none``: no logging observer, the baseline for ``overhead_us``.
+
+Usage:
+    python -m benchmarks.bench_logging [--calls 20000] [--sample-rate 0.1]
+"""
+
+import argparse
+import logging
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import time
+from typing import List
+
+from app.history import HistoryObserver, LoggingObserver
+from app.logging_setup import LOG_FORMAT, shutdown_logging
+from app.operations import OperationFactory
+from benchmarks.common import make_calculator, print_rows
+
+
+class LegacyLoggingObserver(HistoryObserver):
+    """The previous LoggingObserver: formats the message eagerly."""
+
+    def update(self, calculation) -> None:
+        logging.info(
+            f"Calculation performed: {calculation.operation} "
+            f"({calculation.operand1}, {calculation.operand2}) = "
+            f"{calculation.result}"
+        )
+
+
+def time_calls(base_dir: Path, variant: str, calls: int, sample_rate: float) -> float:
+    """Return the mean seconds per perform_operation call for one variant."""
+    calc = make_calculator(base_dir)
+    if variant == "legacy":
+        shutdown_logging()
+        logging.basicConfig(filename=str(calc.config.log_file), level=logging.INFO,
+                            format=LOG_FORMAT, force=True)
+        calc.add_observer(LegacyLoggingObserver())
+    elif variant == "queue":
+        calc.add_observer(LoggingObserver())
+    elif variant == "queue_sampled":
+        calc.add_observer(LoggingObserver(sample_rate))
+    calc.set_operation(OperationFactory.create_operation("add"))
+
+    start = time.perf_counter()
+    for i in range(calls):
+        calc.perform_operation(i, 1)
+    elapsed = time.perf_counter() - start
+
+    # Write what is still queued so the next variant starts from an idle listener
+    shutdown_logging()
+    logging.basicConfig(force=True, handlers=[logging.NullHandler()])
+    return elapsed / calls
+
+
+def run(calls: int, sample_rate: float) -> List[dict]:
+    """Run the benchmark and return one result row per variant."""
+    rows = []
+    with TemporaryDirectory() as temp_dir:
+        baseline = time_calls(Path(temp_dir) / "none", "none", calls, sample_rate)
+        for variant in ("none", "legacy", "queue", "queue_sampled"):
+            mean = baseline if variant == "none" else time_calls(
+                Path(temp_dir) / variant, variant, calls, sample_rate
+            )
+            rows.append({
+                "benchmark": "logging",
+                "variant": variant,
+                "calls": calls,
+                "mean_us": round(mean * 1e6, 2),
+                "overhead_us": round((mean - baseline) * 1e6, 2),
+            })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    args = parser.parse_args()
+    print_rows(run(args.calls, args.sample_rate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+########################
+# Memory Benchmark      #
+########################
+
+"""
+Measure the memory cost of history entries.
+
+Builds N calculations with distinct operands and reports the traced bytes per
+entry for the compact Calculation and for the previous dataclass layout.
+
+Usage:
+    python -m benchmarks.bench_memory [--sizes 10000 1000000]
+"""
+
+import argparse
+from dataclasses import dataclass, field
+import datetime
+from decimal import Decimal
+import gc
+import tracemalloc
+from typing import Callable, List
+
+from app.calculation import Calculation
+
+
+@dataclass
+class LegacyCalculation:
+    """The previous Calculation layout: a plain dataclass with a per-instance __dict__."""
+
+    operation: str
+    operand1: Decimal
+    operand2: Decimal
+    result: Decimal = field(init=False)
+    timestamp: datetime.datetime = field(default_factory=datetime.datetime.now)
+
+    def __post_init__(self):
+        self.result = self.operand1 + self.operand2
+
+
+def bytes_per_entry(factory: Callable[[str, Decimal, Decimal], object], size: int) -> float:
+    """
+    Return the traced bytes per entry for a history of ``size`` calculations.
+
+    Operands are created up front so every layout pays for the same Decimals
+    only once; the result Decimal is part of each entry.
+    """
+    operands = [(Decimal(i), Decimal(i + 1)) for i in range(size)]
+    gc.collect()
+    tracemalloc.start()
+    entries: List[object] = [factory("Addition", a, b) for a, b in operands]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entries
+    return current / size
+
+
+def run(sizes: List[int]) -> List[dict]:
+    """Run the benchmark and return one result row per layout and size."""
+    rows = []
+    for size in sizes:
+        for name, factory in (("legacy_dataclass", LegacyCalculation), ("compact_slots", Calculation)):
+            rows.append({
+                "benchmark": "history_memory",
+                "layout": name,
+                "entries": size,
+                "bytes_per_entry": round(bytes_per_entry(factory, size), 1),
+            })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000])
+    args = parser.parse_args()
+    for row in run(args.sizes):
+        print(f"{row['layout']:>18} {row['entries']:>9} entries: {row['bytes_per_entry']:8.1f} bytes/entry")
+
+
+if __name__ == "__main__":
+    main()
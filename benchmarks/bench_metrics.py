@@ -0,0 +1,57 @@
+########################
+# Metrics Benchmark     #
+########################
+
+"""
+Measure the cost of stage instrumentation on perform_operation.
+
+Runs the same additions with metrics disabled and enabled; ``overhead_us``
+is the difference per call.
+
+Usage:
+    python -m benchmarks.bench_metrics [--calls 20000]
+"""
+
+import argparse
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List
+
+from app.operations import OperationFactory
+from benchmarks.common import best_of, make_calculator, print_rows
+
+
+def run(calls: int) -> List[dict]:
+    """Run the benchmark and return one result row per setting."""
+    rows = []
+    baseline = None
+    for enabled in (False, True):
+        with TemporaryDirectory() as temp_dir:
+            calc = make_calculator(Path(temp_dir), metrics=enabled)
+            calc.set_operation(OperationFactory.create_operation("add"))
+
+            def perform() -> None:
+                for i in range(calls):
+                    calc.perform_operation(i, 1)
+
+            mean = best_of(perform) / calls
+        baseline = mean if baseline is None else baseline
+        rows.append({
+            "benchmark": "metrics",
+            "enabled": enabled,
+            "calls": calls,
+            "mean_us": round(mean * 1e6, 2),
+            "overhead_us": round((mean - baseline) * 1e6, 2),
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+    print_rows(run(args.calls))
+
+
+if __name__ == "__main__":
+    main()
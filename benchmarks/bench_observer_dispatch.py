@@ -0,0 +1,94 @@
+########################
+# Observer Dispatch Benchmark #
+########################
+
+"""
+Measure calculation latency with a slow observer, synchronous vs asynchronous dispatch.
+
+The observer sleeps ``--observer-ms`` per notification, standing in for a disk
+auto-save. In sync mode that time is part of every perform_operation call; in
+async mode the call only queues the notification. ``drain_ms`` is the time
+flush() then takes to deliver what is still queued.
+
+Usage:
+    python -m benchmarks.bench_observer_dispatch [--calls 200] [--observer-ms 1]
+"""
+
+import argparse
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import time
+from typing import List
+
+from app.history import HistoryObserver
+from app.operations import OperationFactory
+from benchmarks.common import make_calculator, print_rows
+
+# (dispatch mode, overflow policy)
+VARIANTS = [
+    ("sync", "block"),
+    ("async", "block"),
+    ("async", "drop_oldest"),
+    ("async", "coalesce"),
+]
+
+
+class SlowObserver(HistoryObserver):
+    """Observer that sleeps for a fixed time per notification."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def update(self, calculation) -> None:
+        time.sleep(self.seconds)
+
+    def update_batch(self, calculations) -> None:
+        time.sleep(self.seconds)
+
+
+def run(calls: int, observer_ms: float, queue_size: int) -> List[dict]:
+    """Run the benchmark and return one result row per dispatch variant."""
+    rows = []
+    for mode, overflow in VARIANTS:
+        with TemporaryDirectory() as temp_dir:
+            calc = make_calculator(Path(temp_dir), observer_dispatch=mode,
+                                   observer_overflow=overflow, observer_queue_size=queue_size)
+            calc.add_observer(SlowObserver(observer_ms / 1000))
+            calc.set_operation(OperationFactory.create_operation("add"))
+
+            latencies = []
+            for i in range(calls):
+                start = time.perf_counter()
+                calc.perform_operation(i, 1)
+                latencies.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            calc.flush()
+            drain = time.perf_counter() - start
+            stats = calc.observer_dispatcher.stats() if calc.observer_dispatcher else {}
+            calc.close()
+
+        latencies.sort()
+        rows.append({
+            "benchmark": "observer_dispatch",
+            "mode": mode,
+            "overflow": overflow if mode == "async" else "-",
+            "mean_us": round(sum(latencies) / calls * 1e6, 1),
+            "p99_us": round(latencies[int(calls * 0.99) - 1] * 1e6, 1),
+            "drain_ms": round(drain * 1000, 1),
+            "dropped": stats.get("dropped", 0),
+            "coalesced": stats.get("coalesced", 0),
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--observer-ms", type=float, default=1.0)
+    parser.add_argument("--queue-size", type=int, default=64)
+    args = parser.parse_args()
+    print_rows(run(args.calls, args.observer_ms, args.queue_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+########################
+# Parallel Benchmark    #
+########################
+
+"""
+Measure how Power/Root batch evaluation scales with worker processes.
+
+Runs the same batch in-process and on ProcessPoolBackend with 1, 2, 4, ...
+workers up to the number of CPUs, and reports the speedup over in-process
+evaluation. Scaling is bounded by the cores actually available.
+
+Usage:
+    python -m benchmarks.bench_parallel [--size 20000] [--operation power root]
+"""
+
+import argparse
+from decimal import Decimal, localcontext
+import os
+from typing import List
+
+from app.batch import evaluate_decimal, evaluate_parallel
+from app.calculator_config import CalculatorConfig
+from app.operations import OperationFactory
+from app.parallel import ProcessPoolBackend
+from benchmarks.common import best_of, print_rows
+
+
+def worker_counts(max_workers: int) -> List[int]:
+    """Return 1, 2, 4, ... up to and including ``max_workers``."""
+    counts = [1]
+    while counts[-1] * 2 < max_workers:
+        counts.append(counts[-1] * 2)
+    if max_workers > 1:
+        counts.append(max_workers)
+    return counts
+
+
+def run(size: int, operations: List[str], max_workers: int, chunk_size: int,
+        precision: int, repeat: int = 3) -> List[dict]:
+    """Run the benchmark and return one result row per operation and worker count."""
+    config = CalculatorConfig(precision=precision)
+    a_values = [Decimal(i % 997 + 2) / 7 for i in range(size)]
+    b_values = [Decimal(i % 5 + 2) for i in range(size)]
+    rows = []
+    with localcontext() as context:
+        context.prec = precision
+        for name in operations:
+            operation = OperationFactory.create_operation(name)
+            serial = best_of(lambda: evaluate_decimal(operation, a_values, b_values, config), repeat)
+            rows.append({"benchmark": "parallel", "operation": name, "backend": "in-process",
+                         "workers": 1, "size": size, "seconds": round(serial, 4), "speedup": 1.0})
+            for workers in worker_counts(max_workers):
+                with ProcessPoolBackend(workers, chunk_size) as backend:
+                    # Start the worker processes before timing
+                    list(backend.execute([(operation, Decimal(2), Decimal(2))] * workers))
+                    seconds = best_of(
+                        lambda: evaluate_parallel(operation, a_values, b_values, config, backend), repeat
+                    )
+                rows.append({"benchmark": "parallel", "operation": name, "backend": "process-pool",
+                             "workers": workers, "size": size, "seconds": round(seconds, 4),
+                             "speedup": round(serial / seconds, 2)})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=20_000)
+    parser.add_argument("--operation", nargs="+", default=["power", "root"])
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--precision", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print_rows(run(args.size, args.operation, args.max_workers, args.chunk_size, args.precision, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
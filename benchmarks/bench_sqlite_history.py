@@ -0,0 +1,87 @@
+########################
+# SQLite History Benchmark #
+########################
+
+"""
+Compare the SQLite history backend with the pandas CSV path.
+
+- bulk_write: store a whole history at once (pandas to_csv vs one INSERT transaction).
+- autosave: persist one new calculation when ``entries`` are already stored
+  (full CSV rewrite, as snapshot auto-save does, vs a single-row insert).
+- load_tail: read the newest ``--resident`` entries out of ``entries``
+  (pandas read_csv of the whole file vs an indexed LIMIT query).
+
+Usage:
+    python -m benchmarks.bench_sqlite_history [--sizes 1000 100000] [--resident 1000]
+"""
+
+import argparse
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List
+
+from app.history_csv import read_history_csv, write_history_csv
+from app.history_sqlite import SQLiteHistory
+from benchmarks.common import best_of, print_rows, sample_calculations
+
+AUTOSAVE_CALLS = 20
+
+
+def run(sizes: List[int], resident: int, repeat: int = 3) -> List[dict]:
+    """Run the benchmark and return one result row per task, backend and size."""
+    rows = []
+    for size in sizes:
+        calculations = sample_calculations(size + AUTOSAVE_CALLS)
+        stored, new = calculations[:size], calculations[size:]
+        with TemporaryDirectory() as temp_dir:
+            csv_path = Path(temp_dir) / "history.csv"
+            db_path = Path(temp_dir) / "history.db"
+
+            def sqlite_bulk_write() -> None:
+                db_path.unlink(missing_ok=True)
+                with SQLiteHistory(db_path) as store:
+                    store.append(stored)
+
+            timings = {
+                ("bulk_write", "csv"): best_of(lambda: write_history_csv(csv_path, stored), repeat),
+                ("bulk_write", "sqlite"): best_of(sqlite_bulk_write, repeat),
+            }
+
+            # One auto-save per new calculation, averaged over AUTOSAVE_CALLS calls
+            def csv_autosave() -> None:
+                for i in range(1, AUTOSAVE_CALLS + 1):
+                    write_history_csv(csv_path, stored + new[:i])
+
+            with SQLiteHistory(db_path) as store:
+                def sqlite_autosave() -> None:
+                    for calc in new:
+                        store.append([calc])
+
+                timings[("autosave", "csv")] = best_of(csv_autosave, 1) / AUTOSAVE_CALLS
+                timings[("autosave", "sqlite")] = best_of(sqlite_autosave, 1) / AUTOSAVE_CALLS
+                timings[("load_tail", "csv")] = best_of(lambda: read_history_csv(csv_path, resident), repeat)
+                timings[("load_tail", "sqlite")] = best_of(lambda: store.tail(resident), repeat)
+
+        for (task, backend), seconds in timings.items():
+            rows.append({
+                "benchmark": "sqlite_history",
+                "task": task,
+                "backend": backend,
+                "entries": size,
+                "ms": round(seconds * 1000, 3),
+                "speedup": round(timings[(task, "csv")] / seconds, 1),
+            })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--resident", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print_rows(run(args.sizes, args.resident, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+########################
+# Startup Benchmark     #
+########################
+
+"""
+Measure REPL startup: import time and wall-clock time to the first prompt.
+
+Import time is read from ``python -X importtime``; time to first prompt is
+measured by launching ``main.py`` with piped stdin and waiting for the
+"Enter command:" prompt. Logs and history go to a temporary directory.
+
+Usage:
+    python -m benchmarks.bench_startup [--repeat 5] [--budget-ms 500]
+
+With --budget-ms, the exit status is 1 if the median time to first prompt
+exceeds the budget.
+"""
+
+import argparse
+import os
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+import time
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+PROMPT = b"Enter command:"
+
+
+def isolated_env(base_dir: Path) -> Dict[str, str]:
+    """Return an environment that points logs and history at ``base_dir``."""
+    env = dict(os.environ)
+    env.update({
+        "CALCULATOR_LOG_DIR": str(base_dir / "logs"),
+        "CALCULATOR_HISTORY_DIR": str(base_dir / "history"),
+        "PYTHONPATH": str(PROJECT_ROOT),
+    })
+    return env
+
+
+def import_times(module: str = "app.calculator_repl", top: int = 5) -> Tuple[float, List[Tuple[str, float]]]:
+    """
+    Return the cumulative import time of ``module`` and its slowest imports, in ms.
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    ).stderr
+    cumulative = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        if cumulative_us.strip().isdigit():
+            cumulative[name.strip()] = int(cumulative_us) / 1000
+    slowest = sorted(
+        ((name, ms) for name, ms in cumulative.items() if name != module),
+        key=lambda item: item[1], reverse=True
+    )[:top]
+    return cumulative.get(module, 0.0), slowest
+
+
+def time_to_first_prompt(base_dir: Path) -> float:
+    """Launch the REPL and return the seconds until the first prompt is printed."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-u", "main.py"], cwd=PROJECT_ROOT, env=isolated_env(base_dir),
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    output = b""
+    while PROMPT not in output:
+        chunk = os.read(process.stdout.fileno(), 4096)
+        if not chunk:
+            raise RuntimeError("REPL exited before showing a prompt")
+        output += chunk
+    elapsed = time.perf_counter() - start
+    process.communicate(b"exit\n", timeout=30)
+    return elapsed
+
+
+def run(repeat: int = 5) -> List[dict]:
+    """Run the benchmark and return result rows."""
+    import_ms, slowest = import_times()
+    with TemporaryDirectory() as temp_dir:
+        samples = [time_to_first_prompt(Path(temp_dir)) for _ in range(repeat)]
+    rows = [{
+        "benchmark": "startup",
+        "metric": "import_app_calculator_repl_ms",
+        "value": round(import_ms, 1),
+    }, {
+        "benchmark": "startup",
+        "metric": "time_to_first_prompt_ms",
+        "value": round(statistics.median(samples) * 1000, 1),
+    }]
+    rows.extend(
+        {"benchmark": "startup", "metric": f"import_{name}_ms", "value": round(ms, 1)}
+        for name, ms in slowest
+    )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+    rows = run(args.repeat)
+    for row in rows:
+        print(f"{row['metric']:>40}: {row['value']:8.1f}")
+    first_prompt = rows[1]["value"]
+    if args.budget_ms is not None and first_prompt > args.budget_ms:
+        print(f"Time to first prompt {first_prompt} ms exceeds budget of {args.budget_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+########################
+# Benchmark Helpers     #
+########################
+
+"""Shared helpers for the standalone benchmark scripts."""
+
+import datetime
+from decimal import Decimal
+import os
+from pathlib import Path
+import time
+from typing import Any, Callable, Dict, List
+
+from app.calculation import Calculation
+
+# Environment variables that would redirect benchmark files into the project tree
+_PATH_ENV_VARS = (
+    'CALCULATOR_BASE_DIR', 'CALCULATOR_LOG_DIR', 'CALCULATOR_LOG_FILE',
+    'CALCULATOR_HISTORY_DIR', 'CALCULATOR_HISTORY_FILE',
+)
+
+
+def make_calculator(base_dir: Path, **config_options: Any):
+    """
+    Create a Calculator whose logs and history live under ``base_dir``.
+
+    Auto-save is disabled unless requested, so benchmarks measure only what they time.
+    """
+    from app.calculator import Calculator
+    from app.calculator_config import CalculatorConfig
+
+    for name in _PATH_ENV_VARS:
+        os.environ.pop(name, None)
+    config_options.setdefault('auto_save', False)
+    return Calculator(config=CalculatorConfig(base_dir=Path(base_dir), **config_options))
+
+
+def sample_calculations(count: int) -> List[Calculation]:
+    """Return ``count`` distinct Addition calculations with increasing timestamps."""
+    start = datetime.datetime(2024, 1, 1)
+    return [
+        Calculation(
+            "Addition", Decimal(i), Decimal("0.5"),
+            timestamp=start + datetime.timedelta(milliseconds=i),
+            result=Decimal(i) + Decimal("0.5")
+        )
+        for i in range(count)
+    ]
+
+
+def write_history_csv(path: Path, count: int) -> None:
+    """Write a history CSV file with ``count`` rows in the format used by save_history."""
+    import pandas as pd
+
+    pd.DataFrame([calc.to_dict() for calc in sample_calculations(count)]).to_csv(path, index=False)
+
+
+def best_of(func: Callable[[], Any], repeat: int = 3) -> float:
+    """Return the fastest wall-clock time in seconds over ``repeat`` runs of ``func``."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def print_rows(rows: List[Dict[str, Any]]) -> None:
+    """Print benchmark result rows as aligned key=value lines."""
+    for row in rows:
+        print("  ".join(f"{key}={value}" for key, value in row.items()))
@@ -0,0 +1,242 @@
+########################
+# Benchmark Suite       #
+########################
+
+"""
+Time the calculator's hot paths and compare the results with a baseline.
+
+Cases (select some with --only):
+
+- ``perform_operation``: one call per operation, in microseconds;
+- ``history_io``: save_history and load_history at each of --sizes entries,
+  for each of --formats, in milliseconds;
+- ``undo_redo``: undo, then redo, a --depth deep undo stack, microseconds per step;
+- ``dataframe``: get_history_dataframe at each of --sizes entries, in milliseconds;
+- ``startup``: wall-clock time from launching main.py to the first prompt;
+- ``repl``: milliseconds per calculation typed into the REPL from a scripted stdin.
+
+Every figure is a time, so lower is better. Results are written as JSON with
+--output. With --compare, every result that is more than --threshold slower
+than the same result in the baseline file is reported as a regression, and
+the exit status is 1. Everything runs offline; files go to a temporary directory.
+
+Usage:
+    python -m benchmarks.suite [--only perform_operation history_io] [--sizes 1000 100000 1000000]
+                               [--output results.json] [--compare baseline.json] [--threshold 0.1]
+"""
+
+import argparse
+import datetime
+import json
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+import time
+from typing import Any, Dict, List
+
+from app.history_buffer import HistoryBuffer
+from app.operations import OperationFactory
+from benchmarks.bench_startup import PROJECT_ROOT, isolated_env, time_to_first_prompt
+from benchmarks.common import best_of, make_calculator, print_rows, sample_calculations
+
+CASES = ('perform_operation', 'history_io', 'undo_redo', 'dataframe', 'startup', 'repl')
+
+# Operand pairs valid for every operation, including Root
+OPERANDS = [(str(a), str(b)) for a, b in ((12.5, 3), (1024, 2), (7, 0.5), (99.99, 4))]
+
+
+def result(name: str, value: float, unit: str) -> Dict[str, Any]:
+    """Return a result row."""
+    return {"name": name, "value": round(value, 3), "unit": unit}
+
+
+def bench_perform_operation(calls: int) -> List[dict]:
+    """Time perform_operation for every operation registered in the factory."""
+    rows = []
+    with TemporaryDirectory() as temp_dir:
+        calc = make_calculator(Path(temp_dir), max_history_size=calls)
+        for name in OperationFactory._operations:
+            calc.set_operation(OperationFactory.create_operation(name))
+
+            def perform() -> None:
+                for i in range(calls):
+                    a, b = OPERANDS[i % len(OPERANDS)]
+                    calc.perform_operation(a, b)
+
+            rows.append(result(f"perform_operation.{name}", best_of(perform) / calls * 1e6, "us"))
+    return rows
+
+
+def bench_history_io(sizes: List[int], formats: List[str]) -> List[dict]:
+    """Time save_history and load_history of a full history."""
+    rows = []
+    for history_format in formats:
+        for size in sizes:
+            with TemporaryDirectory() as temp_dir:
+                calc = make_calculator(Path(temp_dir), max_history_size=size, history_format=history_format)
+                calc.history = HistoryBuffer(size, sample_calculations(size))
+                rows.append(result(f"save_history.{history_format}.{size}",
+                                   best_of(calc.save_history) * 1000, "ms"))
+                rows.append(result(f"load_history.{history_format}.{size}",
+                                   best_of(calc.load_history) * 1000, "ms"))
+                calc.close()
+    return rows
+
+
+def bench_undo_redo(depth: int) -> List[dict]:
+    """Time undoing and redoing ``depth`` calculations, per step."""
+    with TemporaryDirectory() as temp_dir:
+        calc = make_calculator(Path(temp_dir), max_history_size=depth)
+        calc.set_operation(OperationFactory.create_operation("add"))
+        for i in range(depth):
+            calc.perform_operation(i, 1)
+
+        start = time.perf_counter()
+        while calc.undo():
+            pass
+        undo = time.perf_counter() - start
+        start = time.perf_counter()
+        while calc.redo():
+            pass
+        redo = time.perf_counter() - start
+    return [
+        result(f"undo.{depth}", undo / depth * 1e6, "us"),
+        result(f"redo.{depth}", redo / depth * 1e6, "us"),
+    ]
+
+
+def bench_dataframe(sizes: List[int]) -> List[dict]:
+    """Time get_history_dataframe of a full history."""
+    rows = []
+    for size in sizes:
+        with TemporaryDirectory() as temp_dir:
+            calc = make_calculator(Path(temp_dir), max_history_size=size)
+            calc.history = HistoryBuffer(size, sample_calculations(size))
+            rows.append(result(f"get_history_dataframe.{size}",
+                               best_of(calc.get_history_dataframe) * 1000, "ms"))
+    return rows
+
+
+def bench_startup(repeat: int) -> List[dict]:
+    """Time launching the REPL until its first prompt."""
+    with TemporaryDirectory() as temp_dir:
+        samples = [time_to_first_prompt(Path(temp_dir)) for _ in range(repeat)]
+    return [result("startup.time_to_first_prompt", statistics.median(samples) * 1000, "ms")]
+
+
+def run_repl_script(base_dir: Path, script: str) -> float:
+    """Run the REPL on a scripted stdin and return the seconds until it exits."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "main.py"], cwd=PROJECT_ROOT, env=isolated_env(base_dir), input=script.encode(),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True, timeout=600
+    )
+    return time.perf_counter() - start
+
+
+def bench_repl(commands: int, repeat: int) -> List[dict]:
+    """
+    Time calculations typed into the REPL, per command.
+
+    The run with ``commands`` calculations is compared with a run that exits
+    immediately, so startup and shutdown are not part of the figure.
+    """
+    script = "".join(f"add\n{i}\n2\n" for i in range(commands)) + "history\nexit\n"
+    with TemporaryDirectory() as temp_dir:
+        empty = statistics.median(run_repl_script(Path(temp_dir) / "empty", "exit\n") for _ in range(repeat))
+        full = statistics.median(run_repl_script(Path(temp_dir) / f"run{i}", script) for i in range(repeat))
+    return [result("repl.command", (full - empty) / commands * 1000, "ms")]
+
+
+def run(args: argparse.Namespace) -> List[dict]:
+    """Run the selected cases and return their result rows."""
+    rows: List[dict] = []
+    for case in args.only:
+        if case == 'perform_operation':
+            rows += bench_perform_operation(args.calls)
+        elif case == 'history_io':
+            rows += bench_history_io(args.sizes, args.formats)
+        elif case == 'undo_redo':
+            rows += bench_undo_redo(args.depth)
+        elif case == 'dataframe':
+            rows += bench_dataframe(args.sizes)
+        elif case == 'startup':
+            rows += bench_startup(args.repeat)
+        else:
+            rows += bench_repl(args.repl_commands, args.repeat)
+    return rows
+
+
+def compare(rows: List[dict], baseline: Dict[str, Any], threshold: float) -> List[dict]:
+    """
+    Compare results with a baseline written by --output.
+
+    Args:
+        rows (List[dict]): The current results.
+        baseline (Dict[str, Any]): The parsed baseline file.
+        threshold (float): Relative slowdown above which a result regresses, e.g. 0.1.
+
+    Returns:
+        List[dict]: One row per result found in both runs, with the baseline
+        value, the relative change and a status of ``ok``, ``faster`` or ``REGRESSION``.
+    """
+    previous = {row["name"]: row["value"] for row in baseline["results"]}
+    comparison = []
+    for row in rows:
+        before = previous.get(row["name"])
+        if not before:
+            continue
+        change = row["value"] / before - 1
+        status = "REGRESSION" if change > threshold else "faster" if change < -threshold else "ok"
+        comparison.append({
+            "name": row["name"],
+            "baseline": before,
+            "current": row["value"],
+            "unit": row["unit"],
+            "change": f"{change:+.1%}",
+            "status": status,
+        })
+    return comparison
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--calls", type=int, default=2000, help="perform_operation calls per operation")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--formats", nargs="+", choices=["csv", "binary", "sqlite"], default=["csv"])
+    parser.add_argument("--depth", type=int, default=10000, help="undo/redo stack depth")
+    parser.add_argument("--repl-commands", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3, help="runs of each subprocess case")
+    parser.add_argument("--output", type=Path, help="write the results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="baseline JSON file written by --output")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown reported as a regression (default: 0.10)")
+    args = parser.parse_args()
+
+    rows = run(args)
+    print_rows(rows)
+
+    if args.output:
+        args.output.write_text(json.dumps({
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": rows,
+        }, indent=2) + "\n")
+
+    if args.compare:
+        comparison = compare(rows, json.loads(args.compare.read_text()), args.threshold)
+        print()
+        print_rows(comparison)
+        regressions = [row["name"] for row in comparison if row["status"] == "REGRESSION"]
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,84 @@
 
+import argparse
+import sys
+
 from app.calculator_repl import calculator_repl
 
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line options; without options the interactive REPL starts."""
+    parser = argparse.ArgumentParser(description="REPL calculator")
+    parser.add_argument("--stream", action="store_true",
+                        help="evaluate '<operation> <a> <b>' lines from stdin or --input non-interactively; "
+                             "exits with status 1 if any line fails")
+    parser.add_argument("--input", help="read stream commands from this file instead of stdin")
+    parser.add_argument("--format", choices=["plain", "csv", "jsonl"], default="plain",
+                        help="stream output format")
+    parser.add_argument("--flush", action="store_true", help="flush stream output after every line")
+    parser.add_argument("--history", choices=["off", "sampled", "full"], default="off",
+                        help="record streamed calculations in the history")
+    parser.add_argument("--sample-every", type=int, default=100,
+                        help="with --history sampled, record every N-th calculation")
+    parser.add_argument("--workers", type=int,
+                        help="evaluate the stream on this many worker processes (default: CALCULATOR_WORKERS)")
+    parser.add_argument("--chunk-size", type=int,
+                        help="commands sent to a worker process at a time (default: CALCULATOR_CHUNK_SIZE); "
+                             "with --map, rows evaluated at a time (default: 100000)")
+    parser.add_argument("--map", metavar="EXPR",
+                        help="evaluate EXPR for every row of the --in CSV file; names refer to columns")
+    parser.add_argument("--in", dest="in_path", metavar="PATH", help="CSV input of --map")
+    parser.add_argument("--out", metavar="PATH", help="CSV output of --map: the input columns and a result column")
+    parser.add_argument("--errors", metavar="PATH",
+                        help="invalid-row report of --map (default: the --out path with .errors.csv appended)")
+    parser.add_argument("--mode", choices=["decimal", "float"], default="decimal",
+                        help="--map arithmetic: exact Decimal, or NumPy float64 over whole columns")
+    parser.add_argument("--result-column", default="result", metavar="NAME",
+                        help="name of the column --map adds to the output (default: result)")
+    args = parser.parse_args(argv)
+    if args.map is not None and not (args.in_path and args.out):
+        parser.error("--map requires --in and --out")
+    return args
+
+
+def run_map(args: argparse.Namespace) -> int:
+    """Run --map and print a summary to stderr; return the exit status."""
+    from app.columnar import map_file
+    from app.exceptions import CalculatorError
+
+    try:
+        report = map_file(args.map, args.in_path, args.out, errors_path=args.errors,
+                          mode=args.mode, chunk_rows=args.chunk_size or 100_000,
+                          result_column=args.result_column)
+    except (CalculatorError, OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    errors_path = args.errors or f"{args.out}.errors.csv"
+    print(f"Mapped {report.rows} rows to {args.out}; {report.failed} invalid rows reported in {errors_path}",
+          file=sys.stderr)
+    return 0
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.map is not None:
+        return run_map(args)
+    if args.stream:
+        from app.calculator_stream import run_stream
+
+        input_stream = open(args.input, encoding="utf-8") if args.input else sys.stdin
+        try:
+            failures = run_stream(input_stream, sys.stdout, output_format=args.format, flush=args.flush,
+                                  history=args.history, sample_every=args.sample_every,
+                                  workers=args.workers, chunk_size=args.chunk_size)
+        finally:
+            if args.input:
+                input_stream.close()
+        # A non-zero status lets scripts detect lines that failed
+        return 1 if failures else 0
+    calculator_repl()
+    return 0
+
+
 #name runs program directly
 if __name__ == "__main__":
-    calculator_repl()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.calculation import Calculation
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.operations import OperationFactory
+
+
+@pytest.fixture
+def make_calc():
+    """Return a factory of Addition calculations of ``value + 0``."""
+    def make(value):
+        return Calculation(operation="Addition", operand1=Decimal(value), operand2=Decimal("0"))
+    return make
+
+
+@pytest.fixture
+def calculator_env(tmp_path, monkeypatch):
+    """Point the calculator's log and history directories into a temporary directory."""
+    monkeypatch.setenv("CALCULATOR_LOG_DIR", str(tmp_path / "logs"))
+    monkeypatch.setenv("CALCULATOR_HISTORY_DIR", str(tmp_path / "history"))
+    return tmp_path
+
+
+@pytest.fixture
+def make_calculator(calculator_env):
+    """
+    Return a factory of Calculators whose logs and history live in a temporary directory.
+
+    Keyword arguments are CalculatorConfig options; auto_save is off unless
+    given. Every calculator made is closed after the test.
+    """
+    calculators = []
+
+    def make(**options):
+        options.setdefault('auto_save', False)
+        calculator = Calculator(config=CalculatorConfig(**options))
+        calculators.append(calculator)
+        return calculator
+
+    yield make
+    for calculator in calculators:
+        calculator.close()
+
+
+@pytest.fixture
+def calculator(make_calculator):
+    """Return a Calculator with the default settings and auto_save off; modules override it for other settings."""
+    return make_calculator()
+
+
+@pytest.fixture
+def sample_calculations():
+    """Return a factory of ``count`` Additions of ``i + 0.5``, one second apart from 2024-01-01."""
+    def sample(count, start=0):
+        origin = datetime.datetime(2024, 1, 1)
+        return [
+            Calculation("Addition", Decimal(i), Decimal("0.5"),
+                        timestamp=origin + datetime.timedelta(seconds=i))
+            for i in range(start, start + count)
+        ]
+    return sample
+
+
+@pytest.fixture
+def fields():
+    """Return a function giving the stored fields of a calculation, for round-trip comparisons."""
+    def fields(calc):
+        return (calc.operation, str(calc.operand1), str(calc.operand2), str(calc.result), calc.timestamp)
+    return fields
+
+
+@pytest.fixture
+def operation_registry(monkeypatch):
+    """Let a test register operations; the factory's registry is restored afterwards."""
+    monkeypatch.setattr(OperationFactory, '_operations', dict(OperationFactory._operations))
+    monkeypatch.setattr(OperationFactory, '_instances', dict(OperationFactory._instances))
+    return OperationFactory
@@ -0,0 +1,97 @@
+import threading
+from unittest.mock import Mock
+
+from app.autosave import BackgroundSaver
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.history import AutoSaveObserver
+
+
+def test_flush_writes_pending_batch(make_calc):
+    batches = []
+    saver = BackgroundSaver(batches.append, every_n=0, interval_ms=0, idle_ms=60000)
+    saver.submit(make_calc(1))
+    saver.submit(make_calc(2))
+    assert saver.flush(timeout=5)
+    assert [len(batch) for batch in batches] == [2]
+    assert saver.close(timeout=5)
+
+
+def test_every_n_trigger_coalesces_burst(make_calc):
+    written = threading.Event()
+    batches = []
+
+    def write(batch):
+        batches.append(batch)
+        written.set()
+
+    saver = BackgroundSaver(write, every_n=3, interval_ms=0, idle_ms=0)
+    for i in range(3):
+        saver.submit(make_calc(i))
+    assert written.wait(timeout=5)
+    assert [len(batch) for batch in batches] == [3]
+    saver.close(timeout=5)
+
+
+def test_close_flushes_and_stops_worker(make_calc):
+    batches = []
+    saver = BackgroundSaver(batches.append, every_n=0, interval_ms=60000, idle_ms=0)
+    saver.submit(make_calc(1))
+    assert saver.close(timeout=5)
+    assert len(batches) == 1
+    assert saver.close(timeout=5)
+
+
+def test_write_failure_is_reported(make_calc):
+    saver = BackgroundSaver(Mock(side_effect=OSError("disk full")), every_n=1, interval_ms=0, idle_ms=0)
+    saver.submit(make_calc(1))
+    assert not saver.flush(timeout=5)
+    assert isinstance(saver.last_error, OSError)
+    saver.close(timeout=5)
+
+
+def test_failure_stays_reported_after_later_successful_write(make_calc):
+    outcomes = [OSError("disk full"), None]
+    done = threading.Semaphore(0)
+
+    def write(batch):
+        try:
+            outcome = outcomes.pop(0)
+            if outcome is not None:
+                raise outcome
+        finally:
+            done.release()
+
+    saver = BackgroundSaver(write, every_n=1, interval_ms=0, idle_ms=0)
+    saver.submit(make_calc(1))
+    assert done.acquire(timeout=5)
+    saver.submit(make_calc(2))
+    assert done.acquire(timeout=5)
+
+    assert not saver.flush(timeout=5)
+    assert saver.flush(timeout=5)
+    assert saver.close(timeout=5)
+
+
+def test_close_reports_unflushed_failure(make_calc):
+    write = Mock(side_effect=[OSError("disk full"), None])
+    saver = BackgroundSaver(write, every_n=1, interval_ms=0, idle_ms=0)
+    saver.submit(make_calc(1))
+    saver.submit(make_calc(2))
+    assert not saver.close(timeout=5)
+    assert isinstance(saver.last_error, OSError)
+
+
+def test_autosave_observer_uses_background_writer(make_calc):
+    calculator_mock = Mock(spec=Calculator)
+    calculator_mock.config = CalculatorConfig(
+        auto_save=True, auto_save_mode='snapshot', auto_save_background=True,
+        auto_save_every_n=0, auto_save_interval_ms=0, auto_save_idle_ms=60000
+    )
+    observer = AutoSaveObserver(calculator_mock)
+    observer.update(make_calc(1))
+    observer.update(make_calc(2))
+    calculator_mock.save_history.assert_not_called()
+    assert observer.flush(timeout=5)
+    calculator_mock.save_history.assert_called_once()
+    assert observer.close(timeout=5)
@@ -0,0 +1,82 @@
+from decimal import Decimal
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from app.batch import to_float_array
+from app.calculator_config import CalculatorConfig
+from app.exceptions import OperationError, ValidationError
+from app.history import HistoryObserver
+
+
+@pytest.fixture
+def calculator(make_calculator):
+    return make_calculator(max_input_value=Decimal("1e6"))
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_batch_results_in_order(calculator, vectorized):
+    batch = calculator.perform_batch("add", [1, "2.5", 3], [4, 5, "-3"], vectorized=vectorized)
+    assert batch.results == [Decimal("5"), Decimal("7.5"), Decimal("0")]
+    assert batch.errors == {}
+    assert [calc.result for calc in calculator.history] == batch.results
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_batch_reports_errors_per_element(calculator, vectorized):
+    batch = calculator.perform_batch("divide", [1, "abc", 4, "2e7"], [2, 1, 0, 1], vectorized=vectorized)
+    assert batch.results[0] == Decimal("0.5")
+    assert batch.results[1:] == [None, None, None]
+    assert batch.errors[1] == "Invalid number format: abc"
+    assert batch.errors[2] == "Division by zero is not allowed"
+    assert batch.errors[3].startswith("Value exceeds maximum allowed")
+    assert batch.succeeded == 1
+    assert len(calculator.history) == 1
+
+
+@pytest.mark.parametrize("operation, a, b, expected", [
+    ("subtract", 5, 3, 2),
+    ("multiply", 4, 2, 8),
+    ("power", 2, 10, 1024),
+    ("root", 27, 3, 3),
+])
+def test_vectorized_kernels_match_decimal(calculator, operation, a, b, expected):
+    exact = calculator.perform_batch(operation, [a], [b]).results[0]
+    fast = calculator.perform_batch(operation, np.array([a]), np.array([b]), vectorized=True).results[0]
+    assert exact == pytest.approx(Decimal(expected))
+    assert float(fast) == pytest.approx(expected)
+
+
+def test_vectorized_operand_validation(calculator):
+    batch = calculator.perform_batch("root", [-8, 8], [3, 0], vectorized=True)
+    assert batch.errors == {
+        0: "Cannot calculate root of negative number",
+        1: "Zero root is undefined",
+    }
+    batch = calculator.perform_batch("power", [2], [-1], vectorized=True)
+    assert batch.errors == {0: "Negative exponents not supported"}
+
+
+def test_batch_notifies_observers_once(calculator):
+    observer = Mock(spec=HistoryObserver)
+    calculator.add_observer(observer)
+    calculator.perform_batch("multiply", [1, 2, 3], [2, 2, 2])
+    observer.update_batch.assert_called_once()
+    assert len(observer.update_batch.call_args[0][0]) == 3
+
+
+def test_batch_length_mismatch(calculator):
+    with pytest.raises(ValidationError, match="same length"):
+        calculator.perform_batch("add", [1, 2], [1])
+
+
+def test_batch_unknown_operation(calculator):
+    with pytest.raises(OperationError, match="Unknown operation"):
+        calculator.perform_batch("modulo", [1], [1])
+
+
+def test_to_float_array_rejects_non_finite():
+    array, errors = to_float_array(["1", "nan", "inf"], CalculatorConfig(max_input_value=Decimal("10")))
+    assert array.tolist() == [1.0, 0.0, 0.0]
+    assert set(errors) == {1, 2}
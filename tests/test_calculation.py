@@ -2,7 +2,7 @@ import pytest
 from decimal import Decimal
 from datetime import datetime
 from app.calculation import Calculation
-from app.exceptions import OperationError
+from app.exceptions import OperationError, ValidationError
 import logging
 
 
@@ -129,4 +129,50 @@ def test_from_dict_result_mismatch(caplog):
         calc = Calculation.from_dict(data)
 
     # Assert
-    assert "Loaded calculation result 10 differs from computed result 5" in caplog.text
\ No newline at end of file
+    assert "Loaded calculation result 10 differs from computed result 5" in caplog.text
+
+def test_compact_representation():
+    calc = Calculation(operation="Addition", operand1=Decimal("2"), operand2=Decimal("3"))
+    assert not hasattr(calc, "__dict__")
+    assert calc.operation_id == Calculation("Addition", Decimal("1"), Decimal("1")).operation_id
+    assert isinstance(calc.timestamp_ns, int)
+
+
+def test_timestamp_round_trip():
+    timestamp = datetime(2024, 5, 17, 13, 45, 12, 123456)
+    calc = Calculation("Addition", Decimal("2"), Decimal("3"), timestamp=timestamp)
+    assert calc.timestamp == timestamp
+    assert calc.to_dict()["timestamp"] == "2024-05-17T13:45:12.123456"
+    assert Calculation.from_dict(calc.to_dict()).timestamp == timestamp
+
+
+def test_str_representation():
+    calc = Calculation(operation="Multiplication", operand1=Decimal("4"), operand2=Decimal("2"))
+    assert str(calc) == "Multiplication(4, 2) = 8"
+
+
+def test_precomputed_result_is_not_recomputed(monkeypatch):
+    monkeypatch.setattr(Calculation, "calculate", lambda self: pytest.fail("recomputed"))
+    calc = Calculation("Power", Decimal("2"), Decimal("10"), result=Decimal("1024"))
+    assert calc.result == Decimal("1024")
+
+
+def test_precomputed_result_verification():
+    calc = Calculation("Addition", Decimal("2"), Decimal("3"), result=Decimal("5"), verify=True)
+    assert calc.result == Decimal("5")
+    with pytest.raises(OperationError, match="differs from computed result 5"):
+        Calculation("Addition", Decimal("2"), Decimal("3"), result=Decimal("6"), verify=True)
+
+def test_calculate_registered_operation(operation_registry):
+    from app.operations import Operation
+
+    class Modulus(Operation):
+        def execute(self, a: Decimal, b: Decimal) -> Decimal:
+            if b == 0:
+                raise ValidationError("Modulus by zero")
+            return a % b
+
+    operation_registry.register_operation("modulus", Modulus)
+    assert Calculation("Modulus", Decimal("7"), Decimal("3")).result == Decimal("1")
+    with pytest.raises(OperationError, match="Modulus by zero"):
+        Calculation("Modulus", Decimal("7"), Decimal("0"))
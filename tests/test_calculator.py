@@ -1,15 +1,20 @@
 import datetime
 from pathlib import Path
+import threading
+import time
 import pandas as pd
 import pytest
 from unittest.mock import patch
 from decimal import Decimal
 from tempfile import TemporaryDirectory
 
+from app.calculation import Calculation
 from app.calculator import Calculator
 from app.calculator_config import CalculatorConfig
+from app.calculator_memento import HistoryDelta
 from app.exceptions import OperationError, ValidationError
 from app.history import LoggingObserver
+from app.history_buffer import HistoryBuffer
 from app.operations import OperationFactory
 
 # ---------------------------
@@ -133,3 +138,287 @@ def test_calculator_initialization(calculator):
 #     assert calculator.history == []
 #     assert calculator.undo_stack == []
 #     assert calculator.redo_stack == []
+
+def test_history_accepts_plain_list(calculator):
+    calculator.config.max_history_size = 2
+    calculations = [Calculation("Addition", Decimal(i), Decimal(1)) for i in range(3)]
+    calculator.history = calculations
+    assert [calc.operand1 for calc in calculator.history] == [Decimal(1), Decimal(2)]
+    assert calculator.history.capacity == 2
+    assert calculator.query_history(operation="Addition", limit=1)[0].operand1 == Decimal(1)
+
+
+def test_undo_redo_restores_evicted_entry(calculator):
+    calculator.config.max_history_size = 2
+    calculator.history = HistoryBuffer(2)
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(1, 1)
+    calculator.perform_operation(2, 2)
+    calculator.perform_operation(3, 3)
+    assert [calc.result for calc in calculator.history] == [Decimal('4'), Decimal('6')]
+
+    assert calculator.undo()
+    assert [calc.result for calc in calculator.history] == [Decimal('2'), Decimal('4')]
+    assert calculator.redo()
+    assert [calc.result for calc in calculator.history] == [Decimal('4'), Decimal('6')]
+
+def test_undo_stack_stores_deltas(calculator):
+    calculator.set_operation(OperationFactory.create_operation('multiply'))
+    calculator.perform_operation(2, 3)
+    calculator.perform_operation(4, 5)
+    delta = calculator.undo_stack[-1]
+    assert delta.appended.result == Decimal('20')
+    assert delta.evicted is None
+    assert HistoryDelta.from_dict(delta.to_dict()).appended == delta.appended
+
+def test_new_operation_clears_redo(calculator):
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(2, 3)
+    calculator.undo()
+    assert calculator.history == []
+    calculator.perform_operation(1, 1)
+    assert calculator.redo_stack == []
+    assert not calculator.redo()
+
+def test_journal_appends_and_replays(calculator):
+    calculator.config.auto_save_mode = 'journal'
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(2, 3)
+    calculator.save_history()
+    calculator.perform_operation(4, 5)
+    calculator.append_history_journal([calculator.history[-1]])
+
+    assert calculator.config.history_journal_file.exists()
+    calculator.history.clear()
+    calculator.load_history()
+    assert [calc.result for calc in calculator.history] == [Decimal('5'), Decimal('9')]
+
+def test_journal_replays_records_older_than_snapshot(calculator):
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(2, 3)
+    calculator.save_history()
+    calculator.perform_operation(4, 5)
+    # The wall clock stepped back between the snapshot and the next calculation
+    calculator.history[-1].timestamp = calculator.history[0].timestamp - datetime.timedelta(hours=1)
+    calculator.append_history_journal([calculator.history[-1]])
+
+    calculator.load_history()
+    assert [calc.result for calc in calculator.history] == [Decimal('5'), Decimal('9')]
+
+def test_journal_skips_calculations_already_in_snapshot(calculator):
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(2, 3)
+    pending = calculator.history[-1]
+    # A background writer delivers the calculation after a snapshot holding it
+    calculator.save_history()
+    calculator.append_history_journal([pending])
+    assert not calculator.config.history_journal_file.exists()
+
+    calculator.perform_operation(4, 5)
+    calculator.append_history_journal([pending, calculator.history[-1]])
+    calculator.load_history()
+    assert [calc.result for calc in calculator.history] == [Decimal('5'), Decimal('9')]
+
+def test_journal_compacts_after_interval(calculator):
+    calculator.config.journal_compact_interval = 2
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(1, 1)
+    calculator.append_history_journal([calculator.history[-1]])
+    assert calculator.config.history_journal_file.exists()
+    calculator.perform_operation(2, 2)
+    calculator.append_history_journal([calculator.history[-1]])
+    assert not calculator.config.history_journal_file.exists()
+    assert len(pd.read_csv(calculator.config.history_file)) == 2
+
+def test_journal_rewrites_snapshot_after_undo(calculator):
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(1, 1)
+    calculator.append_history_journal([calculator.history[-1]])
+    calculator.perform_operation(2, 2)
+    calculator.undo()
+    calculator.perform_operation(3, 3)
+    calculator.append_history_journal([calculator.history[-1]])
+
+    calculator.load_history()
+    assert [calc.result for calc in calculator.history] == [Decimal('2'), Decimal('6')]
+
+def write_history_csv(calculator, rows):
+    pd.DataFrame(rows, columns=['operation', 'operand1', 'operand2', 'result', 'timestamp']
+                 ).to_csv(calculator.config.history_file, index=False)
+
+def test_load_history_parses_columns_exactly(calculator):
+    write_history_csv(calculator, [
+        ['Addition', '0.1', '0.2', '0.3', '2024-01-02T03:04:05.678901'],
+        ['Division', '1', '4', '0.25', '2024-01-02T03:04:06'],
+    ])
+    calculator.load_history()
+    assert len(calculator.history) == 2
+    assert calculator.history[0].operand1 == Decimal('0.1')
+    assert calculator.history[0].result == Decimal('0.3')
+    assert calculator.history[0].timestamp == datetime.datetime(2024, 1, 2, 3, 4, 5, 678901)
+    assert calculator.history[1].to_dict()['timestamp'] == '2024-01-02T03:04:06'
+
+def test_load_history_recomputes_unless_trusted(calculator):
+    write_history_csv(calculator, [['Addition', '2', '3', '10', '2024-01-02T03:04:05']])
+    calculator.load_history()
+    assert calculator.history[0].result == Decimal('5')
+
+    calculator.config.trust_history_results = True
+    calculator.load_history()
+    assert calculator.history[0].result == Decimal('10')
+
+def test_load_history_keeps_newest_entries(calculator):
+    calculator.config.max_history_size = 2
+    write_history_csv(calculator, [
+        ['Addition', str(i), '0', str(i), f'2024-01-02T03:04:0{i}'] for i in range(5)
+    ])
+    calculator.load_history()
+    assert [calc.operand1 for calc in calculator.history] == [Decimal('3'), Decimal('4')]
+
+def test_load_history_invalid_data(calculator):
+    write_history_csv(calculator, [['Addition', 'invalid', '3', '5', '2024-01-02T03:04:05']])
+    with pytest.raises(OperationError, match="Invalid calculation data"):
+        calculator.load_history()
+
+def test_history_loads_in_background(calculator):
+    write_history_csv(calculator, [['Addition', '2', '3', '5', '2024-01-02T03:04:05']])
+    background = Calculator(config=calculator.config, load_history_in_background=True)
+    assert [calc.result for calc in background.history] == [Decimal('5')]
+
+def test_operation_during_background_load_waits_for_history(calculator):
+    write_history_csv(calculator, [['Addition', '2', '3', '5', '2024-01-02T03:04:05']])
+    read_history_csv = Calculator._read_snapshot
+
+    def slow_read(self):
+        time.sleep(0.2)
+        return read_history_csv(self)
+
+    with patch.object(Calculator, '_read_snapshot', slow_read):
+        background = Calculator(config=calculator.config, load_history_in_background=True)
+        background.set_operation(OperationFactory.create_operation('add'))
+        worker = threading.Thread(target=background.perform_operation, args=(1, 1), daemon=True)
+        worker.start()
+        worker.join(timeout=5)
+    assert not worker.is_alive()
+    assert [calc.result for calc in background.history] == [Decimal('5'), Decimal('2')]
+
+def test_power_honors_config_precision(calculator):
+    calculator.config.precision = 50
+    calculator.set_operation(OperationFactory.create_operation('root'))
+    result = calculator.perform_operation(2, 2)
+    assert len(result.as_tuple().digits) == 50
+    assert calculator.history[-1].result == result
+
+def test_journal_replay_verifies_at_config_precision(calculator, caplog):
+    calculator.config.precision = 50
+    calculator.set_operation(OperationFactory.create_operation('root'))
+    result = calculator.perform_operation(2, 2)
+    calculator.append_history_journal([calculator.history[-1]])
+
+    calculator.load_history()
+    assert calculator.history[0].result == result
+    assert "differs from computed result" not in caplog.text
+
+def test_journal_replay_recomputes_unless_trusted(calculator):
+    calculator.config.history_journal_file.parent.mkdir(parents=True, exist_ok=True)
+    calculator.config.history_journal_file.write_text("Addition,2,3,10,2024-01-02T03:04:05\n",
+                                                      encoding=calculator.config.default_encoding)
+    calculator.load_history()
+    assert calculator.history[0].result == Decimal('5')
+
+    calculator.config.trust_history_results = True
+    calculator.load_history()
+    assert calculator.history[0].result == Decimal('10')
+    assert calculator.history[0].timestamp == datetime.datetime(2024, 1, 2, 3, 4, 5)
+
+def test_power_float_mode(calculator):
+    calculator.config.power_mode = 'float'
+    calculator.set_operation(OperationFactory.create_operation('root'))
+    assert calculator.perform_operation(2, 2) == Decimal(2 ** 0.5)
+
+def test_calculator_query_history(calculator):
+    calculator.set_operation(OperationFactory.create_operation('divide'))
+    for i in range(1, 6):
+        calculator.perform_operation(i * 10, 2)
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(1, 1)
+
+    last = calculator.query_history('divide', limit=2, newest_first=True)
+    assert [calc.result for calc in last] == [Decimal(25), Decimal(20)]
+    assert len(calculator.query_history('Division', result=(10, None))) == 4
+    assert len(calculator.query_history(operand1=(None, 20))) == 3
+
+    calculator.undo()
+    assert calculator.query_history('add') == []
+    with pytest.raises(ValidationError):
+        calculator.query_history(limit=-1)
+
+def test_stats_follow_evictions_undo_redo_and_clear(calculator):
+    calculator.config.max_history_size = 3
+    calculator.history = HistoryBuffer(3)
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    for i in range(4):
+        calculator.perform_operation(i, 10)
+
+    # Entries 1-3 remain: results 11, 12, 13
+    assert calculator.stats() == {'Addition': {
+        'count': 3, 'sum': Decimal(36), 'min': Decimal(11), 'max': Decimal(13), 'mean': Decimal(12)}}
+
+    calculator.undo()
+    assert calculator.stats()['Addition']['min'] == Decimal(10)
+    assert calculator.stats()['Addition']['sum'] == Decimal(33)
+    calculator.redo()
+    assert calculator.stats()['Addition']['sum'] == Decimal(36)
+
+    calculator.set_operation(OperationFactory.create_operation('multiply'))
+    calculator.perform_operation(2, 3)
+    assert calculator.stats()['Multiplication']['count'] == 1
+    assert calculator.stats()['Addition']['count'] == 2
+
+    calculator.clear_history()
+    assert calculator.stats() == {}
+
+def test_evaluate_expression_records_final_operation(calculator):
+    result = calculator.evaluate_expression("(3 + 4) * 2 ^ 10 / root(81, 4)", record='expression')
+    assert result == Decimal(7168) / 3
+    assert len(calculator.history) == 1
+    entry = calculator.history[-1]
+    assert (entry.operation, entry.operand1, entry.operand2) == ("Division", Decimal(7168), Decimal(3))
+
+    # 'ans' is the newest result
+    assert calculator.evaluate_expression("ans - ans", record='expression') == Decimal(0)
+    assert calculator.undo()
+    assert len(calculator.history) == 1
+
+def test_evaluate_expression_records_steps(calculator):
+    calculator.evaluate_expression("(1 + 2) * 3 - 4", record='steps')
+    assert [calc.operation for calc in calculator.history] == ["Addition", "Multiplication", "Subtraction"]
+    assert calculator.history[-1].result == Decimal(5)
+
+    calculator.evaluate_expression("x + 1", record='off', variables={'x': 1})
+    assert len(calculator.history) == 3
+
+def test_evaluate_expression_errors(calculator):
+    with pytest.raises(ValidationError, match="Unknown variable: ans"):
+        calculator.evaluate_expression("ans + 1")
+    with pytest.raises(ValidationError, match="Division by zero"):
+        calculator.evaluate_expression("1 / (2 - 2)", record='steps')
+    with pytest.raises(ValidationError, match="Value exceeds maximum"):
+        calculator.evaluate_expression(f"{calculator.config.max_input_value * 10} + 1")
+    with pytest.raises(ValidationError, match="Unknown expression record mode"):
+        calculator.evaluate_expression("1 + 1", record='all')
+    assert len(calculator.history) == 0
+
+def test_evaluate_expression_caches_plans(calculator):
+    calculator.evaluate_expression("2 * (3 + 4)")
+    calculator.evaluate_expression("2*(3+4)")
+    assert calculator.expression_plans.stats()['hits'] == 1
+    calculator.config.precision = 20
+    calculator.evaluate_expression("2*(3+4)")
+    assert calculator.expression_plans.stats()['misses'] == 2
+
+
+def test_evaluate_expression_cache_does_not_merge_tokens(calculator):
+    assert calculator.evaluate_expression("12+0") == Decimal("12")
+    with pytest.raises(ValidationError, match="Invalid expression"):
+        calculator.evaluate_expression("1 2+0")
@@ -0,0 +1,165 @@
+import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from app.calculator_repl import format_metrics, parse_history_arguments, run_profile_command, stop_profiling
+from app.profiling import Profiler
+
+
+def test_parse_history_arguments_empty():
+    assert parse_history_arguments([]) == {}
+
+
+def test_parse_history_arguments_all_options():
+    criteria = parse_history_arguments([
+        "divide", "--last", "20", "--since", "2024-01-31", "--until", "2024-02-01 12:00",
+        "--min", "-1.5", "--max", "1e3",
+    ])
+    assert criteria == {
+        'operation': "divide",
+        'limit': 20,
+        'newest_first': True,
+        'since': datetime.datetime(2024, 1, 31),
+        'until': datetime.datetime(2024, 2, 1, 12, 0),
+        'result': (Decimal("-1.5"), Decimal("1e3")),
+    }
+
+
+@pytest.mark.parametrize("arguments, expected", [
+    (["--min", "0"], (Decimal(0), None)),
+    (["--max", "10"], (None, Decimal(10))),
+])
+def test_parse_history_arguments_open_result_range(arguments, expected):
+    assert parse_history_arguments(arguments) == {'result': expected}
+
+
+@pytest.mark.parametrize("arguments, message", [
+    (["add", "divide"], "Unexpected argument: divide"),
+    (["--first", "3"], "Unknown option: --first"),
+    (["--last"], "--last needs a value"),
+    (["--last", "ten"], "Invalid value for --last: ten"),
+    (["--last", "0"], "Invalid value for --last: 0"),
+    (["--since", "yesterday"], "Invalid value for --since: yesterday"),
+    (["--until", "2024-13-01"], "Invalid value for --until: 2024-13-01"),
+    (["--min", "abc"], "Invalid value for --min: abc"),
+    (["--max", "1..2"], "Invalid value for --max: 1..2"),
+])
+def test_parse_history_arguments_errors(arguments, message):
+    with pytest.raises(ValueError) as exc_info:
+        parse_history_arguments(arguments)
+    assert str(exc_info.value) == message
+
+
+def metrics(**overrides):
+    values = {
+        'enabled': True,
+        'stages': {
+            'execute': {'count': 2, 'total_us': 3.0, 'mean_us': 1.5, 'p50_us': 1.023, 'p99_us': 2.047, 'max_us': 2.0},
+        },
+        'counters': {'calculations': 2, 'errors': 0},
+        'cache': None,
+        'expressions': None,
+        'observers': None,
+    }
+    values.update(overrides)
+    return values
+
+
+def test_format_metrics_disabled():
+    assert format_metrics(metrics(enabled=False)) == [
+        "Metrics are disabled (set CALCULATOR_METRICS=true to enable them)"
+    ]
+
+
+def test_format_metrics_without_timed_stages():
+    assert format_metrics(metrics(stages={})) == ["No calculations timed yet"]
+
+
+def test_format_metrics_stages_and_counters():
+    assert format_metrics(metrics()) == [
+        "execute: count=2, mean=1.5us, p50<=1.023us, p99<=2.047us, max=2.0us",
+        "calculations=2, errors=0",
+    ]
+
+
+def test_format_metrics_components():
+    lines = format_metrics(metrics(
+        cache={'hits': 3, 'misses': 1},
+        expressions={'size': 1, 'hits': 0},
+        observers={'queued': 0, 'errors': 0},
+    ))
+    assert lines[2:] == [
+        "cache: hits=3, misses=1",
+        "expressions: size=1, hits=0",
+        "observers: queued=0, errors=0",
+    ]
+
+
+@pytest.fixture
+def profile_config(tmp_path):
+    return SimpleNamespace(log_dir=tmp_path, profile_top=5)
+
+
+def test_profile_command_status(profile_config):
+    profiler = Profiler('cpu', profile_config.log_dir)
+    assert run_profile_command(profiler, [], profile_config) == (profiler, "Profiler (cpu) is stopped")
+    profiler.start()
+    assert run_profile_command(profiler, [], profile_config)[1] == "Profiler (cpu) is running"
+    profiler.stop()
+
+
+def test_profile_command_start_dump_stop(profile_config):
+    profiler = Profiler('cpu', profile_config.log_dir)
+    same, message = run_profile_command(profiler, ["start"], profile_config)
+    assert same is profiler and message == "Profiling (cpu) started"
+
+    _, message = run_profile_command(profiler, ["dump"], profile_config)
+    assert message.startswith("Profile written to ") and profiler.active
+    _, message = run_profile_command(profiler, ["stop"], profile_config)
+    assert message.startswith("Profile written to ") and not profiler.active
+    assert len(list(profile_config.log_dir.glob("profile-*.prof"))) == 2
+
+
+def test_profile_command_start_in_another_mode(profile_config):
+    profiler = Profiler('cpu', profile_config.log_dir)
+    memory, message = run_profile_command(profiler, ["start", "mem"], profile_config)
+    assert memory is not profiler
+    assert (memory.mode, memory.top, message) == ('mem', 5, "Profiling (mem) started")
+    run_profile_command(memory, ["stop"], profile_config)
+    assert list(profile_config.log_dir.glob("memory-*.txt"))
+
+
+@pytest.mark.parametrize("arguments, message", [
+    (["start", "gpu"], "Unknown profile mode: gpu"),
+    (["start", "cpu", "now"], "Usage: profile [start [cpu|mem] | stop | dump]"),
+    (["stop", "now"], "Usage: profile [start [cpu|mem] | stop | dump]"),
+    (["pause"], "Usage: profile [start [cpu|mem] | stop | dump]"),
+])
+def test_profile_command_invalid_arguments(profile_config, arguments, message):
+    with pytest.raises(ValueError) as exc_info:
+        run_profile_command(Profiler('cpu', profile_config.log_dir), arguments, profile_config)
+    assert str(exc_info.value) == message
+
+
+def test_profile_command_invalid_state(profile_config):
+    profiler = Profiler('cpu', profile_config.log_dir)
+    with pytest.raises(RuntimeError, match="not running"):
+        run_profile_command(profiler, ["stop"], profile_config)
+    run_profile_command(profiler, ["start"], profile_config)
+    # A running profiler is not replaced, whatever mode is asked for
+    with pytest.raises(RuntimeError, match="already running"):
+        run_profile_command(profiler, ["start", "mem"], profile_config)
+    profiler.stop()
+
+
+def test_stop_profiling_writes_running_profile(profile_config, capsys):
+    profiler = Profiler('cpu', profile_config.log_dir)
+    stop_profiling(profiler)
+    assert capsys.readouterr().out == ""
+
+    profiler.start()
+    stop_profiling(profiler)
+    assert capsys.readouterr().out.startswith("Profile written to ")
+    assert not profiler.active
@@ -0,0 +1,114 @@
+import io
+import json
+from decimal import Decimal
+
+import pytest
+
+from app.calculator_stream import parse_lines, run_stream
+from app.operations import OperationFactory
+import main
+
+
+def stream(text, **kwargs):
+    output = io.StringIO()
+    failures = run_stream(io.StringIO(text), output, **kwargs)
+    return output.getvalue(), failures
+
+
+def test_parse_lines_skips_blank_and_comment_lines():
+    commands = list(parse_lines(["add 1 2\n", "\n", "# note\n", "Multiply 3 4\n"]))
+    assert [(c.line, c.operation, c.operand1, c.operand2) for c in commands] == [
+        (1, "add", "1", "2"), (4, "multiply", "3", "4")
+    ]
+
+
+def test_parse_lines_reports_malformed_line():
+    command, = parse_lines(["add 1\n"])
+    assert command.error == "Expected '<operation> <a> <b>', got: add 1"
+
+
+def test_stream_plain_output():
+    output, failures = stream("add 2 3\ndivide 1 0\npower 2 10\n")
+    assert output == "5\nError: Division by zero is not allowed\n1024\n"
+    assert failures == 1
+
+
+def test_stream_csv_output():
+    output, _ = stream("subtract 5 7\nmodulo 1 2\n", output_format="csv")
+    assert output.splitlines() == [
+        "line,operation,operand1,operand2,result,error",
+        "1,subtract,5,7,-2,",
+        "2,modulo,1,2,,Unknown operation: modulo",
+    ]
+
+
+def test_stream_jsonl_output():
+    output, failures = stream("multiply 1.5 2\nadd x 1\n", output_format="jsonl")
+    records = [json.loads(line) for line in output.splitlines()]
+    assert records[0] == {"line": 1, "operation": "multiply", "operand1": "1.5", "operand2": "2", "result": "3"}
+    assert records[1]["error"] == "Invalid number format: x"
+    assert failures == 1
+
+
+def test_stream_is_lazy():
+    """Each result is written before the next input line is read."""
+    output = io.StringIO()
+
+    def lines():
+        yield "add 1 1\n"
+        assert output.getvalue() == "2\n"
+        yield "add 2 2\n"
+
+    run_stream(lines(), output)
+    assert output.getvalue() == "2\n4\n"
+
+
+def test_stream_history_off_records_nothing(calculator):
+    stream("add 1 2\n", calculator=calculator)
+    assert len(calculator.history) == 0
+
+
+def test_stream_history_full(calculator):
+    stream("add 1 2\nmultiply 2 3\ndivide 1 0\n", history="full", calculator=calculator)
+    assert [calc.result for calc in calculator.history] == [Decimal("3"), Decimal("6")]
+
+
+def test_stream_history_sampled(calculator):
+    text = "".join(f"add {i} 0\n" for i in range(10))
+    stream(text, history="sampled", sample_every=4, calculator=calculator)
+    assert [calc.result for calc in calculator.history] == [Decimal("0"), Decimal("4"), Decimal("8")]
+
+
+def test_stream_history_does_not_grow_the_undo_stack(make_calculator):
+    calculator = make_calculator(max_history_size=5)
+    calculator.set_operation(OperationFactory.create_operation("add"))
+    calculator.perform_operation(1, 1)
+    stream("".join(f"add {i} 0\n" for i in range(50)), history="full", calculator=calculator)
+    assert len(calculator.history) == 5
+    assert calculator.undo_stack == [] and calculator.redo_stack == []
+    # The deltas recorded before the stream no longer describe the history
+    assert not calculator.undo()
+
+
+@pytest.mark.parametrize("kwargs, message", [
+    ({"output_format": "xml"}, "Unknown output format: xml"),
+    ({"history": "some"}, "Unknown history mode: some"),
+    ({"sample_every": 0}, "sample_every must be positive"),
+])
+def test_stream_rejects_invalid_arguments(kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        stream("add 1 2\n", **kwargs)
+
+
+def test_stream_profile_written_to_log_dir(calculator):
+    calculator.config.profile = 'cpu'
+    stream("add 1 2\npower 2 10\n", history="full", calculator=calculator)
+    assert len(list(calculator.config.log_dir.glob("profile-*.prof"))) == 1
+
+
+@pytest.mark.parametrize("commands, status", [("add 2 3\n", 0), ("add 2 3\ndivide 1 0\n", 1)])
+def test_main_stream_exit_status(calculator_env, capsys, commands, status):
+    source = calculator_env / "commands.txt"
+    source.write_text(commands, encoding="utf-8")
+    assert main.main(["--stream", "--input", str(source)]) == status
+    assert capsys.readouterr().out.startswith("5\n")
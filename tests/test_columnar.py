@@ -0,0 +1,142 @@
+from decimal import Decimal
+import io
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import pytest
+
+from app.calculator_config import CalculatorConfig
+from app.columnar import map_csv, map_file
+from app.exceptions import OperationError, ValidationError
+from app.operations import Operation
+import main
+
+DATA = "a,B,label\n1,2,x\n3,0,y\n,4,z\n2.5,4,w\n"
+
+
+@pytest.fixture
+def config():
+    return CalculatorConfig(auto_save=False, max_input_value=Decimal("1e6"))
+
+
+def run(expression, data=DATA, config=None, **kwargs):
+    output, errors = io.StringIO(), io.StringIO()
+    report = map_csv(expression, io.StringIO(data), output, errors, config, **kwargs)
+    return report, output.getvalue().splitlines(), errors.getvalue().splitlines()
+
+
+def test_decimal_mode_maps_rows_and_reports_invalid_ones(config):
+    report, output, errors = run("a * b + 1", config=config)
+    assert output == ["a,B,label,result", "1,2,x,3", "3,0,y,1", ",4,z,", "2.5,4,w,11.0"]
+    assert errors == ["row,error", "3,a: Invalid number format: "]
+    assert (report.rows, report.failed) == (4, 1)
+
+
+def test_float_mode_matches_decimal_mode(config):
+    report, output, errors = run("a * b + 1", config=config, mode="float")
+    assert output == ["a,B,label,result", "1,2,x,3.0", "3,0,y,1.0", ",4,z,", "2.5,4,w,11.0"]
+    assert errors == ["row,error", "3,a: Invalid number format: "]
+    assert report.failed == 1
+
+
+@pytest.mark.parametrize("mode", ["decimal", "float"])
+def test_operation_errors_are_reported_per_row(config, mode):
+    report, output, errors = run("a / b", config=config, mode=mode)
+    assert output[2] == "3,0,y,"
+    assert errors[1:] == ["2,Division by zero is not allowed", "3,a: Invalid number format: "]
+    assert report.failed == 2
+
+
+@pytest.mark.parametrize("mode", ["decimal", "float"])
+def test_max_input_value_applies_to_columns(config, mode):
+    report, _, errors = run("a + b", data="a,b\n1,2\n2000000,1\n", config=config, mode=mode)
+    assert errors == ["row,error", "2,a: Value exceeds maximum allowed: 1E+6"]
+    assert report.failed == 1
+
+
+@pytest.mark.parametrize("mode", ["decimal", "float"])
+def test_chunks_keep_row_numbers_and_a_single_header(config, mode):
+    data = "a,b\n" + "".join(f"{i},{i % 3}\n" for i in range(7))
+    report, output, errors = run("a / b", data=data, config=config, mode=mode, chunk_rows=2)
+    assert output[0] == "a,b,result" and len(output) == 8
+    assert [line.split(",")[0] for line in errors[1:]] == ["1", "4", "7"]
+    assert (report.rows, report.failed) == (7, 3)
+
+
+def test_constant_expression_fills_every_row(config):
+    _, output, _ = run("2 ^ 3", data="a\n1\n2\n", config=config)
+    assert output == ["a,result", "1,8", "2,8"]
+
+
+def test_operation_name_applies_to_first_two_columns(config):
+    _, output, _ = run("subtract", config=config)
+    assert output[1:3] == ["1,2,x,-1", "3,0,y,3"]
+
+
+def test_unknown_column_raises(config):
+    with pytest.raises(ValidationError, match="Unknown column: c"):
+        run("a + c", config=config)
+
+
+def test_result_column_must_not_overwrite_input(config):
+    with pytest.raises(ValidationError, match="already has a column named result"):
+        run("a + b", data="a,b,result\n1,2,x\n", config=config)
+    _, output, _ = run("a + b", data="a,b,result\n1,2,x\n", config=config, result_column="sum")
+    assert output == ["a,b,result,sum", "1,2,x,3"]
+
+
+def test_invalid_mode_and_chunk_size_raise(config):
+    with pytest.raises(ValueError, match="Unknown map mode"):
+        run("a + b", config=config, mode="simd")
+    with pytest.raises(ValueError, match="chunk_rows must be positive"):
+        run("a + b", config=config, chunk_rows=0)
+
+
+def test_float_mode_requires_vectorized_kernels(config):
+    class Scalar(Operation):
+        def execute(self, a, b):
+            return a + b
+
+    with patch("app.operations.OperationFactory._operations", {"scalar": Scalar}):
+        with pytest.raises(OperationError, match="no vectorized kernel"):
+            run("scalar(a, b)", config=config, mode="float")
+        _, output, _ = run("scalar(a, b)", config=config)
+    assert output[1] == "1,2,x,3"
+
+
+def test_map_file_writes_default_errors_file(config):
+    with TemporaryDirectory() as temp_dir:
+        source, target = Path(temp_dir) / "data.csv", Path(temp_dir) / "out.csv"
+        encoding = config.default_encoding
+        source.write_text(DATA, encoding=encoding)
+        report = map_file("a - b", source, target, config=config)
+        assert target.read_text(encoding=encoding).splitlines()[1] == "1,2,x,-1"
+        errors = Path(f"{target}.errors.csv").read_text(encoding=encoding)
+        assert errors.splitlines()[1] == "3,a: Invalid number format: "
+    assert report.rows == 4
+
+
+def test_main_map_option(capsys):
+    with TemporaryDirectory() as temp_dir, patch.dict("os.environ", {"CALCULATOR_DEFAULT_ENCODING": "utf-8"}):
+        source, target = Path(temp_dir) / "data.csv", Path(temp_dir) / "out.csv"
+        errors = Path(temp_dir) / "bad.csv"
+        source.write_text(DATA)
+        status = main.main(["--map", "a * b + 1", "--in", str(source), "--out", str(target),
+                            "--errors", str(errors), "--mode", "float"])
+        assert status == 0
+        assert target.read_text().splitlines()[-1] == "2.5,4,w,11.0"
+        assert len(errors.read_text().splitlines()) == 2
+        assert "Mapped 4 rows" in capsys.readouterr().err
+
+        assert main.main(["--map", "q + 1", "--in", str(source), "--out", str(target)]) == 1
+        assert "Unknown column: q" in capsys.readouterr().err
+
+        assert main.main(["--map", "a + 1", "--in", str(source), "--out", str(target),
+                          "--result-column", "label"]) == 1
+        assert "already has a column named label" in capsys.readouterr().err
+
+
+def test_main_map_requires_paths():
+    with pytest.raises(SystemExit):
+        main.parse_args(["--map", "a + b", "--in", "data.csv"])
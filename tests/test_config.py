@@ -143,3 +143,76 @@ def test_history_file_property():
     clear_env_vars('CALCULATOR_HISTORY_FILE')
     config = CalculatorConfig(base_dir=Path('/new_base_dir'))
     assert config.history_file == Path('/new_base_dir/history/calculator_history.csv').resolve()
+
+def test_invalid_auto_save_mode():
+    with pytest.raises(ConfigurationError, match="auto_save_mode must be"):
+        CalculatorConfig(auto_save_mode="sometimes").validate()
+
+def test_invalid_journal_compact_interval():
+    with pytest.raises(ConfigurationError, match="journal_compact_interval must be positive"):
+        CalculatorConfig(journal_compact_interval=-1).validate()
+
+def test_background_auto_save_needs_trigger():
+    with pytest.raises(ConfigurationError, match="needs at least one trigger"):
+        CalculatorConfig(
+            auto_save_background=True, auto_save_every_n=0,
+            auto_save_interval_ms=0, auto_save_idle_ms=0
+        ).validate()
+
+def test_invalid_workers():
+    with pytest.raises(ConfigurationError, match="workers must be positive"):
+        CalculatorConfig(workers=-2).validate()
+
+def test_invalid_chunk_size():
+    with pytest.raises(ConfigurationError, match="chunk_size must be positive"):
+        CalculatorConfig(chunk_size=-1).validate()
+
+def test_invalid_power_mode():
+    with pytest.raises(ConfigurationError, match="power_mode must be"):
+        CalculatorConfig(power_mode="fast").validate()
+
+def test_invalid_cache_size():
+    with pytest.raises(ConfigurationError, match="cache_size must not be negative"):
+        CalculatorConfig(cache_size=-1).validate()
+
+def test_invalid_history_format():
+    with pytest.raises(ConfigurationError, match="history_format must be"):
+        CalculatorConfig(history_format="xml").validate()
+
+def test_history_snapshot_file_follows_format():
+    config = CalculatorConfig(history_format="sqlite")
+    config.validate()
+    assert config.history_snapshot_file == config.history_db_file
+    config.history_format = "binary"
+    assert config.history_snapshot_file == config.history_binary_file
+
+def test_invalid_observer_dispatch():
+    with pytest.raises(ConfigurationError, match="observer_dispatch must be"):
+        CalculatorConfig(observer_dispatch="threaded").validate()
+    with pytest.raises(ConfigurationError, match="observer_queue_size must be positive"):
+        CalculatorConfig(observer_queue_size=-1).validate()
+    with pytest.raises(ConfigurationError, match="observer_overflow must be"):
+        CalculatorConfig(observer_overflow="spill").validate()
+
+
+def test_invalid_log_settings():
+    with pytest.raises(ConfigurationError, match="log rotation settings must not be negative"):
+        CalculatorConfig(log_max_bytes=-1).validate()
+    with pytest.raises(ConfigurationError, match="log rotation settings must not be negative"):
+        CalculatorConfig(log_backup_count=-1).validate()
+    with pytest.raises(ConfigurationError, match="log_sample_rate must be between 0 and 1"):
+        CalculatorConfig(log_sample_rate=1.5).validate()
+
+
+def test_invalid_profile_settings():
+    with pytest.raises(ConfigurationError, match="profile must be 'off', 'cpu' or 'mem'"):
+        CalculatorConfig(profile="gpu").validate()
+    with pytest.raises(ConfigurationError, match="profile_top must be positive"):
+        CalculatorConfig(profile_top=-1).validate()
+
+
+def test_invalid_expression_settings():
+    with pytest.raises(ConfigurationError, match="expression_history must be"):
+        CalculatorConfig(expression_history="all").validate()
+    with pytest.raises(ConfigurationError, match="expression_cache_size must not be negative"):
+        CalculatorConfig(expression_cache_size=-1).validate()
@@ -0,0 +1,97 @@
+from decimal import Decimal, InvalidOperation, localcontext
+
+import pytest
+
+from app.decimal_math import (
+    current_engine,
+    decimal_power,
+    decimal_root,
+    engine_context,
+    power,
+    root,
+)
+
+SQRT2_60 = "1.41421356237309504880168872420969807856967187537694807317668"
+
+
+def test_power_integral_exponent_is_exact_within_precision():
+    assert str(decimal_power(Decimal(2), Decimal(100), 50)) == "1267650600228229401496703205376"
+
+
+def test_power_rounds_to_precision():
+    assert str(decimal_power(Decimal(2), Decimal(100), 10)) == "1.267650600E+30"
+
+
+def test_power_negative_integral_exponent():
+    assert decimal_power(Decimal(2), Decimal(-3), 10) == Decimal("0.125")
+
+
+def test_power_fractional_exponent():
+    assert str(decimal_power(Decimal(2), Decimal("0.5"), 60)) == SQRT2_60
+
+
+def test_power_beyond_float_range():
+    assert decimal_power(Decimal("1e300"), Decimal(3), 10) == Decimal("1e900")
+
+
+def test_power_negative_base_fractional_exponent():
+    with pytest.raises(InvalidOperation):
+        decimal_power(Decimal(-8), Decimal("0.5"), 10)
+
+
+@pytest.mark.parametrize("precision", [10, 50, 200])
+def test_root_matches_decimal_sqrt(precision):
+    with localcontext() as context:
+        context.prec = precision
+        expected = Decimal(2).sqrt()
+    assert decimal_root(Decimal(2), Decimal(2), precision) == expected
+
+
+@pytest.mark.parametrize("x, n, expected", [
+    ("27", "3", "3"),
+    ("16", "4", "2"),
+    ("2.25", "2", "1.5"),
+    ("1e999", "3", "1E+333"),
+    ("0", "5", "0"),
+    ("7", "1", "7"),
+])
+def test_root_exact_results(x, n, expected):
+    assert str(decimal_root(Decimal(x), Decimal(n), 10)) == expected
+
+
+def test_root_negative_degree():
+    assert decimal_root(Decimal(4), Decimal(-2), 10) == Decimal("0.5")
+
+
+def test_root_fractional_degree():
+    assert decimal_root(Decimal(8), Decimal("1.5"), 10) == Decimal(4)
+
+
+@pytest.mark.parametrize("x, n, message", [
+    ("-8", "3", "Cannot calculate root of negative number"),
+    ("8", "0", "Zero root is undefined"),
+])
+def test_root_invalid_operands(x, n, message):
+    with pytest.raises(InvalidOperation, match=message):
+        decimal_root(Decimal(x), Decimal(n), 10)
+
+
+def test_engine_defaults_to_decimal_context_precision():
+    assert current_engine().precision is None
+    with localcontext() as context:
+        context.prec = 60
+        assert str(power(Decimal(2), Decimal("0.5"))) == SQRT2_60
+
+
+def test_engine_context_sets_and_restores_settings():
+    with engine_context(precision=5) as settings:
+        assert current_engine() is settings
+        assert root(Decimal(2), Decimal(2)) == Decimal("1.4142")
+    assert current_engine().precision is None
+
+
+def test_float_mode():
+    with engine_context(mode="float"):
+        assert root(Decimal(2), Decimal(2)) == Decimal(2 ** 0.5)
+        with pytest.raises(OverflowError):
+            power(Decimal("1e300"), Decimal(3))
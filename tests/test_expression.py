@@ -0,0 +1,122 @@
+from decimal import Decimal
+
+import pytest
+
+from app.decimal_math import engine_context
+from app.exceptions import ValidationError
+from app.expression import (
+    APPLY, PUSH, Apply, Number, PlanCache, Variable, compile_expression, fold, parse, tokenize
+)
+
+
+def evaluate(text, **variables):
+    with engine_context(10, 'decimal'):
+        return compile_expression(text, fold_constants=False).evaluate(
+            {name: Decimal(value) for name, value in variables.items()})
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1 + 2 * 3", "7"),
+    ("(1 + 2) * 3", "9"),
+    ("10 - 4 - 3", "3"),
+    ("2 ^ 3 ^ 2", "512"),
+    ("-2 ^ 2", "-4"),
+    ("2 * -3", "-6"),
+    ("-(2 + 3)", "-5"),
+    ("+4 - -1", "5"),
+    ("root(81, 4) + power(2, 3)", "11"),
+    ("(3 + 4) * 2 ^ 10 / root(81, 4)", Decimal(7168) / 3),
+    (".5e1 + 1", "6"),
+    ("ans * 2", "20"),
+])
+def test_evaluation(text, expected):
+    assert evaluate(text, ans=10) == Decimal(expected)
+
+
+def test_parse_builds_ast():
+    assert parse("2 * (x + 1)") == Apply(
+        'multiply', Number(Decimal(2)), Apply('add', Variable('x'), Number(Decimal(1))))
+    assert parse("-3") == Number(Decimal(-3))
+
+
+def test_tokenize_normalizes_names():
+    assert [text for _, text, _ in tokenize("Root(81, 4)")] == ['root', '(', '81', ',', '4', ')']
+
+
+@pytest.mark.parametrize("text, message", [
+    ("", "empty expression"),
+    ("1 +", "unexpected end of expression at position 4"),
+    ("(1", "expected '\\)' at position 3"),
+    ("2 $ 3", "unexpected '\\$' at position 3"),
+    ("1 2", "unexpected '2' at position 3"),
+    ("root(81)", "expected ',' at position 8"),
+    ("foo(1, 2)", "Unknown function: foo"),
+])
+def test_invalid_expressions(text, message):
+    with pytest.raises(ValidationError, match=message):
+        compile_expression(text)
+
+
+def test_unknown_variable():
+    with pytest.raises(ValidationError, match="Unknown variable: x"):
+        evaluate("x + 1")
+
+
+def test_constant_folding():
+    with engine_context(10, 'decimal'):
+        assert fold(parse("2 * (3 + 4)")) == Number(Decimal(14))
+        # Subtrees with variables stay, their constant parts fold
+        assert fold(parse("x * (3 + 4)")) == Apply('multiply', Variable('x'), Number(Decimal(7)))
+        # keep_root folds the operands only
+        assert fold(parse("2 * (3 + 4)"), keep_root=True) == Apply(
+            'multiply', Number(Decimal(2)), Number(Decimal(7)))
+
+        plan = compile_expression("(1 + 2) * (3 + 4)", keep_root=True)
+        assert [code for code, _ in plan.instructions] == [PUSH, PUSH, APPLY]
+        assert plan.evaluate() == Decimal(21)
+        assert plan.literals == tuple(Decimal(n) for n in (1, 2, 3, 4))
+
+
+def test_folding_reports_invalid_constant_operations():
+    with pytest.raises(ValidationError, match="Division by zero"):
+        compile_expression("1 / (2 - 2)")
+
+
+def test_steps_are_reported_innermost_first():
+    steps = []
+    with engine_context(10, 'decimal'):
+        compile_expression("(1 + 2) * 3", fold_constants=False).evaluate(
+            on_step=lambda operation, a, b, result: steps.append((str(operation), a, b, result)))
+    assert steps == [("Addition", 1, 2, 3), ("Multiplication", 3, 3, 9)]
+
+
+def test_validate_callback_sees_every_literal():
+    seen = []
+    compile_expression("1 + 2 * 3", validate=lambda value: seen.append(value) or value)
+    assert seen == [1, 2, 3]
+
+
+def test_plan_cache_shares_normalized_text():
+    cache = PlanCache(max_size=1)
+    first = cache.get_or_compile("2 * (3 + 4)", None, lambda: compile_expression("2 * (3 + 4)"))
+    assert cache.get_or_compile("2*(3+4)", None, lambda: pytest.fail("compiled twice")) is first
+    assert cache.stats() == {'size': 1, 'max_size': 1, 'hits': 1, 'misses': 1, 'evictions': 0}
+
+    cache.get_or_compile("1 + 1", None, lambda: compile_expression("1 + 1"))
+    assert cache.stats()['evictions'] == 1
+    assert len(cache) == 1
+
+
+@pytest.mark.parametrize("valid, malformed", [("12+0", "1 2+0"), ("2e3+0", "2 e3+0")])
+def test_plan_cache_keeps_token_boundaries(valid, malformed):
+    cache = PlanCache(max_size=4)
+    cache.get_or_compile(valid, None, lambda: compile_expression(valid))
+    with pytest.raises(ValidationError):
+        cache.get_or_compile(malformed, None, lambda: compile_expression(malformed))
+
+
+def test_disabled_plan_cache_compiles_every_time():
+    cache = PlanCache(max_size=0)
+    cache.get_or_compile("1 + 1", None, lambda: compile_expression("1 + 1"))
+    cache.get_or_compile("1 + 1", None, lambda: compile_expression("1 + 1"))
+    assert cache.stats()['misses'] == 2 and len(cache) == 0
@@ -19,9 +19,16 @@ def test_logging_observer_logs_calculation(logging_info_mock):
     observer = LoggingObserver()
     observer.update(calculation_mock)
     logging_info_mock.assert_called_once_with(
-        "Calculation performed: addition (5, 3) = 8"
+        "Calculation performed: %s (%s, %s) = %s", "addition", 5, 3, 8
     )
 
+@patch('logging.info')
+def test_logging_observer_samples_calculations(logging_info_mock):
+    observer = LoggingObserver(sample_rate=0.25)
+    for _ in range(8):
+        observer.update(calculation_mock)
+    assert logging_info_mock.call_count == 2
+
 def test_logging_observer_no_calculation():
     observer = LoggingObserver()
     with pytest.raises(AttributeError):
@@ -70,4 +77,15 @@ def test_autosave_observer_no_calculation():
     observer = AutoSaveObserver(calculator_mock)
     
     with pytest.raises(AttributeError):
-        observer.update(None)  # Passing None should raise an exception
\ No newline at end of file
+        observer.update(None)  # Passing None should raise an exception
+
+def test_autosave_observer_appends_journal():
+    calculator_mock = Mock(spec=Calculator)
+    calculator_mock.config = Mock(spec=CalculatorConfig)
+    calculator_mock.config.auto_save = True
+    calculator_mock.config.auto_save_mode = 'journal'
+    observer = AutoSaveObserver(calculator_mock)
+
+    observer.update(calculation_mock)
+    calculator_mock.append_history_journal.assert_called_once_with([calculation_mock])
+    calculator_mock.save_history.assert_not_called()
@@ -0,0 +1,116 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.calculation import Calculation
+from app.exceptions import OperationError
+from app.history_binary import BinaryHistory, binary_to_csv, csv_to_binary, main, write_binary_history
+from app.history_csv import read_history_csv, write_history_csv
+
+
+def test_round_trip_preserves_exact_values(tmp_path, fields):
+    path = tmp_path / "history.bin"
+    calculations = [
+        Calculation("Division", Decimal("1"), Decimal("3"), timestamp=datetime.datetime(2024, 1, 2, 3, 4, 5, 6)),
+        Calculation("Multiplication", Decimal("-2.50"), Decimal("1E+5")),
+        Calculation("Addition", Decimal("123456789012345678901234567890.5"), Decimal("-0")),
+        Calculation("Subtraction", Decimal("1E-999"), Decimal("0"),
+                    timestamp=datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone(datetime.timedelta(hours=2)))),
+    ]
+    assert write_binary_history(path, calculations) == 4
+
+    with BinaryHistory(path) as history:
+        assert len(history) == 4
+        assert [fields(calc) for calc in history] == [fields(calc) for calc in calculations]
+        assert history[2].operand1 == Decimal("123456789012345678901234567890.5")
+        assert history[3].timestamp.utcoffset() == datetime.timedelta(hours=2)
+
+
+def test_random_access_and_slices(tmp_path, sample_calculations):
+    path = tmp_path / "history.bin"
+    write_binary_history(path, sample_calculations(100))
+    with BinaryHistory(path) as history:
+        assert history[42].operand1 == Decimal(42)
+        assert history[-1].operand1 == Decimal(99)
+        assert [calc.operand1 for calc in history[-3:]] == [Decimal(97), Decimal(98), Decimal(99)]
+        with pytest.raises(IndexError):
+            history[100]
+
+
+def test_empty_history(tmp_path):
+    path = tmp_path / "history.bin"
+    write_binary_history(path, [])
+    with BinaryHistory(path) as history:
+        assert len(history) == 0
+        assert list(history) == []
+
+
+@pytest.mark.parametrize("content, message", [
+    (b"", "Invalid binary history file"),
+    (b"not a history file at all, just some text", "not a binary history file"),
+])
+def test_invalid_files(tmp_path, content, message):
+    path = tmp_path / "history.bin"
+    path.write_bytes(content)
+    with pytest.raises(OperationError, match=message):
+        BinaryHistory(path)
+
+
+def test_truncated_file(tmp_path, sample_calculations):
+    path = tmp_path / "history.bin"
+    write_binary_history(path, sample_calculations(3))
+    path.write_bytes(path.read_bytes()[:-70])
+    with pytest.raises(OperationError, match="truncated"):
+        BinaryHistory(path)
+
+
+def test_convert_both_ways(tmp_path, sample_calculations, fields):
+    csv_path, binary_path, back_path = tmp_path / "h.csv", tmp_path / "h.bin", tmp_path / "back.csv"
+    calculations = sample_calculations(5)
+    write_history_csv(csv_path, calculations)
+
+    assert csv_to_binary(csv_path, binary_path) == 5
+    assert binary_to_csv(binary_path, back_path) == 5
+    assert back_path.read_text() == csv_path.read_text()
+    assert [fields(calc) for calc in read_history_csv(back_path)] == [fields(calc) for calc in calculations]
+
+
+def test_converter_cli(tmp_path, capsys, sample_calculations):
+    csv_path, binary_path = tmp_path / "h.csv", tmp_path / "h.bin"
+    write_history_csv(csv_path, sample_calculations(2))
+    assert main(["to-binary", str(csv_path), str(binary_path)]) == 0
+    assert "Converted 2 calculations" in capsys.readouterr().out
+    assert main(["to-csv", str(tmp_path / "missing.bin"), str(csv_path)]) == 1
+
+
+@pytest.fixture
+def binary_calculator(make_calculator):
+    return make_calculator(history_format="binary", max_history_size=3)
+
+
+def test_calculator_saves_and_loads_binary(binary_calculator, sample_calculations):
+    binary_calculator.history.extend(sample_calculations(3))
+    binary_calculator.save_history()
+    assert binary_calculator.config.history_binary_file.exists()
+    assert not binary_calculator.config.history_file.exists()
+
+    binary_calculator.history.clear()
+    binary_calculator.load_history()
+    assert [calc.operand1 for calc in binary_calculator.history] == [Decimal(0), Decimal(1), Decimal(2)]
+
+
+def test_calculator_loads_newest_binary_entries(binary_calculator, sample_calculations):
+    write_binary_history(binary_calculator.config.history_binary_file, sample_calculations(10))
+    binary_calculator.load_history()
+    assert [calc.operand1 for calc in binary_calculator.history] == [Decimal(7), Decimal(8), Decimal(9)]
+
+    with binary_calculator.open_saved_history() as saved:
+        assert len(saved) == 10
+        assert saved[0].operand1 == Decimal(0)
+
+
+def test_open_saved_history_requires_binary_format(binary_calculator):
+    binary_calculator.config.history_format = "csv"
+    with pytest.raises(OperationError, match="requires the binary history format"):
+        binary_calculator.open_saved_history()
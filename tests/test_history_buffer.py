@@ -0,0 +1,55 @@
+import pytest
+from decimal import Decimal
+
+from app.history_buffer import HistoryBuffer
+
+
+def test_append_evicts_oldest_when_full(make_calc):
+    buffer = HistoryBuffer(2)
+    assert buffer.append(make_calc(1)) is None
+    assert buffer.append(make_calc(2)) is None
+    evicted = buffer.append(make_calc(3))
+    assert evicted.result == Decimal("1")
+    assert [calc.result for calc in buffer] == [Decimal("2"), Decimal("3")]
+
+
+def test_indexing_and_slicing_wrap_around(make_calc):
+    buffer = HistoryBuffer(3, (make_calc(i) for i in range(5)))
+    assert len(buffer) == 3
+    assert buffer[0].result == Decimal("2")
+    assert buffer[-1].result == Decimal("4")
+    assert [calc.result for calc in buffer[1:]] == [Decimal("3"), Decimal("4")]
+    with pytest.raises(IndexError):
+        buffer[3]
+
+
+def test_pop_and_appendleft(make_calc):
+    buffer = HistoryBuffer(2, [make_calc(1), make_calc(2)])
+    first = buffer.popleft()
+    assert buffer.pop().result == Decimal("2")
+    buffer.appendleft(first)
+    assert buffer == [make_calc(1)]
+    buffer.append(make_calc(2))
+    with pytest.raises(IndexError, match="full"):
+        buffer.appendleft(make_calc(0))
+
+
+def test_empty_buffer():
+    buffer = HistoryBuffer(1)
+    assert buffer == []
+    with pytest.raises(IndexError):
+        buffer.pop()
+    with pytest.raises(IndexError):
+        buffer.popleft()
+
+
+def test_clear_and_copy(make_calc):
+    buffer = HistoryBuffer(2, [make_calc(1)])
+    assert buffer.copy() == [make_calc(1)]
+    buffer.clear()
+    assert len(buffer) == 0
+
+
+def test_invalid_capacity():
+    with pytest.raises(ValueError, match="capacity must be positive"):
+        HistoryBuffer(0)
@@ -0,0 +1,102 @@
+import datetime
+from decimal import Decimal
+import random
+
+from app.calculation import Calculation, find_operation_id
+from app.history_index import HistoryQuery, IndexedHistoryBuffer
+
+START = datetime.datetime(2024, 1, 1)
+OPERATIONS = ["Addition", "Division", "Power"]
+
+
+def make_calc(i, operation=None):
+    return Calculation(operation or OPERATIONS[i % 3], Decimal(i), Decimal(2),
+                       timestamp=START + datetime.timedelta(seconds=i))
+
+
+def brute_force(entries, query):
+    matches = [
+        calc for calc in entries
+        if (query.operation is None or calc.operation == query.operation)
+        and (query.since is None or calc.timestamp >= query.since)
+        and (query.until is None or calc.timestamp <= query.until)
+        and (query.result is None or query.result[0] <= calc.result <= query.result[1])
+    ]
+    if query.newest_first:
+        matches.reverse()
+    stop = query.offset + query.limit if query.limit is not None else None
+    return matches[query.offset:stop]
+
+
+def test_query_by_operation_and_limit():
+    buffer = IndexedHistoryBuffer(100, (make_calc(i) for i in range(30)))
+    last = list(buffer.query(HistoryQuery(operation="Division", limit=3, newest_first=True)))
+    assert [calc.operand1 for calc in last] == [Decimal(28), Decimal(25), Decimal(22)]
+    assert buffer.operation_count("Division") == 10
+    assert list(buffer.query(HistoryQuery(operation="Modulus"))) == []
+
+
+def test_query_by_unknown_operation_does_not_intern_it():
+    buffer = IndexedHistoryBuffer(100, (make_calc(i) for i in range(10)))
+    for name in ("no such operation", "No Such Operation"):
+        assert list(buffer.query(HistoryQuery(operation=name))) == []
+        assert list(buffer.query(HistoryQuery(operation=name, since=START))) == []
+        assert buffer.operation_count(name) == 0
+        assert find_operation_id(name) is None
+
+
+def test_query_by_time_window_and_result():
+    buffer = IndexedHistoryBuffer(100, (make_calc(i) for i in range(30)))
+    query = HistoryQuery(since=START + datetime.timedelta(seconds=10),
+                         until=START + datetime.timedelta(seconds=12))
+    assert [calc.operand1 for calc in buffer.query(query)] == [Decimal(10), Decimal(11), Decimal(12)]
+
+    query = HistoryQuery(operation="Addition", result=(Decimal(20), None), offset=1)
+    assert [calc.operand1 for calc in buffer.query(query)] == [Decimal(21), Decimal(24), Decimal(27)]
+
+
+def test_indexes_follow_evictions_and_undo_operations():
+    buffer = IndexedHistoryBuffer(3, (make_calc(i, "Addition") for i in range(5)))
+    assert buffer.operation_count("Addition") == 3
+    buffer.pop()
+    buffer.appendleft(make_calc(1, "Addition"))
+    assert [calc.operand1 for calc in buffer.query(HistoryQuery(operation="Addition"))] == [
+        Decimal(1), Decimal(2), Decimal(3)]
+    buffer.clear()
+    assert buffer.operation_count("Addition") == 0
+    assert list(buffer.query(HistoryQuery(since=START))) == []
+
+
+def test_random_mutations_match_brute_force():
+    rng = random.Random(7)
+    buffer = IndexedHistoryBuffer(20)
+    reference = []
+    for _ in range(500):
+        action = rng.random()
+        if action < 0.6 or not reference:
+            # Out-of-order timestamps exercise the timestamp index inserts
+            calc = make_calc(rng.randrange(50), rng.choice(OPERATIONS))
+            buffer.append(calc)
+            reference.append(calc)
+            del reference[:-20]
+        elif action < 0.75:
+            assert buffer.pop() is reference.pop()
+        elif action < 0.9 or len(reference) == 20:
+            assert buffer.popleft() is reference.pop(0)
+        else:
+            calc = make_calc(rng.randrange(50), rng.choice(OPERATIONS))
+            buffer.appendleft(calc)
+            reference.insert(0, calc)
+
+        since = START + datetime.timedelta(seconds=rng.randrange(50))
+        query = HistoryQuery(
+            operation=rng.choice(OPERATIONS + [None]),
+            since=rng.choice([None, since]),
+            until=rng.choice([None, since + datetime.timedelta(seconds=rng.randrange(30))]),
+            result=rng.choice([None, (Decimal(0), Decimal(rng.randrange(60)))]),
+            limit=rng.choice([None, 1, 5]),
+            offset=rng.randrange(3),
+            newest_first=rng.random() < 0.5,
+        )
+        assert list(buffer.query(query)) == brute_force(reference, query)
+
@@ -0,0 +1,148 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.calculation import Calculation
+from app.exceptions import OperationError
+from app.history import AutoSaveObserver
+from app.history_sqlite import SQLiteHistory
+from app.operations import OperationFactory
+
+
+def test_round_trip_preserves_exact_values(tmp_path, fields):
+    calculations = [
+        Calculation("Division", Decimal("1"), Decimal("3")),
+        Calculation("Addition", Decimal("123456789012345678901234567890.5"), Decimal("-0")),
+        Calculation("Subtraction", Decimal("1E-999"), Decimal("0"),
+                    timestamp=datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone(datetime.timedelta(hours=2)))),
+    ]
+    with SQLiteHistory(tmp_path / "history.db") as store:
+        assert store.append(calculations) == 3
+        assert len(store) == 3
+        assert [fields(calc) for calc in store.tail(10)] == [fields(calc) for calc in calculations]
+
+
+def test_database_uses_wal_and_indexes(tmp_path):
+    with SQLiteHistory(tmp_path / "history.db") as store:
+        connection = store._connection
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexes = {row[1] for row in connection.execute("PRAGMA index_list(calculations)")}
+        assert {"idx_calculations_timestamp", "idx_calculations_operation"} <= indexes
+
+
+def test_tail_returns_newest_entries(tmp_path, sample_calculations):
+    with SQLiteHistory(tmp_path / "history.db") as store:
+        store.append(sample_calculations(10))
+        assert [calc.operand1 for calc in store.tail(3)] == [Decimal(7), Decimal(8), Decimal(9)]
+
+
+def test_replace_tail_keeps_older_rows(tmp_path, sample_calculations):
+    with SQLiteHistory(tmp_path / "history.db") as store:
+        store.append(sample_calculations(10))
+        # The in-memory window held entries 7-9; entry 9 was undone
+        resident = store.tail(3)
+        store.replace_tail(resident[:2])
+        assert len(store) == 9
+        assert store.tail(1)[0].operand1 == Decimal(8)
+
+        # Clearing the window removes its rows only, never the archived ones
+        store.replace_tail([])
+        assert len(store) == 9
+        store.replace_tail([], start=resident[0].row_id)
+        assert [calc.operand1 for calc in store.tail(10)] == [Decimal(i) for i in range(7)]
+
+
+def test_replace_tail_keeps_rows_with_the_same_timestamp(tmp_path, sample_calculations):
+    with SQLiteHistory(tmp_path / "history.db") as store:
+        batch = sample_calculations(10)
+        for calc in batch:
+            calc.timestamp = batch[0].timestamp
+        store.append(batch)
+        store.replace_tail(batch[-3:])
+        assert len(store) == 10
+        assert [calc.operand1 for calc in store.tail(10)] == [Decimal(i) for i in range(10)]
+
+
+def test_replace_tail_without_stored_rows_deletes_nothing(tmp_path, sample_calculations):
+    with SQLiteHistory(tmp_path / "history.db") as store:
+        store.append(sample_calculations(5))
+        store.replace_tail(sample_calculations(2, start=5))
+        assert len(store) == 7
+
+
+def test_invalid_database(tmp_path):
+    path = tmp_path / "history.db"
+    path.write_bytes(b"not a database" * 100)
+    with pytest.raises(OperationError, match="Invalid history database"):
+        SQLiteHistory(path)
+
+
+@pytest.fixture
+def sqlite_calculator(make_calculator):
+    return make_calculator(auto_save=True, history_format="sqlite", max_history_size=3)
+
+
+def test_autosave_inserts_rows_beyond_history_size(sqlite_calculator):
+    sqlite_calculator.add_observer(AutoSaveObserver(sqlite_calculator))
+    sqlite_calculator.set_operation(OperationFactory.create_operation("add"))
+    for i in range(5):
+        sqlite_calculator.perform_operation(i, 1)
+
+    assert len(sqlite_calculator.history) == 3
+    assert len(sqlite_calculator.sqlite_history) == 5
+    assert not sqlite_calculator.config.history_file.exists()
+    assert not sqlite_calculator.config.history_journal_file.exists()
+
+
+def test_calculator_loads_newest_entries(sqlite_calculator, sample_calculations):
+    sqlite_calculator.sqlite_history.append(sample_calculations(10))
+    sqlite_calculator.load_history()
+    assert [calc.operand1 for calc in sqlite_calculator.history] == [Decimal(7), Decimal(8), Decimal(9)]
+
+
+def test_undo_then_autosave_rewrites_resident_rows(sqlite_calculator):
+    sqlite_calculator.add_observer(AutoSaveObserver(sqlite_calculator))
+    sqlite_calculator.set_operation(OperationFactory.create_operation("add"))
+    for i in range(5):
+        sqlite_calculator.perform_operation(i, 1)
+    sqlite_calculator.undo()
+    sqlite_calculator.perform_operation(10, 1)
+
+    stored = sqlite_calculator.sqlite_history.tail(10)
+    assert [calc.operand1 for calc in stored] == [Decimal(i) for i in (0, 1, 2, 3, 10)]
+
+
+def test_batch_larger_than_history_keeps_archived_rows(sqlite_calculator):
+    sqlite_calculator.add_observer(AutoSaveObserver(sqlite_calculator))
+    sqlite_calculator.perform_batch("add", list(range(8)), [1] * 8)
+    assert len(sqlite_calculator.sqlite_history) == 8
+
+    sqlite_calculator.save_history()
+    stored = sqlite_calculator.sqlite_history.tail(10)
+    assert [calc.operand1 for calc in stored] == [Decimal(i) for i in range(8)]
+
+
+def perform_five_then_clear(calculator):
+    calculator.add_observer(AutoSaveObserver(calculator))
+    calculator.set_operation(OperationFactory.create_operation("add"))
+    for i in range(5):
+        calculator.perform_operation(i, 1)
+    calculator.clear_history()
+
+
+def test_clear_then_calculate_drops_cleared_rows(sqlite_calculator):
+    perform_five_then_clear(sqlite_calculator)
+    sqlite_calculator.perform_operation(10, 1)
+
+    # Entries 2-4 were in memory when cleared; 0 and 1 were archived
+    stored = sqlite_calculator.sqlite_history.tail(10)
+    assert [calc.operand1 for calc in stored] == [Decimal(i) for i in (0, 1, 10)]
+
+
+def test_clear_then_save_keeps_archived_rows(sqlite_calculator):
+    perform_five_then_clear(sqlite_calculator)
+    sqlite_calculator.save_history()
+
+    stored = sqlite_calculator.sqlite_history.tail(10)
+    assert [calc.operand1 for calc in stored] == [Decimal(0), Decimal(1)]
@@ -0,0 +1,101 @@
+from collections import deque
+from decimal import Decimal, localcontext
+import random
+
+import pytest
+
+from app.decimal_math import EXACT_CONTEXT
+from app.history_stats import MinMaxDeque, RunningStats
+
+
+def test_min_max_deque_matches_brute_force():
+    rng = random.Random(3)
+    values = MinMaxDeque()
+    reference = deque()
+    for _ in range(2000):
+        action = rng.random()
+        if action < 0.3 or not reference:
+            value = Decimal(rng.randrange(-100, 100))
+            values.append(value)
+            reference.append(value)
+        elif action < 0.45:
+            value = Decimal(rng.randrange(-100, 100))
+            values.appendleft(value)
+            reference.appendleft(value)
+        elif action < 0.75:
+            assert values.pop() == reference.pop()
+        else:
+            assert values.popleft() == reference.popleft()
+        assert len(values) == len(reference)
+        assert values.min() == (min(reference) if reference else None)
+        assert values.max() == (max(reference) if reference else None)
+
+
+def test_min_max_deque_empty():
+    values = MinMaxDeque()
+    assert values.min() is None and values.max() is None
+    with pytest.raises(IndexError):
+        values.pop()
+    with pytest.raises(IndexError):
+        values.popleft()
+
+
+def test_running_stats_sum_is_exact():
+    stats = RunningStats()
+    stats.append(Decimal("1E+30"))
+    stats.append(Decimal("0.000001"))
+    stats.appendleft(Decimal("-2"))
+    assert stats.summary()['sum'] == Decimal("999999999999999999999999999998.000001")
+
+    stats.pop()
+    stats.popleft()
+    summary = stats.summary()
+    assert summary == {'count': 1, 'sum': Decimal("1E+30"), 'min': Decimal("1E+30"),
+                       'max': Decimal("1E+30"), 'mean': Decimal("1E+30")}
+
+
+def test_running_stats_empty_summary():
+    assert RunningStats().summary() == {'count': 0, 'sum': Decimal(0), 'min': None, 'max': None, 'mean': None}
+
+
+def test_running_stats_sum_stays_bounded_with_extreme_exponents():
+    stats = RunningStats()
+    stats.append(Decimal("1E+999"))
+    stats.append(Decimal("1E-999999"))
+    for i in range(2000):
+        stats.append(Decimal(i))
+    assert len(str(stats.total)) < 60
+    assert stats.total == Decimal("1E+999")
+
+    # Removing the large result keeps the small ones added while it was there
+    stats.popleft()
+    stats.popleft()
+    assert stats.total == Decimal(sum(range(2000)))
+
+
+def test_running_stats_compensates_cancellation():
+    stats = RunningStats()
+    stats.append(Decimal("1E+80"))
+    stats.append(Decimal("5"))
+    stats.append(Decimal("0.25"))
+    stats.popleft()
+    assert stats.total == Decimal("5.25")
+    stats.pop()
+    stats.pop()
+    assert stats.total == 0
+
+
+def test_running_stats_matches_exact_sum():
+    rng = random.Random(5)
+    stats = RunningStats()
+    reference = deque()
+    for _ in range(3000):
+        if rng.random() < 0.6 or not reference:
+            value = Decimal(rng.randrange(-10**12, 10**12)).scaleb(rng.randrange(-15, 15))
+            stats.append(value)
+            reference.append(value)
+        else:
+            stats.popleft()
+            reference.popleft()
+        with localcontext(EXACT_CONTEXT):
+            assert stats.total == sum(reference, Decimal(0))
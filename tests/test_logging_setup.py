@@ -0,0 +1,89 @@
+import logging
+import queue
+
+import pytest
+
+from app import logging_setup
+from app.logging_setup import LogSampler, configure_logging, shutdown_logging
+
+
+@pytest.fixture
+def restore_logging():
+    """Shut the test pipeline down and leave the root logger as it was."""
+    root = logging.getLogger()
+    level = root.level
+    yield
+    shutdown_logging()
+    root.setLevel(level)
+
+
+def test_records_reach_the_log_file(tmp_path, restore_logging):
+    log_file = tmp_path / "calculator.log"
+    configure_logging(log_file)
+    logging.info("Set operation: %s", "addition")
+    shutdown_logging()
+    assert log_file.read_text().rstrip().endswith("INFO - Set operation: addition")
+
+
+def test_configure_is_idempotent(tmp_path, restore_logging):
+    log_file = tmp_path / "calculator.log"
+    configure_logging(log_file)
+    listener = logging_setup._listener
+    configure_logging(log_file)
+    assert logging_setup._listener is listener
+    handlers = [h for h in logging.getLogger().handlers if isinstance(h, logging_setup._DeferredQueueHandler)]
+    assert len(handlers) == 1
+
+    configure_logging(tmp_path / "other.log")
+    assert logging_setup._listener is not listener
+    handlers = [h for h in logging.getLogger().handlers if isinstance(h, logging_setup._DeferredQueueHandler)]
+    assert len(handlers) == 1
+
+
+def test_queue_handler_does_not_format_records():
+    class Expensive:
+        def __str__(self):
+            raise AssertionError("formatted on the calling thread")
+
+    log_queue = queue.SimpleQueue()
+    handler = logging_setup._DeferredQueueHandler(log_queue)
+    record = logging.LogRecord("root", logging.INFO, __file__, 1, "Value: %s", (Expensive(),), None)
+    handler.handle(record)
+    queued = log_queue.get_nowait()
+    assert queued is record
+    assert queued.msg == "Value: %s"
+
+
+def test_log_file_is_rotated(tmp_path, restore_logging):
+    log_file = tmp_path / "calculator.log"
+    configure_logging(log_file, max_bytes=200, backup_count=2)
+    for i in range(50):
+        logging.info("Calculation performed: %s", i)
+    shutdown_logging()
+    files = sorted(path.name for path in tmp_path.iterdir())
+    assert files == ["calculator.log", "calculator.log.1", "calculator.log.2"]
+    assert "Calculation performed: 49" in log_file.read_text()
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-16"])
+def test_rotation_counts_encoded_bytes(tmp_path, restore_logging, encoding):
+    log_file = tmp_path / "calculator.log"
+    configure_logging(log_file, max_bytes=200, backup_count=3, encoding=encoding)
+    for i in range(20):
+        logging.info("Résultat: %s €", i)
+    shutdown_logging()
+    assert all(path.stat().st_size <= 200 for path in tmp_path.iterdir())
+    assert log_file.read_text(encoding=encoding).rstrip().endswith("Résultat: 19 €")
+
+
+@pytest.mark.parametrize("rate, expected", [(1, 20), (0.5, 10), (0.1, 2), (0.3, 6), (0, 0)])
+def test_sampler_logs_exact_share(rate, expected):
+    sampler = LogSampler(rate)
+    decisions = [sampler.sample() for _ in range(20)]
+    assert sum(decisions) == expected
+    assert decisions[0] == (rate > 0)
+
+
+def test_sampler_rejects_invalid_rate():
+    with pytest.raises(ValueError, match="rate must be between 0 and 1"):
+        LogSampler(-0.1)
@@ -0,0 +1,102 @@
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.history import HistoryObserver
+from app.metrics import LatencyHistogram, Metrics
+from app.operations import OperationFactory
+
+
+class NullObserver(HistoryObserver):
+    def update(self, calculation):
+        pass
+
+
+def test_histogram_buckets_and_percentiles():
+    histogram = LatencyHistogram()
+    for _ in range(98):
+        histogram.record(100)
+    histogram.record(5_000)
+    histogram.record(1_000_000)
+
+    assert histogram.count == 100
+    assert histogram.max_ns == 1_000_000
+    # 100 ns has 7 significant bits: bucket [64, 128)
+    assert histogram.buckets[7] == 98
+    assert histogram.percentile(0.5) == 127
+    assert histogram.percentile(0.99) == 8191
+    assert histogram.percentile(1.0) == 1_000_000
+
+    summary = histogram.summary()
+    assert summary['count'] == 100
+    assert summary['mean_us'] == 10.148
+    assert summary['max_us'] == 1000.0
+
+
+def test_empty_histogram():
+    histogram = LatencyHistogram()
+    histogram.record(0)
+    assert histogram.percentile(0.99) == 0
+    assert LatencyHistogram().summary()['mean_us'] == 0.0
+
+
+def test_metrics_snapshot_and_reset():
+    metrics = Metrics()
+    metrics.record('execute', 1_000)
+    metrics.record('execute', 3_000)
+    metrics.increment('calculations', 2)
+
+    snapshot = metrics.snapshot()
+    assert snapshot['stages']['execute']['count'] == 2
+    assert snapshot['stages']['execute']['mean_us'] == 2.0
+    assert snapshot['counters'] == {'calculations': 2}
+
+    metrics.reset()
+    assert metrics.snapshot() == {'stages': {}, 'counters': {}}
+    assert metrics.histogram('execute') is None
+
+
+def test_calculator_records_each_stage(tmp_path):
+    calculator = Calculator(config=CalculatorConfig(
+        base_dir=tmp_path, auto_save=False, metrics=True, max_history_size=2))
+    calculator.add_observer(NullObserver())
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    for i in range(3):
+        calculator.perform_operation(i, 1)
+    calculator.perform_batch('add', [1, 2], [3, 'x'])
+
+    metrics = calculator.metrics()
+    assert metrics['enabled']
+    stages = metrics['stages']
+    for stage in ('validate', 'execute', 'calculation', 'memento', 'notify',
+                  'observer.NullObserver', 'perform_operation'):
+        assert stages[stage]['count'] == 3
+    assert stages['history_append']['count'] == 2
+    assert stages['history_evict']['count'] == 1
+    assert stages['perform_batch']['count'] == 1
+    assert metrics['counters'] == {'calculations': 4, 'evictions': 1, 'errors': 1}
+    assert metrics['cache'] is None and metrics['observers'] is None
+
+    calculator.reset_metrics()
+    assert calculator.metrics()['stages'] == {}
+
+
+def test_calculator_async_observer_timings(tmp_path):
+    calculator = Calculator(config=CalculatorConfig(
+        base_dir=tmp_path, auto_save=False, metrics=True, observer_dispatch='async'))
+    calculator.add_observer(NullObserver())
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(1, 1)
+    assert calculator.flush(timeout=5)
+
+    metrics = calculator.metrics()
+    assert metrics['stages']['observer.NullObserver']['count'] == 1
+    assert metrics['observers']['submitted'] == 1
+    assert calculator.close(timeout=5)
+
+
+def test_metrics_disabled_by_default(tmp_path):
+    calculator = Calculator(config=CalculatorConfig(base_dir=tmp_path, auto_save=False))
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(1, 1)
+    metrics = calculator.metrics()
+    assert not metrics['enabled']
+    assert metrics['stages'] == {} and metrics['counters'] == {}
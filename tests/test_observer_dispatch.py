@@ -0,0 +1,137 @@
+import threading
+import time
+
+import pytest
+
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.history import HistoryObserver
+from app.observer_dispatch import ObserverDispatcher
+from app.operations import OperationFactory
+
+
+class RecordingObserver(HistoryObserver):
+    """Records the operand1 of every notification; optionally waits for a gate first."""
+
+    def __init__(self, gate=None):
+        self.gate = gate
+        self.updates = []
+        self.batches = []
+
+    def update(self, calculation):
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        self.updates.append(int(calculation.operand1))
+
+    def update_batch(self, calculations):
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        self.batches.append([int(calc.operand1) for calc in calculations])
+
+
+class FailingObserver(HistoryObserver):
+    def update(self, calculation):
+        raise RuntimeError("observer failed")
+
+
+def blocked_dispatcher(make_calc, overflow, max_queue=2):
+    """Return a dispatcher whose worker is stuck delivering notification 0."""
+    gate = threading.Event()
+    observer = RecordingObserver(gate)
+    dispatcher = ObserverDispatcher([observer], max_queue=max_queue, overflow=overflow)
+    dispatcher.submit([make_calc(0)])
+    # Wait until the worker has taken notification 0 off the queue
+    while dispatcher.stats()['queued']:
+        time.sleep(0.001)
+    return dispatcher, observer, gate
+
+
+def test_delivers_in_order_and_flushes(make_calc):
+    observer = RecordingObserver()
+    dispatcher = ObserverDispatcher([observer])
+    for i in range(5):
+        dispatcher.submit([make_calc(i)])
+    dispatcher.submit([make_calc(5), make_calc(6)])
+    assert dispatcher.flush(timeout=5)
+    assert observer.updates == [0, 1, 2, 3, 4]
+    assert observer.batches == [[5, 6]]
+    assert dispatcher.close(timeout=5)
+
+
+def test_drop_oldest_discards_queued_notifications(make_calc):
+    dispatcher, observer, gate = blocked_dispatcher(make_calc, 'drop_oldest')
+    for i in range(1, 5):
+        dispatcher.submit([make_calc(i)])
+    gate.set()
+    assert dispatcher.flush(timeout=5)
+    assert observer.updates == [0, 3, 4]
+    assert dispatcher.stats()['dropped'] == 2
+    dispatcher.close(timeout=5)
+
+
+def test_coalesce_merges_into_newest_notification(make_calc):
+    dispatcher, observer, gate = blocked_dispatcher(make_calc, 'coalesce')
+    for i in range(1, 5):
+        dispatcher.submit([make_calc(i)])
+    gate.set()
+    assert dispatcher.flush(timeout=5)
+    assert observer.updates == [0, 1]
+    assert observer.batches == [[2, 3, 4]]
+    assert dispatcher.stats()['coalesced'] == 2
+    dispatcher.close(timeout=5)
+
+
+def test_block_waits_for_room(make_calc):
+    dispatcher, observer, gate = blocked_dispatcher(make_calc, 'block', max_queue=1)
+    dispatcher.submit([make_calc(1)])
+    producer = threading.Thread(target=dispatcher.submit, args=([make_calc(2)],))
+    producer.start()
+    producer.join(timeout=0.1)
+    assert producer.is_alive()
+
+    gate.set()
+    producer.join(timeout=5)
+    assert dispatcher.flush(timeout=5)
+    assert observer.updates == [0, 1, 2]
+    dispatcher.close(timeout=5)
+
+
+def test_observer_errors_do_not_stop_dispatch(make_calc):
+    observer = RecordingObserver()
+    dispatcher = ObserverDispatcher([FailingObserver(), observer])
+    dispatcher.submit([make_calc(1)])
+    dispatcher.submit([make_calc(2)])
+    assert dispatcher.flush(timeout=5)
+    assert observer.updates == [1, 2]
+    assert dispatcher.errors == 2
+    assert str(dispatcher.last_error) == "observer failed"
+    dispatcher.close(timeout=5)
+
+
+def test_submit_after_close_raises(make_calc):
+    dispatcher = ObserverDispatcher([])
+    assert dispatcher.close(timeout=5)
+    with pytest.raises(RuntimeError, match="closed"):
+        dispatcher.submit([make_calc(1)])
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError, match="max_queue must be positive"):
+        ObserverDispatcher([], max_queue=0)
+    with pytest.raises(ValueError, match="Unknown overflow policy"):
+        ObserverDispatcher([], overflow='spill')
+
+
+def test_calculator_async_dispatch(tmp_path):
+    calculator = Calculator(config=CalculatorConfig(
+        base_dir=tmp_path, auto_save=False, observer_dispatch='async'))
+    observer = RecordingObserver()
+    calculator.add_observer(observer)
+    calculator.set_operation(OperationFactory.create_operation('add'))
+    calculator.perform_operation(1, 1)
+    calculator.perform_batch('add', [2, 3], [1, 1])
+
+    assert calculator.flush(timeout=5)
+    assert observer.updates == [1]
+    assert observer.batches == [[2, 3]]
+    assert calculator.close(timeout=5)
@@ -153,6 +153,12 @@ class TestPower(BaseOperationTest):
             "error": ValidationError,
             "message": "Negative exponents not supported"
         },
+        "negative_base_fractional_exponent": {
+            "a": "-8",
+            "b": "0.5",
+            "error": ValidationError,
+            "message": "Fractional exponents of negative numbers are not supported"
+        },
     }
 
 
@@ -208,7 +214,7 @@ class TestOperationFactory:
         with pytest.raises(ValueError, match="Unknown operation: invalid_op"):
             OperationFactory.create_operation("invalid_op")
 
-    def test_register_valid_operation(self):
+    def test_register_valid_operation(self, operation_registry):
         """Test registering a new valid operation."""
         class NewOperation(Operation):
             def execute(self, a: Decimal, b: Decimal) -> Decimal:
@@ -218,10 +224,35 @@ class TestOperationFactory:
         operation = OperationFactory.create_operation("new_op")
         assert isinstance(operation, NewOperation)
 
-    def test_register_invalid_operation(self):
+    def test_register_invalid_operation(self, operation_registry):
         """Test registering an invalid operation class raises error."""
         class InvalidOperation:
             pass
 
         with pytest.raises(TypeError, match="Operation class must inherit"):
-            OperationFactory.register_operation("invalid", InvalidOperation)
\ No newline at end of file
+            OperationFactory.register_operation("invalid", InvalidOperation)
+
+    def test_operations_are_shared_instances(self):
+        """Test the factory returns one shared instance per operation."""
+        assert OperationFactory.create_operation('add') is OperationFactory.create_operation('ADD')
+        assert OperationFactory.create_operation('add') is not OperationFactory.create_operation('subtract')
+
+    def test_register_replaces_shared_instance(self, operation_registry):
+        """Test re-registering a name hands out an instance of the new class."""
+        class FirstOperation(Operation):
+            def execute(self, a: Decimal, b: Decimal) -> Decimal:
+                return a
+
+        class SecondOperation(Operation):
+            def execute(self, a: Decimal, b: Decimal) -> Decimal:
+                return b
+
+        OperationFactory.register_operation("replaced_op", FirstOperation)
+        assert isinstance(OperationFactory.create_operation("replaced_op"), FirstOperation)
+        OperationFactory.register_operation("replaced_op", SecondOperation)
+        assert isinstance(OperationFactory.create_operation("replaced_op"), SecondOperation)
+
+    def test_find_operation_by_class_name(self):
+        """Test looking up a shared instance by its class name."""
+        assert OperationFactory.find_operation("Power") is OperationFactory.create_operation("power")
+        assert OperationFactory.find_operation("Missing") is None
@@ -0,0 +1,101 @@
+import io
+from decimal import Decimal
+
+import pytest
+
+from app.calculator_config import CalculatorConfig
+from app.calculator_stream import evaluate_parallel, parse_lines, run_stream
+from app.operations import Division, Power
+from app.parallel import ProcessPoolBackend
+
+
+@pytest.fixture(scope="module")
+def backend():
+    with ProcessPoolBackend(workers=2, chunk_size=3) as backend:
+        yield backend
+
+
+@pytest.fixture
+def calculator(make_calculator):
+    return make_calculator(workers=2, chunk_size=4)
+
+
+def test_backend_preserves_order_across_chunks(backend):
+    power = Power()
+    items = [(power, Decimal(i), Decimal(2)) for i in range(20)]
+    outcomes = list(backend.execute(items))
+    assert outcomes == [(Decimal(i * i), None) for i in range(20)]
+
+
+def test_backend_reports_errors_per_element(backend):
+    division = Division()
+    outcomes = list(backend.execute([
+        (division, Decimal(1), Decimal(4)),
+        (division, Decimal(1), Decimal(0)),
+        (division, Decimal("1.5"), Decimal(3)),
+    ]))
+    assert outcomes == [
+        (Decimal("0.25"), None),
+        (None, "Division by zero is not allowed"),
+        (Decimal("0.5"), None),
+    ]
+
+
+def test_backend_empty_input(backend):
+    assert list(backend.execute([])) == []
+
+
+def test_parallel_batch_matches_serial(calculator):
+    a_values = [str(i) for i in range(10)] + ["abc"]
+    b_values = [2] * 9 + [0, 1]
+    batch = calculator.perform_batch("divide", a_values, b_values)
+    assert batch.results[:9] == [Decimal(i) / 2 for i in range(9)]
+    assert batch.errors == {9: "Division by zero is not allowed", 10: "Invalid number format: abc"}
+    assert len(calculator.history) == 9
+    assert calculator._process_pool is not None
+
+
+def test_small_batch_stays_in_process(calculator):
+    calculator.perform_batch("add", [1, 2], [3, 4])
+    assert calculator._process_pool is None
+
+
+def test_close_stops_process_pool(calculator):
+    calculator.perform_batch("add", list(range(10)), list(range(10)))
+    calculator.close()
+    assert calculator._process_pool is None
+
+
+def test_parallel_stream_matches_serial(calculator):
+    text = "add 2 3\n# comment\ndivide 1 0\nbogus\npower 2 10\nmodulo 1 2\nroot 27 3\nadd x 1\nsubtract 1 4\n"
+    serial, parallel = io.StringIO(), io.StringIO()
+    serial_failures = run_stream(io.StringIO(text), serial, output_format="jsonl", workers=1)
+    parallel_failures = run_stream(io.StringIO(text), parallel, output_format="jsonl", workers=2, chunk_size=2)
+    assert parallel.getvalue() == serial.getvalue()
+    assert parallel_failures == serial_failures == 4
+
+
+def test_parallel_stream_records_history(calculator):
+    text = "".join(f"add {i} 0\n" for i in range(10)) + "divide 1 0\n"
+    run_stream(io.StringIO(text), io.StringIO(), history="sampled", sample_every=3,
+               calculator=calculator, workers=2, chunk_size=4)
+    assert [calc.result for calc in calculator.history] == [Decimal(i) for i in (0, 3, 6, 9)]
+
+
+def test_parallel_stream_bounds_buffered_failures(backend):
+    read = 0
+
+    def lines():
+        nonlocal read
+        for read, line in enumerate(["add 1 2\n"] + ["bogus\n"] * 98 + ["add 3 4\n"], 1):
+            yield line
+
+    window = 2 * backend.workers * backend.chunk_size
+    ahead = []
+    results = []
+    for result in evaluate_parallel(parse_lines(lines()), CalculatorConfig(auto_save=False), backend):
+        ahead.append(read - result.line)
+        results.append(result)
+    assert [result.line for result in results] == list(range(1, 101))
+    assert (results[0].result, results[-1].result) == (Decimal(3), Decimal(7))
+    assert max(ahead) <= window
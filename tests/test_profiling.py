@@ -0,0 +1,65 @@
+import pstats
+import tracemalloc
+
+import pytest
+
+from app.profiling import Profiler, profiled
+
+
+def allocate():
+    return [str(i) * 10 for i in range(10000)]
+
+
+def test_cpu_profile_is_written_on_stop(tmp_path):
+    profiler = Profiler('cpu', tmp_path)
+    profiler.start()
+    allocate()
+    path = profiler.stop()
+
+    assert not profiler.active
+    assert path.parent == tmp_path and path.suffix == '.prof'
+    functions = {name for _, _, name in pstats.Stats(str(path)).stats}
+    assert 'allocate' in functions
+
+
+def test_memory_report_lists_top_sites(tmp_path):
+    profiler = Profiler('mem', tmp_path, top=3)
+    profiler.start()
+    kept = allocate()
+    dump = profiler.dump()
+    assert profiler.active and tracemalloc.is_tracing()
+    path = profiler.stop()
+    assert not tracemalloc.is_tracing()
+
+    report = dump.read_text(encoding='utf-8')
+    assert report.startswith("Traced memory:")
+    assert "Top 3 allocation sites:" in report
+    assert "test_profiling.py" in report
+    assert path.name.startswith("memory-") and path != dump
+    assert kept
+
+
+def test_start_and_dump_require_the_right_state(tmp_path):
+    profiler = Profiler('cpu', tmp_path)
+    with pytest.raises(RuntimeError, match="not running"):
+        profiler.dump()
+    profiler.start()
+    with pytest.raises(RuntimeError, match="already running"):
+        profiler.start()
+    profiler.stop()
+
+
+def test_invalid_arguments(tmp_path):
+    with pytest.raises(ValueError, match="Unknown profile mode"):
+        Profiler('gpu', tmp_path)
+    with pytest.raises(ValueError, match="top must be positive"):
+        Profiler('mem', tmp_path, top=0)
+
+
+def test_profiled_context(tmp_path):
+    with profiled('off', tmp_path) as profiler:
+        assert profiler is None
+    with profiled('cpu', tmp_path) as profiler:
+        allocate()
+    assert not profiler.active
+    assert len(list(tmp_path.glob("profile-*.prof"))) == 1
@@ -0,0 +1,111 @@
+from decimal import Decimal
+import json
+from unittest.mock import Mock
+
+from app.history import HistoryObserver
+from app.operations import OperationFactory, Power
+from app.result_cache import CachedOperation, ResultCache
+
+SETTINGS = {'precision': 10, 'power_mode': 'decimal'}
+
+
+def test_key_normalizes_operands():
+    assert ResultCache.key("Power", Decimal("2.0"), Decimal("1E1")) == ("Power", Decimal("2"), Decimal("10"))
+    assert str(ResultCache.key("Power", Decimal("2.50"), Decimal(1))[1]) == "2.5"
+
+
+def test_key_does_not_round_long_operands():
+    a = Decimal("1234567890123456789012345678901234567890")
+    assert ResultCache.key("Addition", a, a + 1) != ResultCache.key("Addition", a, a)
+
+
+def test_lru_eviction_and_counters():
+    cache = ResultCache(2)
+    cache.put(("Addition", Decimal(1), Decimal(1)), Decimal(2))
+    cache.put(("Addition", Decimal(1), Decimal(2)), Decimal(3))
+    assert cache.get(("Addition", Decimal(1), Decimal(1))) == Decimal(2)
+    cache.put(("Addition", Decimal(1), Decimal(3)), Decimal(4))
+    assert ("Addition", Decimal(1), Decimal(2)) not in cache
+    assert cache.get(("Addition", Decimal(1), Decimal(2))) is None
+    assert cache.stats() == {'size': 2, 'max_size': 2, 'hits': 1, 'misses': 1, 'evictions': 1}
+
+
+def test_cached_operation_executes_once():
+    operation = Mock(wraps=Power())
+    operation.__str__ = Mock(return_value="Power")
+    cached = CachedOperation(operation, ResultCache(10))
+    assert cached.execute(Decimal(2), Decimal(10)) == Decimal(1024)
+    assert cached.execute(Decimal("2.0"), Decimal(10)) == Decimal(1024)
+    assert operation.execute.call_count == 1
+    assert str(cached) == "Power"
+
+
+def test_ensure_settings_clears_stale_results():
+    cache = ResultCache(10, SETTINGS)
+    cache.put(("Power", Decimal(2), Decimal("0.5")), Decimal("1.414213562"))
+    cache.ensure_settings(SETTINGS)
+    assert len(cache) == 1
+    cache.ensure_settings({'precision': 50, 'power_mode': 'decimal'})
+    assert len(cache) == 0
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = ResultCache(10, SETTINGS)
+    cache.put(("Division", Decimal(1), Decimal(3)), Decimal("0.3333333333"))
+    cache.save(path)
+
+    restored = ResultCache(10, SETTINGS)
+    restored.load(path)
+    assert restored.get(("Division", Decimal(1), Decimal(3))) == Decimal("0.3333333333")
+
+
+def test_load_ignores_other_settings_and_corrupt_files(tmp_path):
+    path = tmp_path / "cache.json"
+    ResultCache(10, SETTINGS).save(path)
+    data = json.loads(path.read_text())
+    data['entries'] = [["Addition", "1", "1", "2"]]
+    path.write_text(json.dumps(data))
+
+    other = ResultCache(10, {'precision': 20, 'power_mode': 'decimal'})
+    other.load(path)
+    assert len(other) == 0
+
+    path.write_text("not json")
+    corrupt = ResultCache(10, SETTINGS)
+    corrupt.load(path)
+    assert len(corrupt) == 0
+
+
+def test_cache_hit_records_identical_history_and_notifies(make_calculator):
+    calculator = make_calculator(cache_size=2)
+    observer = Mock(spec=HistoryObserver)
+    calculator.add_observer(observer)
+    calculator.set_operation(OperationFactory.create_operation('power'))
+
+    assert calculator.perform_operation(2, 10) == Decimal(1024)
+    assert calculator.perform_operation(2, 10) == Decimal(1024)
+
+    first, second = calculator.history
+    assert (first.operation, first.operand1, first.operand2, first.result) == \
+        (second.operation, second.operand1, second.operand2, second.result)
+    assert observer.update.call_count == 2
+    assert calculator.cache_stats()['hits'] == 1
+
+
+def test_cache_disabled_by_default(make_calculator):
+    calculator = make_calculator(cache_size=0)
+    assert calculator.result_cache is None
+    assert calculator.cache_stats() is None
+
+
+def test_cache_persists_across_restarts(make_calculator):
+    calculator = make_calculator(cache_size=2, cache_persist=True)
+    calculator.set_operation(OperationFactory.create_operation('root'))
+    calculator.perform_operation(2, 2)
+    calculator.close()
+
+    restarted = make_calculator(cache_size=2, cache_persist=True)
+    restarted.set_operation(OperationFactory.create_operation('root'))
+    restarted.perform_operation(2, 2)
+    assert restarted.cache_stats()['hits'] == 1